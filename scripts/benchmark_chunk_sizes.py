@@ -0,0 +1,94 @@
+# scripts/benchmark_chunk_sizes.py
+
+"""Measures window count, wall time and copies of ``process_all_resultants`` at several chunk sizes.
+
+Smaller windows keep less of a subject in memory at once but cost more queries and
+``_processed_chunks`` rows; this shows where the round trips stop paying off.
+
+Usage:
+    python scripts/benchmark_chunk_sizes.py --subjects 4 --hours 2 --chunk-sec 60 300 600 1800
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import polars as pl
+from rich.console import Console
+from rich.table import Table
+
+from centrepoint.dwh.creator import TS_PER_SEC
+from centrepoint.dwh.processor import process_all_resultants
+
+FS = 128
+
+def write_synthetic_dwh(dwh_root: Path, subjects: int, hours: int):
+    """Writes an ``imu`` table with ``hours`` of 128 Hz samples per subject and an empty accelerometer table."""
+    n = hours * 60 * 60 * FS
+    rng = np.random.default_rng(0)
+    con = duckdb.connect(str(dwh_root / "imu.duckdb"))
+    con.execute("""
+        CREATE TABLE imu (ts DOUBLE, sample_order INTEGER, subject_id BIGINT,
+                          gyroscope_x DOUBLE, gyroscope_y DOUBLE, gyroscope_z DOUBLE)
+    """)
+    for subject in range(1, subjects + 1):
+        df = pl.DataFrame({
+            "ts": np.arange(n) * TS_PER_SEC / FS,
+            "sample_order": (np.arange(n) % FS).astype(np.int32),
+            "subject_id": np.full(n, subject, dtype=np.int64),
+            "gyroscope_x": rng.standard_normal(n),
+            "gyroscope_y": rng.standard_normal(n),
+            "gyroscope_z": rng.standard_normal(n),
+        })
+        con.register("df", df)
+        con.execute("INSERT INTO imu SELECT * FROM df")
+        con.unregister("df")
+    con.close()
+    duckdb.connect(str(dwh_root / "raw-accelerometer.duckdb")).execute(
+        "CREATE TABLE raw_accelerometer (ts DOUBLE, sample_order INTEGER, subject_id BIGINT, x DOUBLE, y DOUBLE, z DOUBLE)"
+    ).close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process_all_resultants at several chunk sizes")
+    parser.add_argument("--subjects", type=int, default=4)
+    parser.add_argument("--hours", type=int, default=2, help="Hours of IMU data per subject")
+    parser.add_argument("--chunk-sec", type=float, nargs="+", default=[60, 300, 600, 1800, 3600])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    console = Console()
+    with tempfile.TemporaryDirectory() as tmp:
+        dwh_root = Path(tmp)
+        console.print(f"🧪 Writing {args.subjects} subjects x {args.hours} h of IMU data")
+        write_synthetic_dwh(dwh_root, args.subjects, args.hours)
+        imu_path, accel_path = str(dwh_root / "imu.duckdb"), str(dwh_root / "raw-accelerometer.duckdb")
+
+        table = Table(title=f"process_all_resultants, {args.subjects} subjects x {args.hours} h")
+        table.add_column("Chunk (s)", justify="right")
+        table.add_column("Rows / window", justify="right")
+        table.add_column("Windows", justify="right")
+        table.add_column("Wall (s)", justify="right")
+        table.add_column("Rows / s", justify="right")
+        table.add_column("Arrow batches", justify="right")
+        table.add_column("Buffer allocs", justify="right")
+        table.add_column("Copies / row", justify="right")
+        for chunk_sec in args.chunk_sec:
+            t0 = time.perf_counter()
+            stats = process_all_resultants(imu_path, accel_path, overwrite=True, chunk_sec=chunk_sec, workers=args.workers)
+            wall = time.perf_counter() - t0
+
+            con = duckdb.connect(imu_path, read_only=True)
+            windows = con.execute("SELECT COUNT(*) FROM _processed_chunks").fetchone()[0]
+            rows = con.execute("SELECT COUNT(*) FROM filtered_imu").fetchone()[0]
+            con.close()
+            table.add_row(
+                f"{chunk_sec:g}", f"{int(chunk_sec * FS):,}", f"{windows:,}", f"{wall:.2f}", f"{rows / wall:,.0f}",
+                f"{stats.batches:,}", f"{stats.buffer_allocations:,}", f"{stats.copied_rows / max(stats.rows, 1):.2f}",
+            )
+        console.print(table)
+
+if __name__ == "__main__":
+    main()
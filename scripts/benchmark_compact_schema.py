@@ -0,0 +1,112 @@
+# scripts/benchmark_compact_schema.py
+
+"""Compares size and per-subject scan time of the default and compact sensor table schemas.
+
+"default": millisecond DOUBLE ``ts`` and DOUBLE channels.
+"compact": nanosecond BIGINT ``ts`` and FLOAT channels (``--compact-schema``).
+"migrated": the default database converted with ``migrate_to_compact``.
+
+Usage:
+    python scripts/benchmark_compact_schema.py --subjects 8 --hours 4
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import polars as pl
+from rich.console import Console
+from rich.table import Table
+
+from centrepoint.dwh.creator import SensorDWHBuilder, ts_per_sec
+from centrepoint.dwh.migrate import migrate_to_compact
+
+FS = 128
+
+def write_synthetic_imu(data_root: Path, subjects: int, hours: int):
+    """Writes one Parquet file per subject with ``hours`` of 128 Hz IMU samples."""
+    sensor_dir = data_root / "imu"
+    sensor_dir.mkdir(parents=True)
+    n = hours * 60 * 60 * FS
+    rng = np.random.default_rng(0)
+    for subject in range(1, subjects + 1):
+        pl.DataFrame({
+            "Timestamp": 1_700_000_000.0 + np.arange(n) // FS,
+            "SampleOrder": (np.arange(n) % FS).astype(np.int64),
+            "SubjectId": np.full(n, subject, dtype=np.int64),
+            # Quantized like real sensor output, so the float32 cast loses nothing that was measured.
+            "GyroscopeX": np.round(rng.standard_normal(n), 3),
+            "GyroscopeY": np.round(rng.standard_normal(n), 3),
+            "GyroscopeZ": np.round(rng.standard_normal(n), 3),
+        }).write_parquet(sensor_dir / f"S{subject:03d}.parquet")
+
+def time_subject_scans(db_path: Path, subjects: int, hours: int, chunk_sec: int, reads: int) -> list[float]:
+    """Times random per-subject window reads in milliseconds."""
+    rng = random.Random(1)
+    con = duckdb.connect(str(db_path), read_only=True)
+    units = ts_per_sec(con, "imu")
+    timings = []
+    for _ in range(reads):
+        start = (1_700_000_000 + rng.randrange(hours * 3600 - chunk_sec)) * units
+        t0 = time.perf_counter()
+        con.execute(
+            "SELECT * FROM imu WHERE subject_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (rng.randint(1, subjects), start, start + chunk_sec * units),
+        ).fetchnumpy()
+        timings.append((time.perf_counter() - t0) * 1000)
+    con.close()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compact sensor table schema")
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--hours", type=int, default=4, help="Hours of data per subject")
+    parser.add_argument("--chunk-sec", type=int, default=600)
+    parser.add_argument("--reads", type=int, default=50)
+    args = parser.parse_args()
+
+    console = Console()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_root = Path(tmp) / "data"
+        console.print(f"🧪 Writing {args.subjects} subjects x {args.hours} h of IMU data")
+        write_synthetic_imu(data_root, args.subjects, args.hours)
+
+        layouts = []
+        for name, compact in (("default", False), ("compact", True)):
+            dwh_root = Path(tmp) / name
+            t0 = time.perf_counter()
+            SensorDWHBuilder(data_root, dwh_root, compact_schema=compact).build_sensor_db("imu")
+            layouts.append((name, dwh_root / "imu.duckdb", time.perf_counter() - t0))
+
+        migrated = Path(tmp) / "migrated" / "imu.duckdb"
+        migrated.parent.mkdir()
+        shutil.copy(layouts[0][1], migrated)
+        t0 = time.perf_counter()
+        migrate_to_compact(migrated)
+        layouts.append(("migrated", migrated, time.perf_counter() - t0))
+
+        table = Table(title=f"{args.reads} per-subject reads of {args.chunk_sec}s")
+        table.add_column("Schema")
+        table.add_column("Build / migrate (s)", justify="right")
+        table.add_column("DB size (MB)", justify="right")
+        table.add_column("Median (ms)", justify="right")
+        table.add_column("p95 (ms)", justify="right")
+        for name, path, build_sec in layouts:
+            timings = sorted(time_subject_scans(path, args.subjects, args.hours, args.chunk_sec, args.reads))
+            table.add_row(
+                name,
+                f"{build_sec:.1f}",
+                f"{path.stat().st_size / 1e6:.1f}",
+                f"{statistics.median(timings):.2f}",
+                f"{timings[int(0.95 * (len(timings) - 1))]:.2f}",
+            )
+        console.print(table)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-import duckdb
+import os
+from centrepoint.dwh.lakehouse import connect_warehouse
 import polars as pl
 import matplotlib.pyplot as plt
 from scipy.signal import butter, filtfilt
@@ -8,7 +9,7 @@ def butter_lowpass_filter(data, cutoff=35.0, fs=128.0, order=4):
     return filtfilt(b, a, data)
 
 # Connect to DuckDB and get sample data
-con = duckdb.connect("dwh/imu.duckdb")
+con = connect_warehouse("imu", backend=os.environ.get("CENTREPOINT_BACKEND", "duckdb"))
 df = con.execute("""
     SELECT ts, gyroscope_x
     FROM imu
@@ -1,8 +1,9 @@
 import matplotlib.pyplot as plt
 import polars as pl
-import duckdb
+import os
+from centrepoint.dwh.lakehouse import connect_warehouse
 
-con = duckdb.connect("dwh/imu.duckdb")
+con = connect_warehouse("imu", backend=os.environ.get("CENTREPOINT_BACKEND", "duckdb"))
 result = con.execute("SELECT subject_id FROM imu LIMIT 1").fetchone()
 if result is None:
     raise ValueError("No subjects found in imu table — is the DB populated?")
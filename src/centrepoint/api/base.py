@@ -1,5 +1,7 @@
 # centrepoint/api/base.py
 
+from typing import Optional
+
 import httpx
 from centrepoint.auth import CentrePointAuth
 
@@ -45,3 +47,64 @@ class BaseAPI:
         headers = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {token}"
         return self.client.post(url, headers=headers, **kwargs)
+
+class AsyncBaseAPI:
+    """Async base class for CentrePoint API clients, built on ``httpx.AsyncClient``.
+
+    Several API clients can share one pooled client (see ``centrepoint.utils.http.create_async_client``),
+    so request URLs are resolved against ``base_url`` here rather than on the client.
+    """
+
+    def __init__(self, auth: CentrePointAuth, base_url: str, client: Optional[httpx.AsyncClient] = None):
+        """Initializes the AsyncBaseAPI with authentication, base URL and an optional shared client.
+
+        Args:
+            auth (CentrePointAuth): Auth handler that provides access tokens.
+            base_url (str): The base URL of the API being targeted.
+            client (httpx.AsyncClient, optional): Shared client. If omitted, the API owns a private client.
+        """
+        self.auth = auth
+        self.base_url = base_url.rstrip("/")
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """Sends an authenticated HTTP GET request.
+
+        Args:
+            url (str): The relative URL path.
+            **kwargs: Additional arguments to pass to the request (e.g., params, headers).
+
+        Returns:
+            httpx.Response: The HTTP response object.
+        """
+        token = await self.auth.aget_token()
+        headers = kwargs.pop("headers", {})
+        headers["Authorization"] = f"Bearer {token}"
+        return await self.client.get(self.base_url + url, headers=headers, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """Sends an authenticated HTTP POST request.
+
+        Args:
+            url (str): The relative URL path.
+            **kwargs: Additional arguments to pass to the request (e.g., json, headers).
+
+        Returns:
+            httpx.Response: The HTTP response object.
+        """
+        token = await self.auth.aget_token()
+        headers = kwargs.pop("headers", {})
+        headers["Authorization"] = f"Bearer {token}"
+        return await self.client.post(self.base_url + url, headers=headers, **kwargs)
+
+    async def aclose(self):
+        """Closes the underlying client if this API created it."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -1,14 +1,40 @@
 # centrepoint/api/data_access.py
 
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
-from centrepoint.api.base import BaseAPI
+import httpx
+
+from centrepoint.api.base import AsyncBaseAPI, BaseAPI
 from centrepoint.auth import CentrePointAuth
-from centrepoint.models.data_access import PaginatedDataAccessFiles
+from centrepoint.models.data_access import DataAccessFile, PaginatedDataAccessFiles
+from centrepoint.utils.paginate import DEFAULT_PREFETCH, apaginate, paginate_prefetch
 
 BASE_URL = "https://api.actigraphcorp.com/dataaccess/v3"
 
+def _list_files_params(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    sort_order: Optional[str],
+    file_format: Optional[str],
+    limit: int,
+    offset: int,
+) -> dict[str, str]:
+    """Builds the query parameters shared by the sync and async ``list_files`` calls."""
+    params: dict[str, str] = {
+        "limit": str(limit),
+        "offset": str(offset),
+    }
+    if start_date:
+        params["startDate"] = start_date.isoformat()
+    if end_date:
+        params["endDate"] = end_date.isoformat()
+    if sort_order:
+        params["sortOrder"] = sort_order
+    if file_format:
+        params["fileFormat"] = file_format
+    return params
+
 class DataAccessAPI(BaseAPI):
     """Client for retrieving downloadable sensor data files from CentrePoint."""
 
@@ -48,20 +74,110 @@ class DataAccessAPI(BaseAPI):
         Returns:
             PaginatedDataAccessFiles: A paginated list of available data files.
         """
-        params: dict[str, str] = {
-            "limit": str(limit),
-            "offset": str(offset),
-        }
-        if start_date:
-            params["startDate"] = start_date.isoformat()
-        if end_date:
-            params["endDate"] = end_date.isoformat()
-        if sort_order:
-            params["sortOrder"] = sort_order
-        if file_format:
-            params["fileFormat"] = file_format
-
+        params = _list_files_params(start_date, end_date, sort_order, file_format, limit, offset)
         url = f"/files/studies/{study_id}/subjects/{subject_id}/{data_category}"
         response = self.get(url, params=params)
         response.raise_for_status()
         return PaginatedDataAccessFiles.model_validate(response.json())
+
+    def iter_files(
+        self,
+        study_id: int,
+        subject_id: int,
+        data_category: str,
+        limit: int = 100,
+        prefetch: int = DEFAULT_PREFETCH,
+        **filters,
+    ) -> Iterator[DataAccessFile]:
+        """Iterates over every matching data file, fetching pages after the first in parallel.
+
+        Args:
+            study_id (int): The ID of the study.
+            subject_id (int): The ID of the subject.
+            data_category (str): The type of data (e.g., 'imu', 'raw-accelerometer').
+            limit (int, optional): Number of files per page. Defaults to 100.
+            prefetch (int, optional): Maximum pages requested at once. Defaults to DEFAULT_PREFETCH.
+            **filters: Optional ``start_date``, ``end_date``, ``sort_order`` and ``file_format`` filters.
+
+        Returns:
+            Iterator[DataAccessFile]: All matching files.
+        """
+        return paginate_prefetch(
+            lambda lim, off: self.list_files(study_id, subject_id, data_category, limit=lim, offset=off, **filters),
+            limit,
+            prefetch,
+        )
+
+class AsyncDataAccessAPI(AsyncBaseAPI):
+    """Async client for retrieving downloadable sensor data files from CentrePoint."""
+
+    def __init__(self, auth: CentrePointAuth, client: Optional[httpx.AsyncClient] = None):
+        """Initializes the AsyncDataAccessAPI client.
+
+        Args:
+            auth (CentrePointAuth): An instance that handles authentication and token retrieval.
+            client (httpx.AsyncClient, optional): Shared pooled client.
+        """
+        super().__init__(auth, base_url=BASE_URL, client=client)
+
+    async def list_files(
+        self,
+        study_id: int,
+        subject_id: int,
+        data_category: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        sort_order: Optional[str] = None,
+        file_format: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> PaginatedDataAccessFiles:
+        """Lists sensor data files for a given subject in a study.
+
+        Args:
+            study_id (int): The ID of the study.
+            subject_id (int): The ID of the subject.
+            data_category (str): The type of data (e.g., 'imu', 'raw-accelerometer').
+            start_date (datetime, optional): Filter files after this date.
+            end_date (datetime, optional): Filter files before this date.
+            sort_order (str, optional): Sort direction (e.g., 'asc', 'desc').
+            file_format (str, optional): Desired file format ('avro', 'csv').
+            limit (int, optional): Max number of files to return. Defaults to 100.
+            offset (int, optional): Offset for pagination. Defaults to 0.
+
+        Returns:
+            PaginatedDataAccessFiles: A paginated list of available data files.
+        """
+        params = _list_files_params(start_date, end_date, sort_order, file_format, limit, offset)
+        url = f"/files/studies/{study_id}/subjects/{subject_id}/{data_category}"
+        response = await self.get(url, params=params)
+        response.raise_for_status()
+        return PaginatedDataAccessFiles.model_validate(response.json())
+
+    def iter_files(
+        self,
+        study_id: int,
+        subject_id: int,
+        data_category: str,
+        limit: int = 100,
+        prefetch: int = DEFAULT_PREFETCH,
+        **filters,
+    ) -> AsyncIterator[DataAccessFile]:
+        """Asynchronously iterates over every matching data file, fetching pages after the first concurrently.
+
+        Args:
+            study_id (int): The ID of the study.
+            subject_id (int): The ID of the subject.
+            data_category (str): The type of data (e.g., 'imu', 'raw-accelerometer').
+            limit (int, optional): Number of files per page. Defaults to 100.
+            prefetch (int, optional): Maximum pages requested at once. Defaults to DEFAULT_PREFETCH.
+            **filters: Optional ``start_date``, ``end_date``, ``sort_order`` and ``file_format`` filters.
+
+        Returns:
+            AsyncIterator[DataAccessFile]: All matching files.
+        """
+        return apaginate(
+            lambda lim, off: self.list_files(study_id, subject_id, data_category, limit=lim, offset=off, **filters),
+            limit,
+            prefetch,
+        )
@@ -1,8 +1,13 @@
 # centrepoint/api/studies.py
 
-from centrepoint.api.base import BaseAPI
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+
+from centrepoint.api.base import AsyncBaseAPI, BaseAPI
 from centrepoint.auth import CentrePointAuth
-from centrepoint.models.study import PaginatedStudies
+from centrepoint.models.study import PaginatedStudies, Study
+from centrepoint.utils.paginate import DEFAULT_PREFETCH, apaginate, paginate_prefetch
 
 BASE_URL = "https://api.actigraphcorp.com/centrepoint/v3"
 
@@ -30,3 +35,53 @@ class StudiesAPI(BaseAPI):
         response = self.get("/Studies", params={"limit": str(limit), "offset": str(offset)})
         response.raise_for_status()
         return PaginatedStudies.model_validate(response.json())
+
+    def iter_studies(self, limit: int = 100, prefetch: int = DEFAULT_PREFETCH) -> Iterator[Study]:
+        """Iterates over every available study, fetching pages after the first in parallel.
+
+        Args:
+            limit (int, optional): Number of results per page. Defaults to 100.
+            prefetch (int, optional): Maximum pages requested at once. Defaults to DEFAULT_PREFETCH.
+
+        Returns:
+            Iterator[Study]: All studies.
+        """
+        return paginate_prefetch(lambda lim, off: self.list_studies(limit=lim, offset=off), limit, prefetch)
+
+class AsyncStudiesAPI(AsyncBaseAPI):
+    """Async client for interacting with CentrePoint studies."""
+
+    def __init__(self, auth: CentrePointAuth, client: Optional[httpx.AsyncClient] = None):
+        """Initializes the AsyncStudiesAPI client.
+
+        Args:
+            auth (CentrePointAuth): An instance that handles authentication and token retrieval.
+            client (httpx.AsyncClient, optional): Shared pooled client.
+        """
+        super().__init__(auth, base_url=BASE_URL, client=client)
+
+    async def list_studies(self, limit: int = 100, offset: int = 0) -> PaginatedStudies:
+        """Retrieves a paginated list of all available studies.
+
+        Args:
+            limit (int, optional): Maximum number of studies to return. Defaults to 100.
+            offset (int, optional): Offset for pagination. Defaults to 0.
+
+        Returns:
+            PaginatedStudies: A paginated container of Study objects.
+        """
+        response = await self.get("/Studies", params={"limit": str(limit), "offset": str(offset)})
+        response.raise_for_status()
+        return PaginatedStudies.model_validate(response.json())
+
+    def iter_studies(self, limit: int = 100, prefetch: int = DEFAULT_PREFETCH) -> AsyncIterator[Study]:
+        """Asynchronously iterates over every available study, fetching pages after the first concurrently.
+
+        Args:
+            limit (int, optional): Number of results per page. Defaults to 100.
+            prefetch (int, optional): Maximum pages requested at once. Defaults to DEFAULT_PREFETCH.
+
+        Returns:
+            AsyncIterator[Study]: All studies.
+        """
+        return apaginate(lambda lim, off: self.list_studies(limit=lim, offset=off), limit, prefetch)
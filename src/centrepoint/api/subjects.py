@@ -1,8 +1,13 @@
 # centrepoint/api/subjects.py
 
-from centrepoint.api.base import BaseAPI
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+
+from centrepoint.api.base import AsyncBaseAPI, BaseAPI
 from centrepoint.auth import CentrePointAuth
 from centrepoint.models.subject import PaginatedSubjects, Subject
+from centrepoint.utils.paginate import DEFAULT_PREFETCH, apaginate, paginate_prefetch
 
 BASE_URL = "https://api.actigraphcorp.com/centrepoint/v3"
 
@@ -32,6 +37,19 @@ class SubjectsAPI(BaseAPI):
         response.raise_for_status()
         return PaginatedSubjects.model_validate(response.json())
 
+    def iter_subjects(self, study_id: int, limit: int = 100, prefetch: int = DEFAULT_PREFETCH) -> Iterator[Subject]:
+        """Iterates over every subject in a study, fetching pages after the first in parallel.
+
+        Args:
+            study_id (int): The ID of the study.
+            limit (int, optional): Number of results per page. Defaults to 100.
+            prefetch (int, optional): Maximum pages requested at once. Defaults to DEFAULT_PREFETCH.
+
+        Returns:
+            Iterator[Subject]: All subjects in the study.
+        """
+        return paginate_prefetch(lambda lim, off: self.list_subjects(study_id, limit=lim, offset=off), limit, prefetch)
+
     def get_subject(self, study_id: int, subject_id: int) -> Subject:
         """Retrieves detailed metadata for a single subject in a study.
 
@@ -46,3 +64,56 @@ class SubjectsAPI(BaseAPI):
         response.raise_for_status()
         return Subject.model_validate(response.json())
 
+class AsyncSubjectsAPI(AsyncBaseAPI):
+    """Async client for interacting with CentrePoint subject data."""
+
+    def __init__(self, auth: CentrePointAuth, client: Optional[httpx.AsyncClient] = None):
+        """Initializes the AsyncSubjectsAPI client.
+
+        Args:
+            auth (CentrePointAuth): An instance that handles authentication and token retrieval.
+            client (httpx.AsyncClient, optional): Shared pooled client.
+        """
+        super().__init__(auth, base_url=BASE_URL, client=client)
+
+    async def list_subjects(self, study_id: int, limit: int = 100, offset: int = 0) -> PaginatedSubjects:
+        """Retrieves a paginated list of subjects associated with a study.
+
+        Args:
+            study_id (int): The ID of the study.
+            limit (int, optional): Number of results per page. Defaults to 100.
+            offset (int, optional): Offset for pagination. Defaults to 0.
+
+        Returns:
+            PaginatedSubjects: A paginated container of Subject objects.
+        """
+        response = await self.get(f"/Studies/{study_id}/Subjects", params={"limit": str(limit), "offset": str(offset)})
+        response.raise_for_status()
+        return PaginatedSubjects.model_validate(response.json())
+
+    def iter_subjects(self, study_id: int, limit: int = 100, prefetch: int = DEFAULT_PREFETCH) -> AsyncIterator[Subject]:
+        """Asynchronously iterates over every subject in a study, fetching pages after the first concurrently.
+
+        Args:
+            study_id (int): The ID of the study.
+            limit (int, optional): Number of results per page. Defaults to 100.
+            prefetch (int, optional): Maximum pages requested at once. Defaults to DEFAULT_PREFETCH.
+
+        Returns:
+            AsyncIterator[Subject]: All subjects in the study.
+        """
+        return apaginate(lambda lim, off: self.list_subjects(study_id, limit=lim, offset=off), limit, prefetch)
+
+    async def get_subject(self, study_id: int, subject_id: int) -> Subject:
+        """Retrieves detailed metadata for a single subject in a study.
+
+        Args:
+            study_id (int): The ID of the study the subject is part of.
+            subject_id (int): The ID of the subject.
+
+        Returns:
+            Subject: A Subject object populated with metadata.
+        """
+        response = await self.get(f"/Studies/{study_id}/Subjects/{subject_id}")
+        response.raise_for_status()
+        return Subject.model_validate(response.json())
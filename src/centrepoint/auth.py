@@ -1,6 +1,8 @@
 # centrepointAPI/auth.py
 
 import os
+import asyncio
+import threading
 import httpx
 from typing import Optional
 from datetime import datetime, timedelta, timezone
@@ -23,6 +25,8 @@ class CentrePointAuth:
         self.scope = "CentrePoint DataAccess"
         self.token: Optional[str] = None
         self.token_expires_at: Optional[datetime] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._sync_refresh_lock = threading.Lock()
 
     def is_token_expired(self) -> bool:
         """Determines whether the current token is missing or expired.
@@ -36,27 +40,57 @@ class CentrePointAuth:
     def get_token(self) -> str:
         """Returns a valid bearer token, refreshing it if expired.
 
+        Threads calling concurrently (e.g. ``paginate_prefetch`` workers) share a single refresh request.
+
         Returns:
             str: A valid access token.
         """
-        if self.is_token_expired():
-            self._fetch_token()
+        with self._sync_refresh_lock:
+            if self.is_token_expired():
+                self._fetch_token()
         assert self.token is not None  # Silence the type checker
         return self.token
 
-    def _fetch_token(self):
-        """Fetches a new bearer token from the authentication endpoint."""
-        data = {
+    async def aget_token(self) -> str:
+        """Returns a valid bearer token without blocking the event loop, refreshing it if expired.
+
+        Concurrent callers share a single refresh request.
+
+        Returns:
+            str: A valid access token.
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self.is_token_expired():
+                await self._afetch_token()
+        assert self.token is not None  # Silence the type checker
+        return self.token
+
+    def _token_request_data(self) -> dict[str, Optional[str]]:
+        """Builds the client credentials form payload."""
+        return {
             "grant_type": "client_credentials",
             "client_id": self.client_id,
             "client_secret": self.client_secret,
             "scope": self.scope,
         }
 
-        response = httpx.post(AUTH_URL, data=data)
+    def _fetch_token(self):
+        """Fetches a new bearer token from the authentication endpoint."""
+        response = httpx.post(AUTH_URL, data=self._token_request_data())
+        response.raise_for_status()
+        self._store_token(response.json())
+
+    async def _afetch_token(self):
+        """Fetches a new bearer token from the authentication endpoint asynchronously."""
+        async with httpx.AsyncClient() as client:
+            response = await client.post(AUTH_URL, data=self._token_request_data())
         response.raise_for_status()
-        token_data = response.json()
+        self._store_token(response.json())
 
+    def _store_token(self, token_data: dict):
+        """Caches a token response and computes its refresh deadline."""
         self.token = token_data["access_token"]
         expires_in = int(token_data["expires_in"])
         self.token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in - 60)
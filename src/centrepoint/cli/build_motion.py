@@ -0,0 +1,43 @@
+# centrepoint/cli/build_motion.py
+
+import argparse
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT
+from centrepoint.dwh.motion import DEFAULT_ACCEL_TOLERANCE_SEC, DEFAULT_TEMPERATURE_TOLERANCE_SEC, build_motion
+
+def get_parser():
+    """Builds and returns the argument parser for the motion table CLI.
+
+    Returns:
+        argparse.ArgumentParser: Configured parser for CLI arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Align filtered gyro, accel resultants and temperature into one 128 Hz motion table"
+    )
+    parser.add_argument("--dwh-root", type=str, default="dwh", help="Folder containing the sensor DuckDB files; motion.duckdb is written here")
+    parser.add_argument("--subject-identifier", type=str, help="Only build a specific subject by identifier (e.g. PIL_JAM_LW)")
+    parser.add_argument("--accel-tolerance-sec", type=float, default=DEFAULT_ACCEL_TOLERANCE_SEC, help="Largest gap to the nearest accelerometer sample")
+    parser.add_argument("--temperature-tolerance-sec", type=float, default=DEFAULT_TEMPERATURE_TOLERANCE_SEC, help="Largest gap to the temperature readings interpolated from")
+    parser.add_argument("--overwrite", action="store_true", help="Drop and rebuild the motion table")
+    parser.add_argument("--backend", choices=BACKENDS, default="duckdb", help="Read raw temperature data from the DuckDB files or the Parquet lakehouse")
+    parser.add_argument("--lake-root", type=str, default=str(DEFAULT_LAKE_ROOT), help="Root of the Parquet lakehouse (with --backend lakehouse)")
+    parser.add_argument("--cluster", action="store_true", help="Rewrite the motion table in (subject_id, ts) order after building")
+    parser.add_argument("--dry-run", action="store_true", help="Print the subject-days to build, but do not write them")
+    return parser
+
+def main():
+    """Main entrypoint for building the aligned motion table."""
+    args = get_parser().parse_args()
+    build_motion(
+        dwh_root=args.dwh_root,
+        overwrite=args.overwrite,
+        accel_tolerance_sec=args.accel_tolerance_sec,
+        temperature_tolerance_sec=args.temperature_tolerance_sec,
+        subject_identifier=args.subject_identifier,
+        dry_run=args.dry_run,
+        backend=args.backend,
+        lake_root=args.lake_root,
+        cluster=args.cluster,
+    )
+
+if __name__ == "__main__":
+    main()
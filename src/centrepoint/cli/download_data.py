@@ -2,7 +2,10 @@
 
 import argparse
 import asyncio
-from datetime import datetime
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from rich.console import Console
@@ -10,9 +13,23 @@ from rich.table import Table
 from rich.progress import Progress
 
 from centrepoint.auth import CentrePointAuth
-from centrepoint.api.subjects import SubjectsAPI
-from centrepoint.api.data_access import DataAccessAPI
-from centrepoint.utils.files import download_data_file
+from centrepoint.api.subjects import AsyncSubjectsAPI
+from centrepoint.api.data_access import AsyncDataAccessAPI
+from centrepoint.dwh.creator import SensorDWHBuilder
+from centrepoint.utils.files import (
+    DEFAULT_BACKOFF,
+    DEFAULT_RETRIES,
+    DEFAULT_ROW_GROUP_SIZE,
+    converted_path,
+    download_data_file,
+)
+from centrepoint.utils.manifest import DEFAULT_MANIFEST_PATH, DownloadManifest, file_fingerprint
+from centrepoint.utils.http import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE,
+    create_async_client,
+)
 
 console = Console()
 
@@ -22,103 +39,397 @@ def get_parser():
     Returns:
         argparse.ArgumentParser: Configured argument parser.
     """
-    parser = argparse.ArgumentParser(description="Download CentrePoint data files for a subject")
-    parser.add_argument("--subject-identifier", type=str, required=True, help="Subject Identifier (not ID)")
+    parser = argparse.ArgumentParser(description="Download CentrePoint data files for one or more subjects")
+    subjects = parser.add_mutually_exclusive_group(required=True)
+    subjects.add_argument("--subject-identifier", type=str, nargs="+", help="One or more Subject Identifiers (not IDs)")
+    subjects.add_argument("--all-subjects", action="store_true", help="Download every subject in the study")
     parser.add_argument("--data-category", type=str, choices=["raw-accelerometer", "imu", "temperature", "all"], help="raw-accelerometer, imu, temperature, or all")
     parser.add_argument("--start-date", type=lambda s: datetime.fromisoformat(s), required=True, help="Start date in ISO format (e.g. 2023-01-01)")
     parser.add_argument("--end-date", type=lambda s: datetime.fromisoformat(s), required=True, help="End date in ISO format (e.g. 2023-01-02)")
     parser.add_argument("--study-id", type=int, default=1414, help="CentrePoint Study ID")
     parser.add_argument("--file-format", type=str, default="avro", choices=["csv", "avro"], help="File format (csv or avro)")
-    parser.add_argument("--max-concurrency", type=int, default=5, help="Max number of concurrent downloads")
+    parser.add_argument("--max-concurrency", type=int, default=5, help="Max number of concurrent downloads across all subjects and categories")
+    parser.add_argument("--stream", action="store_true", help="Stream downloads to disk and convert Avro in bounded row groups")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE, help="Records per Parquet row group when streaming")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS, help="Max open connections in the shared HTTP pool")
+    parser.add_argument("--max-keepalive", type=int, default=DEFAULT_MAX_KEEPALIVE, help="Max idle keep-alive connections in the shared HTTP pool")
+    parser.add_argument("--keepalive-expiry", type=float, default=DEFAULT_KEEPALIVE_EXPIRY, help="Seconds to keep idle connections open")
+    parser.add_argument("--http2", action="store_true", help="Use HTTP/2 for downloads (requires the 'h2' package)")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH, help="DuckDB manifest of downloaded files used to skip unchanged files")
+    parser.add_argument("--no-manifest", action="store_true", help="Do not read or update the download manifest")
+    parser.add_argument("--force", action="store_true", help="Download every file even if the manifest says it is unchanged")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per file for transient network errors")
+    parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF, help="Base delay in seconds for jittered exponential backoff")
+    parser.add_argument("--decode-workers", type=int, default=0, help="Worker processes for Avro/gzip decoding (0 = use a thread pool)")
+    parser.add_argument("--decode-queue", type=int, default=None, help="Max files downloaded but not yet decoded (default: 2 x decode workers, at least max-concurrency)")
+    parser.add_argument("--ingest-dwh", type=Path, default=None, help="Append Avro downloads straight into the DuckDB warehouse in this directory")
+    parser.add_argument("--no-keep-parquet", action="store_true", help="With --ingest-dwh, do not write Parquet files to data/")
     return parser
 
 
-async def download_category(category, args, subject_id):
-    """Downloads files for a specific data category.
+async def list_category_files(category, args, subject_id, data_api):
+    """Lists every file for a data category, following pagination.
 
     Args:
-        category (str): Data category to download (e.g., 'imu').
+        category (str): Data category to list (e.g., 'imu').
         args: Parsed command-line arguments.
         subject_id (int): Numeric subject ID from metadata.
-    """
-    auth = CentrePointAuth()
-    data_api = DataAccessAPI(auth)
+        data_api (AsyncDataAccessAPI): Async data access client.
 
-    files = data_api.list_files(
+    Returns:
+        list[DataAccessFile]: All matching files.
+    """
+    return [f async for f in data_api.iter_files(
         study_id=args.study_id,
         subject_id=subject_id,
         data_category=category,
         start_date=args.start_date,
         end_date=args.end_date,
         file_format=args.file_format,
-    )
+    )]
 
-    if not files.items:
-        console.print(f"⚠️  [yellow]No files found for category '{category}'[/yellow]")
-        return
 
-    output_dir = Path(f"data/{category}")
-    output_dir.mkdir(parents=True, exist_ok=True)
+async def resolve_subjects(args, subject_api):
+    """Resolves the requested subject identifiers to Subject records.
 
-    table = Table(title=f"{category} Files to Download")
-    table.add_column("Date")
-    table.add_column("File Name")
-    table.add_column("Format")
+    Args:
+        args: Parsed command-line arguments.
+        subject_api (AsyncSubjectsAPI): Async subjects client.
 
-    for f in files.items:
-        table.add_row(f.date.date().isoformat(), f.fileName, f.fileFormat)
+    Returns:
+        list[Subject]: Subjects to download, in the order requested.
+    """
+    subjects = [s async for s in subject_api.iter_subjects(args.study_id)]
+    if args.all_subjects:
+        return subjects
 
-    console.print(table)
+    by_identifier = {s.subjectIdentifier: s for s in subjects}
+    resolved = []
+    for identifier in args.subject_identifier:
+        subject = by_identifier.get(identifier)
+        if subject is None:
+            console.print(f"❌ [red]Subject with identifier '{identifier}' not found in study {args.study_id}.[/red]")
+        else:
+            resolved.append(subject)
+    return resolved
 
-    sem = asyncio.Semaphore(args.max_concurrency)
-    progress = Progress()
-    task_id = progress.add_task(f"[cyan]Downloading {category}...", total=len(files.items))
 
-    is_gzipped = args.file_format == "csv"
-    ext = ".csv" if is_gzipped else ".avro"
+def url_refresher(args, category, f, data_api):
+    """Builds a callback that re-lists a file to obtain a fresh signed download URL.
 
-    with progress:
-        tasks = []
-        for f in files.items:
-            filename_date_part = f.date.date().isoformat()
-            output_filename = f"{args.subject_identifier}_{category}_{filename_date_part}{ext}"
-            output_path = output_dir / output_filename
-            tasks.append(download_data_file(f.downloadUrl, output_path, sem, progress, task_id, is_gzipped=is_gzipped))
-        await asyncio.gather(*tasks)
+    Args:
+        args: Parsed command-line arguments.
+        category (str): Data category of the file.
+        f (DataAccessFile): File whose URL has expired.
+        data_api (AsyncDataAccessAPI): Async data access client.
+
+    Returns:
+        UrlRefresher: Coroutine function returning ``(downloadUrl, downloadUrlExpiresOn)``.
+    """
+    async def refresh():
+        async for fresh in data_api.iter_files(
+            study_id=args.study_id,
+            subject_id=f.subjectId,
+            data_category=category,
+            start_date=f.date,
+            end_date=f.date + timedelta(days=1),
+            file_format=args.file_format,
+        ):
+            if fresh.date == f.date:
+                return fresh.downloadUrl, fresh.downloadUrlExpiresOn
+        raise LookupError(f"{f.fileName} is no longer listed; cannot refresh its download URL")
 
-    console.print(f"\n✅ [green]Download complete for {category}.[/green]\n")
+    return refresh
 
 
-async def run_download(args):
-    """Resolves subject and initiates downloads for the selected categories.
+def output_path_for(args, subject, category, f) -> Path:
+    """Builds the local path for a downloaded file.
 
     Args:
         args: Parsed command-line arguments.
+        subject (Subject): Subject the file belongs to.
+        category (str): Data category of the file.
+        f (DataAccessFile): File metadata from the API.
+
+    Returns:
+        Path: Destination path under ``data/<category>/``.
     """
-    auth = CentrePointAuth()
-    subject_api = SubjectsAPI(auth)
+    ext = ".csv" if args.file_format == "csv" else ".avro"
+    return Path(f"data/{category}") / f"{subject.subjectIdentifier}_{category}_{f.date.date().isoformat()}{ext}"
+
+
+class DWHIngester:
+    """Appends downloaded Avro files to the per-sensor DuckDB warehouse as they arrive.
+
+    One connection is kept open per sensor for the whole run. DuckDB allows a single writer
+    per database, so inserts into the same sensor are serialized while different sensors are
+    ingested concurrently off the event loop.
+    """
+
+    def __init__(self, dwh_root: Path, batch_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """Initializes the ingester.
+
+        Args:
+            dwh_root (Path): Directory holding the sensor DuckDB files.
+            batch_size (int, optional): Records decoded per Arrow batch. Defaults to DEFAULT_ROW_GROUP_SIZE.
+        """
+        self.builder = SensorDWHBuilder(Path("data"), dwh_root)
+        self.batch_size = batch_size
+        self.connections = {}
+        self.locks = {}
+
+    def for_file(self, category: str, output_path: Path):
+        """Builds the ingest callback for one download.
+
+        Args:
+            category (str): Sensor / data category of the file.
+            output_path (Path): Output path of the download; its Parquet name is what gets
+                recorded in ``_imported_files``.
+
+        Returns:
+            AvroIngest: Coroutine function taking the raw Avro path.
+        """
+        source_name = converted_path(output_path, is_gzipped=False).name
+
+        async def ingest(avro_path: Path):
+            async with self.locks.setdefault(category, asyncio.Lock()):
+                if category not in self.connections:
+                    self.connections[category] = self.builder.connect_sensor_db(category)
+                return await asyncio.to_thread(
+                    self.builder.ingest_avro, self.connections[category], category, avro_path, source_name, self.batch_size
+                )
+
+        return ingest
+
+    def close(self):
+        """Closes every sensor connection."""
+        for con in self.connections.values():
+            con.close()
+        self.connections.clear()
 
-    subjects = subject_api.list_subjects(args.study_id)
-    subject = next((s for s in subjects.items if s.subjectIdentifier == args.subject_identifier), None)
 
-    if not subject:
-        console.print(f"❌ [red]Subject with identifier '{args.subject_identifier}' not found in study {args.study_id}.[/red]")
-        return
+def decode_queue_size(args) -> int:
+    """Returns how many fetched files may wait for, or be in, the decode stage at once.
 
-    console.print(f"\n📦 Downloading data for subject [bold]{subject.subjectIdentifier}[/bold] (ID: {subject.id})")
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        int: Decode-stage capacity.
+    """
+    if args.decode_queue is not None:
+        return max(1, args.decode_queue)
+    return max(args.max_concurrency, 2 * args.decode_workers)
+
+
+async def download_study(args, subjects, categories, data_api, client, manifest=None, executor=None, ingester=None):
+    """Lists and downloads every (subject, category, day) file under one global concurrency budget.
+
+    Listings run concurrently; each file is scheduled for download as soon as its listing
+    arrives, so downloads start before every listing has completed. A single semaphore and
+    a single progress bar cover the whole run.
+
+    Args:
+        args: Parsed command-line arguments.
+        subjects (list[Subject]): Subjects to download.
+        categories (list[str]): Data categories to download.
+        data_api (AsyncDataAccessAPI): Async data access client.
+        client (httpx.AsyncClient): Shared pooled client used for every file download.
+        manifest (DownloadManifest, optional): If given, files whose ``modifiedDate`` matches the
+            manifest and whose local copy is intact are skipped (unless ``args.force``), and new
+            downloads are recorded.
+        executor (Executor, optional): Pool for the decode stage. Defaults to the loop's thread pool.
+        ingester (DWHIngester, optional): If given, every Avro file is also appended to the warehouse.
+            With ``args.no_keep_parquet`` no Parquet file is written at all.
+
+    Returns:
+        tuple[dict[tuple[str, str], list[int]], list[tuple[str, str, str, str]]]: ``[downloaded, unchanged, failed]``
+        counts per (subject identifier, category), and one (subject, category, date, error) entry per failed file.
+        A failed file or listing never aborts the other downloads; a failed listing counts as one failure
+        with the date "(listing)".
+    """
+    sem = asyncio.Semaphore(args.max_concurrency)
+    decode_slots = asyncio.Semaphore(decode_queue_size(args))
+    progress = Progress()
+    task_id = progress.add_task("[cyan]Downloading...", total=0)
+    is_gzipped = args.file_format == "csv"
+    keep_output = ingester is None or not args.no_keep_parquet
+
+    async def list_pair(subject, category):
+        # A failed listing is reported like a failed file instead of cancelling every other download.
+        try:
+            return subject, category, await list_category_files(category, args, subject.id, data_api), None
+        except Exception as e:
+            return subject, category, [], e
+
+    async def fetch(subject, category, f, output_path):
+        key = (subject.subjectIdentifier, category)
+        try:
+            written = await download_data_file(
+                f.downloadUrl, output_path, sem, progress, task_id,
+                is_gzipped=is_gzipped,
+                stream=args.stream,
+                row_group_size=args.row_group_size,
+                client=client,
+                retries=args.retries,
+                backoff=args.backoff,
+                refresh_url=url_refresher(args, category, f, data_api),
+                url_expires_on=f.downloadUrlExpiresOn,
+                executor=executor,
+                decode_slots=decode_slots,
+                ingest=ingester.for_file(category, output_path) if ingester is not None else None,
+                keep_output=keep_output,
+                version=f.modifiedDate.isoformat(),
+            )
+        except Exception as e:
+            counts[key][2] += 1
+            failures.append((*key, f.date.date().isoformat(), str(e)))
+            return
+        counts[key][0] += 1
+        if manifest is not None:
+            # Hashing a multi-GB file would stall every other download if done on the event loop.
+            fingerprint = await asyncio.to_thread(file_fingerprint, written) if written is not None else None
+            manifest.record(f, written, fingerprint)
+
+    counts: dict[tuple[str, str], list[int]] = {}
+    failures: list[tuple[str, str, str, str]] = []
+    downloads = []
+    scheduled = 0
+    with progress:
+        try:
+            listings = [list_pair(s, c) for s in subjects for c in categories]
+            for listing in asyncio.as_completed(listings):
+                subject, category, files, error = await listing
+                if error is not None:
+                    counts[(subject.subjectIdentifier, category)] = [0, 0, 1]
+                    failures.append((subject.subjectIdentifier, category, "(listing)", str(error)))
+                    continue
+                todo = []
+                for f in files:
+                    output_path = output_path_for(args, subject, category, f)
+                    local_path = converted_path(output_path, is_gzipped) if keep_output else None
+                    if manifest is None or args.force or not manifest.is_current(f, local_path):
+                        todo.append((f, output_path))
+
+                counts[(subject.subjectIdentifier, category)] = [0, len(files) - len(todo), 0]
+                if not todo:
+                    continue
+
+                Path(f"data/{category}").mkdir(parents=True, exist_ok=True)
+                scheduled += len(todo)
+                progress.update(task_id, total=scheduled)
+                for f, output_path in todo:
+                    downloads.append(asyncio.ensure_future(fetch(subject, category, f, output_path)))
+            await asyncio.gather(*downloads)
+        except BaseException:
+            for pending in downloads:
+                pending.cancel()
+            raise
+
+    return counts, failures
+
+
+def print_summary(counts, failures):
+    """Prints per subject and category counts, followed by any per-file failures.
 
-    categories = [args.data_category] if args.data_category != "all" else ["raw-accelerometer", "imu", "temperature"]
+    Args:
+        counts (dict[tuple[str, str], list[int]]): [downloaded, unchanged, failed] per (subject identifier, category).
+        failures (list[tuple[str, str, str, str]]): (subject, category, date, error) per failed file.
+    """
+    table = Table(title="Files Downloaded")
+    table.add_column("Subject")
+    table.add_column("Category")
+    table.add_column("Downloaded", justify="right")
+    table.add_column("Unchanged", justify="right")
+    table.add_column("Failed", justify="right")
+
+    for (identifier, category), (n, skipped, failed) in sorted(counts.items()):
+        table.add_row(
+            identifier,
+            category,
+            str(n) if n or skipped or failed else "[yellow]0[/yellow]",
+            str(skipped),
+            f"[red]{failed}[/red]" if failed else "0",
+        )
+
+    console.print(table)
 
-    for category in categories:
-        await download_category(category, args, subject.id)
+    if failures:
+        failed_table = Table(title="Failed Downloads")
+        failed_table.add_column("Subject")
+        failed_table.add_column("Category")
+        failed_table.add_column("Date")
+        failed_table.add_column("Error")
+        for row in sorted(failures):
+            failed_table.add_row(*row)
+        console.print(failed_table)
+
+
+async def run_download(args):
+    """Resolves subjects and initiates downloads for the selected categories.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        int: Number of files that failed to download.
+    """
+    auth = CentrePointAuth()
+
+    async with create_async_client(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_keepalive,
+        keepalive_expiry=args.keepalive_expiry,
+        http2=args.http2,
+    ) as client:
+        subject_api = AsyncSubjectsAPI(auth, client)
+        data_api = AsyncDataAccessAPI(auth, client)
+
+        subjects = await resolve_subjects(args, subject_api)
+        if not subjects:
+            console.print(f"❌ [red]No subjects to download in study {args.study_id}.[/red]")
+            return 0
+
+        console.print(f"\n📦 Downloading data for {len(subjects)} subject(s): [bold]{', '.join(s.subjectIdentifier for s in subjects)}[/bold]")
+
+        categories = [args.data_category] if args.data_category != "all" else ["raw-accelerometer", "imu", "temperature"]
+        manifest = None if args.no_manifest else DownloadManifest(args.manifest)
+        ingester = DWHIngester(args.ingest_dwh, args.row_group_size) if args.ingest_dwh is not None else None
+        executor = None
+        if args.decode_workers > 0:
+            # Spawn rather than fork: the parent already runs threads (DuckDB, the default executor).
+            executor = ProcessPoolExecutor(max_workers=args.decode_workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            counts, failures = await download_study(
+                args, subjects, categories, data_api, client, manifest=manifest, executor=executor, ingester=ingester
+            )
+        finally:
+            if ingester is not None:
+                ingester.close()
+            if executor is not None:
+                executor.shutdown()
+            if manifest is not None:
+                manifest.close()
+
+    print_summary(counts, failures)
+    if failures:
+        console.print(f"\n⚠️  [yellow]Download finished with {len(failures)} failed file(s); rerun to resume them.[/yellow]\n")
+    else:
+        console.print("\n✅ [green]Download complete.[/green]\n")
+    return len(failures)
 
 
 def main():
     """Command-line entrypoint for downloading CentrePoint data files."""
-    args = get_parser().parse_args()
-    asyncio.run(run_download(args))
+    parser = get_parser()
+    args = parser.parse_args()
+    if args.ingest_dwh is not None and args.file_format != "avro":
+        parser.error("--ingest-dwh requires --file-format avro")
+    if args.no_keep_parquet and args.ingest_dwh is None:
+        parser.error("--no-keep-parquet requires --ingest-dwh")
+    if asyncio.run(run_download(args)):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
     main()
-
@@ -5,6 +5,8 @@ import duckdb
 from rich.console import Console
 from rich.table import Table
 from pathlib import Path
+from centrepoint.dwh.catalog import connect_catalog
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT
 
 def get_parser():
     """Builds and returns the argument parser for subject listing CLI.
@@ -14,30 +16,62 @@ def get_parser():
     """
     parser = argparse.ArgumentParser(description="List subjects from metadata DB")
     parser.add_argument("--filter", type=str, help="Substring to filter subject codes (case-insensitive)")
+    parser.add_argument("--backend", choices=BACKENDS, default="duckdb", help="Read subjects from dwh/subjects.duckdb or the Parquet lakehouse")
+    parser.add_argument("--lake-root", type=Path, default=DEFAULT_LAKE_ROOT, help="Root of the Parquet lakehouse (with --backend lakehouse)")
+    parser.add_argument("--coverage", action="store_true", help="Add days, samples and first/last day of IMU data from the coverage catalog")
     return parser
 
+def coverage_sql(catalog: str) -> str:
+    """Builds the per-subject IMU summary joined onto ``subjects`` by ``--coverage``.
+
+    Args:
+        catalog (str): The ``_subject_coverage`` table or view to read.
+
+    Returns:
+        str: Query with ``subject_id``, ``days``, ``samples``, ``first_day`` and ``last_day``.
+    """
+    return f"""
+        SELECT subject_id, COUNT(DISTINCT day) AS days, SUM(row_count) AS samples,
+               MIN(day) AS first_day, MAX(day) AS last_day
+        FROM {catalog} WHERE sensor = 'imu' GROUP BY subject_id
+    """
+
 def main():
     """Main entrypoint to list subjects stored in the local DuckDB metadata database."""
     args = get_parser().parse_args()
-    db_path = Path("dwh/subjects.duckdb")
-    con = duckdb.connect(str(db_path))
+    console = Console()
+    con = connect_catalog(Path("dwh"), backend=args.backend, lake_root=args.lake_root)
 
-    sql = "SELECT subject_id, subject_identifier FROM subjects"
+    sql = "SELECT s.subject_id, s.subject_identifier"
+    if args.coverage:
+        sql += f", c.days, c.samples, c.first_day, c.last_day FROM subjects s LEFT JOIN ({coverage_sql('_subject_coverage')}) c USING (subject_id)"
+    else:
+        sql += " FROM subjects s"
     if args.filter:
-        sql += f" WHERE lower(subject_identifier) LIKE lower('%{args.filter}%')"
-    sql += " ORDER BY subject_identifier"
+        sql += f" WHERE lower(s.subject_identifier) LIKE lower('%{args.filter}%')"
+    sql += " ORDER BY s.subject_identifier"
 
-    rows = con.execute(sql).fetchall()
-    con.close()
+    try:
+        rows = con.execute(sql).fetchall()
+    except duckdb.CatalogException:
+        missing = "coverage catalog" if args.coverage else "subjects table"
+        console.print(f"[red]❌ No {missing} found; run build-dwh to create it[/red]")
+        return
+    finally:
+        con.close()
 
     table = Table(title="Subjects in Metadata DB")
     table.add_column("Subject ID", justify="right")
     table.add_column("Subject Code")
+    if args.coverage:
+        table.add_column("Days", justify="right")
+        table.add_column("Samples", justify="right")
+        table.add_column("First Day")
+        table.add_column("Last Day")
 
-    for sid, code in rows:
-        table.add_row(str(sid), code)
+    for row in rows:
+        table.add_row(*["" if value is None else str(value) for value in row])
 
-    console = Console()
     console.print(table)
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+# centrepoint/cli/migrate_dwh.py
+
+import argparse
+from pathlib import Path
+from centrepoint.dwh.catalog import SENSORS
+from centrepoint.dwh.migrate import migrate_to_compact
+
+def get_parser():
+    """Builds and returns the argument parser for the migration CLI.
+
+    Returns:
+        argparse.ArgumentParser: Configured parser for CLI arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert sensor DuckDB files to the compact schema (nanosecond BIGINT ts, FLOAT channels)"
+    )
+    parser.add_argument("--dwh-root", type=Path, default=Path("dwh"), help="Folder containing the sensor DuckDB files")
+    parser.add_argument("--sensors", nargs="+", choices=SENSORS, default=list(SENSORS), help="Sensor databases to migrate")
+    return parser
+
+def main():
+    """Main entrypoint: migrates each sensor database in place and reports its size before and after."""
+    args = get_parser().parse_args()
+    for sensor in args.sensors:
+        db_path = args.dwh_root / f"{sensor}.duckdb"
+        if not db_path.exists():
+            print(f"⚠️  Skipping {sensor}: no database at {db_path}")
+            continue
+        before = db_path.stat().st_size
+        tables = migrate_to_compact(db_path)
+        if not tables:
+            print(f"⏭️  {sensor} already uses the compact schema")
+            continue
+        after = db_path.stat().st_size
+        print(f"✅ Migrated {sensor} ({', '.join(tables)}): {before / 1e6:.1f} MB → {after / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
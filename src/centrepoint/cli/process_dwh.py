@@ -1,7 +1,8 @@
 # src/centrepoint/cli/process_dwh.py
 
 import argparse
-from centrepoint.dwh.processor import process_all_resultants
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT
+from centrepoint.dwh.processor import DEFAULT_LOOKAHEAD_SEC, DEFAULT_MAX_GAP_SEC, process_all_resultants
 
 def get_parser():
     """Builds and returns the argument parser for the resultants processing CLI.
@@ -14,6 +15,12 @@ def get_parser():
     parser.add_argument("--imu-db", type=str, default="dwh/imu.duckdb", help="Path to IMU DuckDB file")
     parser.add_argument("--accel-db", type=str, default="dwh/raw-accelerometer.duckdb", help="Path to accelerometer DuckDB file")
     parser.add_argument("--overwrite", action="store_true", help="Drop and recreate processed tables")
+    parser.add_argument("--backend", choices=BACKENDS, default="duckdb", help="Read raw sensor data from the DuckDB files or the Parquet lakehouse")
+    parser.add_argument("--lake-root", type=str, default=str(DEFAULT_LAKE_ROOT), help="Root of the Parquet lakehouse (with --backend lakehouse)")
+    parser.add_argument("--chunk-sec", type=float, default=600, help="Length of the time windows each subject is read in (seconds)")
+    parser.add_argument("--overlap-sec", type=float, default=DEFAULT_LOOKAHEAD_SEC, help="Seconds the zero-phase filter looks ahead across window edges")
+    parser.add_argument("--max-gap-sec", type=float, default=DEFAULT_MAX_GAP_SEC, help="Gaps between samples longer than this split a subject into separately filtered segments")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes filtering subjects in parallel")
     parser.add_argument("--dry-run", action="store_true", help="Print chunks to process, but do not write output")
     return parser
 
@@ -25,7 +32,13 @@ def main():
         imu_db_path=args.imu_db,
         accel_db_path=args.accel_db,
         overwrite=args.overwrite,
-        dry_run=args.dry_run
+        chunk_sec=args.chunk_sec,
+        overlap_sec=args.overlap_sec,
+        max_gap_sec=args.max_gap_sec,
+        dry_run=args.dry_run,
+        backend=args.backend,
+        lake_root=args.lake_root,
+        workers=args.workers
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+# centrepoint/cli/query_dwh.py
+
+import argparse
+import sys
+import duckdb
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from centrepoint.dwh.catalog import connect_catalog
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT
+
+def get_parser():
+    """Builds and returns the argument parser for the warehouse query CLI.
+
+    Returns:
+        argparse.ArgumentParser: Configured parser for CLI arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run one SQL query across all sensor and subject databases (attached read-only)"
+    )
+    parser.add_argument("sql", type=str, help="Query to run, e.g. SELECT * FROM filtered_imu JOIN subjects USING (subject_id)")
+    parser.add_argument("--dwh-root", type=Path, default=Path("dwh"), help="Folder containing the DuckDB files")
+    parser.add_argument("--backend", choices=BACKENDS, default="duckdb", help="Read raw sensor data from the DuckDB files or the Parquet lakehouse")
+    parser.add_argument("--lake-root", type=Path, default=DEFAULT_LAKE_ROOT, help="Root of the Parquet lakehouse (with --backend lakehouse)")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of rows to print")
+    return parser
+
+def main():
+    """Main entrypoint: runs the query on the warehouse catalog and prints the result as a table."""
+    args = get_parser().parse_args()
+    console = Console()
+    con = connect_catalog(args.dwh_root, backend=args.backend, lake_root=args.lake_root)
+    try:
+        result = con.execute(args.sql)
+        columns = [column[0] for column in result.description or []]
+        rows = result.fetchmany(args.limit)
+    except duckdb.Error as e:
+        console.print(f"[red]❌ Query failed: {e}[/red]")
+        sys.exit(1)
+    finally:
+        con.close()
+
+    table = Table(title=f"First {len(rows)} rows" if len(rows) == args.limit else f"{len(rows)} rows")
+    for column in columns:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*["" if value is None else str(value) for value in row])
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
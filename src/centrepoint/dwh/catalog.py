@@ -0,0 +1,109 @@
+# centrepoint/dwh/catalog.py
+
+from pathlib import Path
+from typing import Optional
+import duckdb
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT, register_lakehouse_views
+
+SENSORS = ("imu", "raw-accelerometer", "temperature")
+DATABASES = (*SENSORS, "motion", "subjects")
+
+def database_alias(name: str) -> str:
+    """Returns the name a warehouse file is attached under (e.g. 'raw-accelerometer' → 'raw_accelerometer_db')."""
+    return f"{name.replace('-', '_')}_db"
+
+def warehouse_files(dwh_root: Path = Path("dwh"), names: tuple[str, ...] = DATABASES) -> dict[str, Path]:
+    """Returns the ``<name>.duckdb`` files present under ``dwh_root``, keyed by attach alias."""
+    paths = {database_alias(name): Path(dwh_root) / f"{name}.duckdb" for name in names}
+    return {alias: path for alias, path in paths.items() if path.exists()}
+
+def attach_databases(con: duckdb.DuckDBPyConnection, databases: dict[str, Path], read_only: bool = True):
+    """ATTACHes DuckDB files to a connection and puts every attached database on the search path.
+
+    Tables then resolve by their plain names, in any attached file, after the connection's own
+    default database (which keeps receiving unqualified CREATE TABLEs).
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection to attach to.
+        databases (dict[str, Path]): DuckDB files keyed by the alias to attach them under.
+        read_only (bool, optional): Attach read-only, which other processes' read-only
+            connections tolerate. Defaults to True.
+    """
+    mode = " (READ_ONLY)" if read_only else ""
+    for alias, path in databases.items():
+        con.execute(f"ATTACH '{path}' AS {alias}{mode}")
+    attached = [
+        row[0] for row in con.execute("""
+            SELECT database_name FROM duckdb_databases()
+            WHERE NOT internal AND database_name <> current_database() ORDER BY database_oid
+        """).fetchall()
+    ]
+    search_path = ",".join(f"{name}.main" for name in [con.execute("SELECT current_database()").fetchone()[0], *attached])
+    con.execute(f"SET search_path = '{search_path}'")
+
+def _create_union_views(con: duckdb.DuckDBPyConnection, aliases: list[str]):
+    """Creates a view in ``memory.main`` for each table found in several attached files.
+
+    Catalog tables such as ``_subject_coverage`` and ``_imported_files`` exist in every sensor
+    file and carry a ``sensor`` column, so their union reads as one table across the warehouse.
+    """
+    if not aliases:
+        return
+    rows = con.execute(f"""
+        SELECT table_name, list(database_name ORDER BY database_name) FROM duckdb_tables()
+        WHERE database_name IN (SELECT unnest(?::VARCHAR[]))
+        GROUP BY table_name HAVING COUNT(*) > 1
+    """, [aliases]).fetchall()
+    existing = {row[0] for row in con.execute("SELECT view_name FROM duckdb_views() WHERE database_name = 'memory'").fetchall()}
+    for table_name, databases in rows:
+        if table_name in existing:
+            continue
+        union = " UNION ALL BY NAME ".join(f"SELECT * FROM {db}.{table_name}" for db in databases)
+        con.execute(f"CREATE VIEW memory.main.{table_name} AS {union}")
+
+def connect_catalog(
+    dwh_root: Path = Path("dwh"),
+    backend: str = "duckdb",
+    lake_root: Path = DEFAULT_LAKE_ROOT,
+    read_only: bool = True,
+    threads: Optional[int] = None,
+) -> duckdb.DuckDBPyConnection:
+    """Opens one in-memory DuckDB connection over the whole warehouse.
+
+    Every sensor file (``imu``, ``raw-accelerometer``, ``temperature``), ``motion.duckdb`` and
+    ``subjects.duckdb`` found under ``dwh_root`` is attached as ``<name>_db`` and put on the search path, so raw,
+    processed and metadata tables all resolve by their plain names and one query can join across
+    sensors, e.g. ``filtered_imu`` with ``accel_resultant`` and ``subjects``. Tables present in
+    several files (``_subject_coverage``, ``_imported_files``) are exposed as union views.
+
+    With the lakehouse backend the raw sensor tables, ``subjects`` and ``_subject_coverage`` are
+    the ``connect_lakehouse`` views, and the DuckDB files under ``dwh_root`` (holding the
+    processor's output) are attached behind them.
+
+    Args:
+        dwh_root (Path, optional): Directory of the DuckDB files. Defaults to ``dwh``.
+        backend (str, optional): "duckdb" or "lakehouse". Defaults to "duckdb".
+        lake_root (Path, optional): Root of the lakehouse tree. Defaults to DEFAULT_LAKE_ROOT.
+        read_only (bool, optional): Attach the files read-only, so the catalog can be opened
+            next to other readers (but not next to a writer). Defaults to True.
+        threads (Optional[int]): DuckDB worker threads. Defaults to DuckDB's own setting.
+
+    Returns:
+        duckdb.DuckDBPyConnection: The connection.
+
+    Raises:
+        ValueError: If ``backend`` is unknown.
+        FileNotFoundError: If the lakehouse backend is used and ``lake_root`` does not exist.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    con = duckdb.connect()
+    if threads is not None:
+        con.execute(f"SET threads = {int(threads)}")
+    if backend == "lakehouse":
+        register_lakehouse_views(con, Path(lake_root))
+
+    databases = warehouse_files(dwh_root)
+    attach_databases(con, databases, read_only=read_only)
+    _create_union_views(con, list(databases))
+    return con
@@ -2,25 +2,127 @@
 
 from centrepoint.api.subjects import SubjectsAPI
 from centrepoint.auth import CentrePointAuth
+from centrepoint.utils.files import DEFAULT_ROW_GROUP_SIZE, avro_record_batches
 from pathlib import Path
+from typing import Optional
 import duckdb
+import pyarrow as pa
 from rich.console import Console
 from rich.table import Table
 
+TS_PER_SEC = 1000  # ``ts`` is stored in milliseconds (DOUBLE)
+COMPACT_TS_PER_SEC = 1_000_000_000  # compact schema: exact integer nanoseconds (BIGINT)
+KEY_COLUMNS = ("Timestamp", "SampleOrder", "SubjectId")
+DEFAULT_MAX_GAP_SEC = 1.0  # steps between consecutive samples longer than this count as gaps
+
+_IMPORTED_FILES_DDL = """
+    CREATE TABLE IF NOT EXISTS _imported_files (
+        sensor TEXT,
+        filename TEXT PRIMARY KEY
+    )
+"""
+
+_COVERAGE_DDL = """
+    CREATE TABLE IF NOT EXISTS _subject_coverage (
+        sensor TEXT,
+        subject_id BIGINT,
+        day DATE,
+        source TEXT,
+        row_count BIGINT,
+        ts_min {ts_type},
+        ts_max {ts_type},
+        gap_count BIGINT
+    )
+"""
+
+def _normalize_column(col: str) -> str:
+    """Maps a raw CentrePoint column name to its warehouse name (``GyroscopeX`` → ``gyroscope_x``)."""
+    if col == "Timestamp":
+        return "ts"
+    return "".join(["_" + c.lower() if c.isupper() else c for c in col]).lstrip("_")
+
+# Nanosecond ``ts`` values pass this two weeks after the epoch; millisecond ones stay below it for 30,000 years.
+_MS_BIGINT_LIMIT = 10**15
+
+def ts_per_sec(con: duckdb.DuckDBPyConnection, relation: str, column: str = "ts", temperature: bool = False) -> int:
+    """Returns the ``ts`` resolution of a table, view or table function.
+
+    The compact schema stores ``ts`` as integer nanoseconds (BIGINT); anything else is the
+    default millisecond column. Default-schema temperature tables built before ``ts`` was cast
+    to DOUBLE took the type of an integer ``Timestamp`` and hold whole milliseconds in a BIGINT;
+    with ``temperature`` such a column only counts as nanoseconds if its values are that large.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection that can see ``relation``.
+        relation (str): Table expression with a ``ts`` column, e.g. ``imu`` or ``read_parquet('...')``.
+        column (str, optional): The ``ts``-valued column to inspect. Defaults to ``ts``.
+        temperature (bool, optional): ``relation`` holds temperature readings. Defaults to False.
+
+    Returns:
+        int: ``ts`` units per second: COMPACT_TS_PER_SEC or TS_PER_SEC.
+    """
+    ts_type = con.execute(f'DESCRIBE SELECT "{column}" FROM {relation}').fetchone()[1]
+    if ts_type != "BIGINT":
+        return TS_PER_SEC
+    if temperature:
+        row = con.execute(f'SELECT "{column}" FROM {relation} WHERE "{column}" IS NOT NULL LIMIT 1').fetchone()
+        if row is not None and abs(row[0]) < _MS_BIGINT_LIMIT:
+            return TS_PER_SEC
+    return COMPACT_TS_PER_SEC
+
+def output_types(units_per_sec: int) -> tuple[str, str]:
+    """Returns the ``ts`` and channel column types of derived tables for sources with this ``ts`` unit.
+
+    Args:
+        units_per_sec (int): ``ts`` units per second: COMPACT_TS_PER_SEC or TS_PER_SEC.
+
+    Returns:
+        tuple[str, str]: ``("BIGINT", "FLOAT")`` for the compact schema, else ``("DOUBLE", "DOUBLE")``.
+    """
+    return ("BIGINT", "FLOAT") if units_per_sec == COMPACT_TS_PER_SEC else ("DOUBLE", "DOUBLE")
+
+def ts_date_sql(units_per_sec: int, ts: str = "ts") -> str:
+    """Returns the SQL expression for the UTC calendar day of a ``ts`` value.
+
+    Args:
+        units_per_sec (int): ``ts`` units per second: COMPACT_TS_PER_SEC or TS_PER_SEC.
+        ts (str, optional): SQL expression of the ``ts`` value. Defaults to ``ts``.
+
+    Returns:
+        str: DATE expression.
+    """
+    ts_ms = f"({ts}) // {COMPACT_TS_PER_SEC // TS_PER_SEC}" if units_per_sec == COMPACT_TS_PER_SEC else f"CAST(floor({ts}) AS BIGINT)"
+    return f"epoch_ms({ts_ms})::DATE"
+
 class SensorDWHBuilder:
     """Builds DuckDB databases for each sensor type and a subject metadata table from downloaded data."""
 
-    def __init__(self, data_root: Path, dwh_root: Path, verbose: bool = False):
+    def __init__(
+        self,
+        data_root: Path,
+        dwh_root: Path,
+        verbose: bool = False,
+        threads: Optional[int] = None,
+        compact_schema: bool = False,
+    ):
         """Initializes the builder.
 
         Args:
             data_root (Path): Root path where raw sensor data is stored.
             dwh_root (Path): Destination directory for DuckDB databases.
             verbose (bool): Enable detailed progress output if True.
+            threads (Optional[int]): DuckDB worker threads per sensor connection. Defaults to DuckDB's
+                own setting (all cores); lower it when several builders run side by side.
+            compact_schema (bool): Store ``ts`` as exact integer nanoseconds and sensor channels as
+                FLOAT instead of millisecond DOUBLE ``ts`` and DOUBLE channels. Roughly halves the
+                size of the sensor tables; existing databases are converted with ``migrate-dwh``.
         """
         self.data_root = data_root
         self.dwh_root = dwh_root
         self.verbose = verbose
+        self.threads = threads
+        self.compact_schema = compact_schema
+        self.ts_per_sec = COMPACT_TS_PER_SEC if compact_schema else TS_PER_SEC
         self.console = Console()
         self.dwh_root.mkdir(parents=True, exist_ok=True)
 
@@ -48,7 +150,7 @@ class SensorDWHBuilder:
 
         auth = CentrePointAuth()
         api = SubjectsAPI(auth)
-        subjects = api.list_subjects(study_id).items
+        subjects = list(api.iter_subjects(study_id))
 
         existing_ids = set(row[0] for row in con.execute("SELECT subject_id FROM subjects").fetchall())
 
@@ -65,14 +167,263 @@ class SensorDWHBuilder:
         if self.verbose:
             self.console.print(f"[green]✅ Inserted {inserted} new subjects into {db_path}[/green]")
 
+    def table_name(self, sensor: str) -> str:
+        """Returns the DuckDB table name for a sensor key (e.g. 'raw-accelerometer' → 'raw_accelerometer')."""
+        return sensor.replace("-", "_")
+
+    def output_columns(self, sensor: str) -> list[str]:
+        """Returns the normalized (snake_case) column names of a sensor table, in table order.
+
+        Args:
+            sensor (str): Sensor key (e.g. 'imu', 'raw-accelerometer', 'temperature').
+
+        Returns:
+            list[str]: Column names, with ``Timestamp`` mapped to ``ts``.
+        """
+        return [_normalize_column(c) for c in self.sensor_columns[sensor]]
+
+    def select_sql(self, sensor: str) -> str:
+        """Builds the SELECT list that normalizes a sensor's raw columns.
+
+        Column names become snake_case, and ``Timestamp`` (seconds) plus ``SampleOrder`` become a
+        millisecond ``ts`` column. With the compact schema ``ts`` is an exact nanosecond BIGINT
+        (a 128 Hz sample is 7,812,500 ns) and the channel columns are cast to FLOAT.
+
+        Args:
+            sensor (str): Sensor key (e.g. 'imu', 'raw-accelerometer', 'temperature').
+
+        Returns:
+            str: Comma-separated select expressions.
+        """
+        col_exprs = []
+        for c in self.sensor_columns[sensor]:
+            if c == "Timestamp":
+                # Seconds are rounded to whole microseconds before scaling, so the BIGINT stays exact.
+                # The default schema's DOUBLE keeps integer ``Timestamp`` columns from producing a BIGINT
+                # of milliseconds, which would read as the compact schema's nanoseconds.
+                seconds = (
+                    f"CAST(round({c} * 1000000) AS BIGINT) * 1000" if self.compact_schema
+                    else f"CAST({c} AS DOUBLE) * {TS_PER_SEC}"
+                )
+                if sensor in ("imu", "raw-accelerometer"):
+                    sample = (
+                        f"CAST(SampleOrder AS BIGINT) * {COMPACT_TS_PER_SEC // 128}" if self.compact_schema
+                        else f"CAST(SampleOrder AS BIGINT) * {TS_PER_SEC} / 128"
+                    )
+                    col_exprs.append(f"({seconds} + {sample}) AS ts")
+                elif sensor == "temperature":
+                    col_exprs.append(f"({seconds}) AS ts")
+                else:
+                    col_exprs.append(f'{c} AS ts')
+            elif self.compact_schema and c not in KEY_COLUMNS:
+                col_exprs.append(f'CAST("{c}" AS FLOAT) AS {_normalize_column(c)}')
+            else:
+                col_exprs.append(f'"{c}" AS {_normalize_column(c)}')
+
+        return ", ".join(col_exprs)
+
+    def sort_columns(self, sensor: str) -> list[str]:
+        """Returns the clustering key of a sensor table: ``subject_id`` then ``ts``, where present.
+
+        Rows are stored in this order so that each row group covers a narrow (subject, time)
+        range, and DuckDB's min/max zone maps can skip row groups for per-subject time-range scans.
+        """
+        columns = self.sensor_columns[sensor]
+        keys = []
+        if "SubjectId" in columns:
+            keys.append("subject_id")
+        if "Timestamp" in columns:
+            keys.append("ts")
+        return keys
+
+    def date_sql(self) -> str:
+        """Returns the SQL expression for the UTC calendar day of ``ts``."""
+        return ts_date_sql(self.ts_per_sec)
+
+    def has_coverage(self, sensor: str) -> bool:
+        """Whether a sensor's imports are summarized in the coverage catalog (it needs ``subject_id`` and ``ts``)."""
+        return self.sort_columns(sensor) == ["subject_id", "ts"]
+
+    def coverage_sql(self, relation: str, source: str) -> str:
+        """Builds the query summarizing normalized sensor rows for the coverage catalog.
+
+        Rows are first collapsed into DEFAULT_MAX_GAP_SEC-wide buckets by a hash aggregate, and
+        gaps are counted between consecutive occupied buckets: ordering thousands of buckets per
+        subject-day is far cheaper than ordering every sample.
+
+        Args:
+            relation (str): Table expression with normalized ``subject_id`` and ``ts`` columns.
+            source (str): SQL expression naming the source file of each row.
+
+        Returns:
+            str: Query with one row per (subject, day, source): ``subject_id``, ``day``, ``source``,
+            ``row_count``, ``ts_min``, ``ts_max`` and ``gap_count``, the number of breaks leaving at
+            least one whole bucket without samples.
+        """
+        return f"""
+            SELECT subject_id, day, source, SUM(n) AS row_count, MIN(lo) AS ts_min, MAX(hi) AS ts_max,
+                   COUNT(*) FILTER (WHERE step > 1) AS gap_count
+            FROM (
+                SELECT *, bucket - LAG(bucket) OVER (PARTITION BY subject_id, day, source ORDER BY bucket) AS step
+                FROM (
+                    SELECT subject_id, {self.date_sql()} AS day, {source} AS source,
+                           floor(ts / {DEFAULT_MAX_GAP_SEC * self.ts_per_sec}) AS bucket,
+                           COUNT(*) AS n, MIN(ts) AS lo, MAX(ts) AS hi
+                    FROM {relation}
+                    GROUP BY ALL
+                )
+            )
+            GROUP BY subject_id, day, source
+        """
+
+    def _record_coverage(self, con: duckdb.DuckDBPyConnection, sensor: str, relation: str, source: str, params=None):
+        """Appends the coverage of ``relation`` (see ``coverage_sql``) to ``_subject_coverage``."""
+        if self.has_coverage(sensor):
+            con.execute(
+                f"INSERT INTO _subject_coverage SELECT '{sensor}', * FROM ({self.coverage_sql(relation, source)})", params
+            )
+
+    def _order_by(self, sensor: str) -> str:
+        keys = self.sort_columns(sensor)
+        return f"ORDER BY {', '.join(keys)}" if keys else ""
+
+    def _check_ts_unit(self, con: duckdb.DuckDBPyConnection, sensor: str, relation: str):
+        """Refuses to append to sensor data stored with the other ``ts`` unit.
+
+        Raises:
+            ValueError: If ``relation`` does not use this builder's schema.
+        """
+        if (
+            "Timestamp" in self.sensor_columns[sensor]
+            and ts_per_sec(con, relation, temperature=sensor == "temperature") != self.ts_per_sec
+        ):
+            existing = "compact" if self.ts_per_sec == TS_PER_SEC else "default"
+            raise ValueError(
+                f"Existing {sensor} data uses the {existing} schema; build with a matching "
+                f"compact_schema setting, or convert it with migrate-dwh"
+            )
+
+    def _ensure_tables(self, con: duckdb.DuckDBPyConnection, sensor: str, source: str):
+        """Creates the sensor table (typed from ``source``), the import log and the coverage catalog if missing.
+
+        A catalog created for a database that already holds data is backfilled from the sensor
+        table once, with a NULL ``source``.
+
+        Args:
+            con (duckdb.DuckDBPyConnection): Connection to the sensor database.
+            sensor (str): Sensor key.
+            source (str): Table expression with the raw columns, e.g. ``read_parquet('...')``.
+
+        Raises:
+            ValueError: If the existing table uses the other schema (see ``compact_schema``).
+        """
+        con.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name(sensor)} AS
+            SELECT {self.select_sql(sensor)} FROM {source} LIMIT 0
+        """)
+        self._check_ts_unit(con, sensor, self.table_name(sensor))
+
+        con.execute(_IMPORTED_FILES_DDL)
+
+        has_catalog = con.execute(
+            "SELECT COUNT(*) FROM duckdb_tables() WHERE database_name = current_database() AND table_name = '_subject_coverage'"
+        ).fetchone()[0]
+        if not has_catalog:
+            con.execute(_COVERAGE_DDL.format(ts_type="BIGINT" if self.compact_schema else "DOUBLE"))
+            self._record_coverage(con, sensor, self.table_name(sensor), "NULL::VARCHAR")
+
+    def connect_sensor_db(self, sensor: str) -> duckdb.DuckDBPyConnection:
+        """Opens the DuckDB file for a sensor.
+
+        Args:
+            sensor (str): Sensor key.
+
+        Returns:
+            duckdb.DuckDBPyConnection: Read-write connection to ``<dwh_root>/<sensor>.duckdb``.
+
+        Raises:
+            ValueError: If the sensor name is unknown.
+        """
+        if sensor not in self.sensor_columns:
+            raise ValueError(f"No column config defined for sensor '{sensor}'")
+        return self._connect(self.dwh_root / f"{sensor}.duckdb")
+
+    def _connect(self, db_path: Path) -> duckdb.DuckDBPyConnection:
+        """Opens a DuckDB file, applying the configured thread budget."""
+        con = duckdb.connect(str(db_path))
+        if self.threads is not None:
+            con.execute(f"SET threads = {int(self.threads)}")
+        return con
+
+    def ingest_avro(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        sensor: str,
+        avro_path: Path,
+        source_name: str,
+        batch_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> Optional[int]:
+        """Appends a raw Avro file straight into the sensor table, without an intermediate Parquet file.
+
+        Records are decoded in Arrow batches of ``batch_size`` and normalized with the same
+        column mapping and ``ts`` derivation as ``build_sensor_db``. The file is logged in
+        ``_imported_files`` under ``source_name`` and summarized in ``_subject_coverage`` in the
+        same transaction, so a later ``build_sensor_db`` run over a kept Parquet copy with that
+        name skips it. The decoded file is staged in a temporary table, since the Arrow stream
+        can only be read once.
+
+        Args:
+            con (duckdb.DuckDBPyConnection): Connection from ``connect_sensor_db``.
+            sensor (str): Sensor key.
+            avro_path (Path): Raw Avro file.
+            source_name (str): Name recorded in ``_imported_files`` (the Parquet file name it replaces).
+            batch_size (int, optional): Records decoded per Arrow batch. Defaults to DEFAULT_ROW_GROUP_SIZE.
+
+        Returns:
+            Optional[int]: Rows inserted, or None if ``source_name`` was already imported.
+        """
+        batches = avro_record_batches(avro_path, batch_size)
+        con.register("_avro_schema", pa.Table.from_batches([], schema=batches.schema))
+        try:
+            self._ensure_tables(con, sensor, "_avro_schema")
+        finally:
+            con.unregister("_avro_schema")
+
+        if con.execute("SELECT 1 FROM _imported_files WHERE filename = ?", [source_name]).fetchone():
+            return None
+
+        con.register("_avro_batches", batches)
+        try:
+            con.execute("BEGIN TRANSACTION")
+            try:
+                con.execute(f"CREATE TEMP TABLE _avro_staged AS SELECT {self.select_sql(sensor)} FROM _avro_batches")
+                result = con.execute(f"""
+                    INSERT INTO {self.table_name(sensor)}
+                    SELECT * FROM _avro_staged
+                    {self._order_by(sensor)}
+                """).fetchone()
+                self._record_coverage(con, sensor, "_avro_staged", "?", [source_name])
+                con.execute("DROP TABLE _avro_staged")
+                con.execute("INSERT INTO _imported_files (sensor, filename) VALUES (?, ?)", (sensor, source_name))
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+        finally:
+            con.unregister("_avro_batches")
+        return result[0] if result else 0
+
     def build_sensor_db(self, sensor: str):
         """Builds a DuckDB file for a given sensor type by normalizing and importing its raw Parquet files.
 
+        Each imported file is summarized per subject and day in ``_subject_coverage`` in the same
+        transaction, so planners can list subjects and time spans without scanning the sensor table.
+
         Args:
             sensor (str): Sensor key (e.g. 'imu', 'raw-accelerometer', 'temperature').
 
         Raises:
-            ValueError: If the sensor name is unknown.
+            ValueError: If the sensor name is unknown, or its database uses the other schema.
             FileNotFoundError: If no Parquet files are found for the sensor.
         """
         if sensor not in self.sensor_columns:
@@ -86,71 +437,62 @@ class SensorDWHBuilder:
         print(f"🛠 Creating or updating DuckDB for '{sensor}' from {len(parquet_files)} parquet files")
 
         db_path = self.dwh_root / f"{sensor}.duckdb"
-        con = duckdb.connect(str(db_path))
-
-        table_name = sensor.replace("-", "_")
-
-        def normalize(col: str) -> str:
-            if col == "Timestamp":
-                return "ts"
-            return "".join(["_" + c.lower() if c.isupper() else c for c in col]).lstrip("_")
-
-        cols = self.sensor_columns[sensor]
-
-        col_exprs = []
-        for c in cols:
-            if c == "Timestamp":
-                if sensor in ("imu", "raw-accelerometer"):
-                    col_exprs.append("(" + c + " * 1000 + CAST(SampleOrder AS BIGINT) * 1000 / 128) AS ts")
-                elif sensor == "temperature":
-                    col_exprs.append("(" + c + " * 1000) AS ts")
-                else:
-                    col_exprs.append(f'{c} AS ts')
-            else:
-                col_exprs.append(f'"{c}" AS {normalize(c)}')
+        con = self._connect(db_path)
 
-        col_str = ", ".join(col_exprs)
+        table_name = self.table_name(sensor)
+        col_str = self.select_sql(sensor)
+        self._ensure_tables(con, sensor, f"read_parquet('{parquet_files[0]}')")
 
-        first_file = parquet_files[0]
-        con.execute(f"""
-            CREATE TABLE IF NOT EXISTS {table_name} AS
-            SELECT {col_str} FROM read_parquet('{first_file}') LIMIT 0
-        """)
-
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS _imported_files (
-                sensor TEXT,
-                filename TEXT PRIMARY KEY
-            )
-        """)
+        already_imported = {
+            row[0] for row in con.execute(
+                "SELECT filename FROM _imported_files WHERE filename IN (SELECT unnest(?::VARCHAR[]))",
+                [[pf.name for pf in parquet_files]],
+            ).fetchall()
+        }
+        new_files = [pf for pf in parquet_files if pf.name not in already_imported]
+        if already_imported:
+            print(f"⏭️  Skipping {len(already_imported)} already imported file(s)")
 
-        total_inserted = 0
         summary_table = Table(show_header=True, header_style="bold cyan")
         summary_table.add_column("Filename")
         summary_table.add_column("Rows Inserted", justify="right")
 
-        for pf in parquet_files:
-            filename = pf.name
-            exists = con.execute(f"SELECT 1 FROM _imported_files WHERE filename = ?", [filename]).fetchone()
-
-            if exists:
-                print(f"⏭️  Skipping already imported: {filename}")
-                continue
-
-            print(f"📅 Inserting: {filename}")
-            con.execute(f"""
-                INSERT INTO {table_name}
-                SELECT {col_str} FROM read_parquet('{str(pf)}')
-            """)
-            con.execute("INSERT INTO _imported_files (sensor, filename) VALUES (?, ?)", (sensor, filename))
+        total_inserted = 0
+        if new_files:
+            paths = [str(pf) for pf in new_files]
+            print(f"📅 Inserting {len(new_files)} file(s) in one pass")
+            con.execute("BEGIN TRANSACTION")
+            try:
+                result = con.execute(f"""
+                    INSERT INTO {table_name}
+                    SELECT {col_str} FROM read_parquet(?, union_by_name = true)
+                    {self._order_by(sensor)}
+                """, [paths]).fetchone()
+                con.execute(
+                    "INSERT INTO _imported_files (sensor, filename) SELECT ?, unnest(?::VARCHAR[])",
+                    [sensor, [pf.name for pf in new_files]],
+                )
+                # A second, narrow read: only the subject and ts columns of the new files are decoded.
+                self._record_coverage(
+                    con, sensor,
+                    f"(SELECT {col_str}, filename FROM read_parquet(?, union_by_name = true, filename = true))",
+                    "parse_filename(filename)", [paths],
+                )
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            total_inserted = result[0] if result else 0
 
             if self.verbose:
-                result = con.execute(f"SELECT COUNT(*) FROM read_parquet('{str(pf)}')").fetchone()
-                if result:
-                    count = result[0]
-                    summary_table.add_row(filename, str(count))
-                    total_inserted += count
-
+                # Per-file counts come from the Parquet footers, not from re-reading the data.
+                for file_name, num_rows in con.execute(
+                    "SELECT file_name, num_rows FROM parquet_file_metadata(?)", [paths]
+                ).fetchall():
+                    summary_table.add_row(Path(file_name).name, str(num_rows))
+
+        # Kept alongside clustered inserts: zone-map pruning alone has not beaten the ART index on ts
+        # for short per-subject range reads, see scripts/benchmark_chunk_reads.py.
         try:
             con.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_ts ON {table_name}(ts)")
         except duckdb.Error:
@@ -163,3 +505,46 @@ class SensorDWHBuilder:
             self.console.print(summary_table)
             print(f"📊 Total new rows inserted into {table_name}: {total_inserted}\n")
 
+    def cluster_sensor_db(self, sensor: str):
+        """Rewrites a sensor table in (subject_id, ts) order.
+
+        Each import is inserted sorted, but successive imports append new row groups, so a
+        subject's data ends up spread across the table over time. Rewriting it restores a single
+        sorted run, letting zone maps prune all but the row groups a query actually needs.
+
+        The rewrite drops the ART index on ts and builds it again afterwards: zone maps alone
+        read a 10-minute chunk slower than with the index (see ``scripts/benchmark_chunk_reads.py``).
+
+        Args:
+            sensor (str): Sensor key (e.g. 'imu', 'raw-accelerometer', 'temperature').
+
+        Raises:
+            ValueError: If the sensor name is unknown.
+            FileNotFoundError: If the sensor database does not exist yet.
+        """
+        if sensor not in self.sensor_columns:
+            raise ValueError(f"No column config defined for sensor '{sensor}'")
+        db_path = self.dwh_root / f"{sensor}.duckdb"
+        if not db_path.exists():
+            raise FileNotFoundError(f"No DuckDB database for {sensor} at {db_path}")
+
+        table_name = self.table_name(sensor)
+        order_by = self._order_by(sensor)
+        if not order_by:
+            return
+
+        con = self._connect(db_path)
+        try:
+            con.execute(f"DROP INDEX IF EXISTS idx_{table_name}_ts")
+            con.execute("BEGIN TRANSACTION")
+            try:
+                con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {table_name} {order_by}")
+                con.execute(f"CREATE INDEX idx_{table_name}_ts ON {table_name}(ts)")
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            con.execute("CHECKPOINT")
+        finally:
+            con.close()
+        print(f"🧹 Clustered {table_name} by {', '.join(self.sort_columns(sensor))}")
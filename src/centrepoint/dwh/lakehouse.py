@@ -0,0 +1,331 @@
+# centrepoint/dwh/lakehouse.py
+
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+from rich.table import Table
+
+from centrepoint.api.subjects import SubjectsAPI
+from centrepoint.auth import CentrePointAuth
+from centrepoint.dwh.creator import SensorDWHBuilder
+
+BACKENDS = ("duckdb", "lakehouse")
+DEFAULT_LAKE_ROOT = Path("lake")
+IMPORTED_DIR = "_imported"
+COVERAGE_DIR = "_coverage"
+
+class LakehouseBuilder(SensorDWHBuilder):
+    """Builds a Hive-partitioned Parquet warehouse instead of one DuckDB file per sensor.
+
+    Sensor data is laid out as ``<lake_root>/sensor=<sensor>/subject_id=<id>/date=<YYYY-MM-DD>/*.parquet``,
+    the coverage catalog as ``<lake_root>/_coverage/sensor=<sensor>/<source>.parquet`` and subject
+    metadata as ``<lake_root>/subjects/subjects.parquet``. Every source file is written
+    under its own file names, so several builders can ingest different files at once and re-importing
+    a file after a crash overwrites its partial output rather than duplicating it. Use
+    ``connect_lakehouse`` to query the result through DuckDB views named like the DuckDB backend tables.
+    """
+
+    def __init__(
+        self,
+        data_root: Path,
+        lake_root: Path = DEFAULT_LAKE_ROOT,
+        verbose: bool = False,
+        threads: Optional[int] = None,
+        compact_schema: bool = False,
+    ):
+        """Initializes the builder.
+
+        Args:
+            data_root (Path): Root path where raw sensor data is stored.
+            lake_root (Path): Destination directory for the partitioned Parquet tree.
+            verbose (bool): Enable detailed progress output if True.
+            threads (Optional[int]): DuckDB worker threads used while writing.
+            compact_schema (bool): Write nanosecond BIGINT ``ts`` and FLOAT channels (see ``SensorDWHBuilder``).
+        """
+        super().__init__(data_root, lake_root, verbose=verbose, threads=threads, compact_schema=compact_schema)
+        self.lake_root = lake_root
+
+    def sensor_dir(self, sensor: str) -> Path:
+        """Returns the ``sensor=<sensor>`` directory of a sensor."""
+        return self.lake_root / f"sensor={sensor}"
+
+    def data_glob(self, sensor: str) -> str:
+        """Returns the glob matching every data file of a sensor, one level per partition key."""
+        depth = "/".join(["*"] * (len(self.partition_columns(sensor)) + 1))
+        return f"{self.sensor_dir(sensor)}/{depth}.parquet"
+
+    def coverage_dir(self, sensor: str) -> Path:
+        """Returns the directory holding a sensor's coverage catalog files."""
+        return self.lake_root / COVERAGE_DIR / f"sensor={sensor}"
+
+    def _marker(self, sensor: str, source: Path) -> Path:
+        """Returns the file recording that ``source`` has been imported."""
+        return self.sensor_dir(sensor) / IMPORTED_DIR / f"{source.name}.done"
+
+    def partition_columns(self, sensor: str) -> list[str]:
+        """Returns the Hive partition keys of a sensor: ``subject_id`` and ``date`` where available."""
+        return ["date" if key == "ts" else key for key in self.sort_columns(sensor)]
+
+    def _partitioned_select(self, sensor: str, source: str) -> str:
+        """Builds the query that normalizes ``source`` and adds the ``date`` partition column."""
+        date_expr = f", {self.date_sql()} AS date" if "date" in self.partition_columns(sensor) else ""
+        return f"SELECT *{date_expr} FROM (SELECT {self.select_sql(sensor)} FROM {source}) {self._order_by(sensor)}"
+
+    def build_sensor_db(self, sensor: str):
+        """Writes a sensor's new raw Parquet files into the partitioned tree.
+
+        Args:
+            sensor (str): Sensor key (e.g. 'imu', 'raw-accelerometer', 'temperature').
+
+        Raises:
+            ValueError: If the sensor name is unknown, or its existing files use the other schema.
+            FileNotFoundError: If no Parquet files are found for the sensor.
+        """
+        if sensor not in self.sensor_columns:
+            raise ValueError(f"No column config defined for sensor '{sensor}'")
+
+        parquet_dir = self.data_root / sensor
+        parquet_files = sorted(parquet_dir.glob("*.parquet"))
+        if not parquet_files:
+            raise FileNotFoundError(f"No parquet files found for {sensor} in {parquet_dir}")
+
+        sensor_dir = self.sensor_dir(sensor)
+        imported_dir = sensor_dir / IMPORTED_DIR
+        imported_dir.mkdir(parents=True, exist_ok=True)
+        new_files = [pf for pf in parquet_files if not self._marker(sensor, pf).exists()]
+        print(f"🛠 Writing {len(new_files)} new of {len(parquet_files)} parquet files for '{sensor}' to {sensor_dir}")
+
+        summary_table = Table(show_header=True, header_style="bold cyan")
+        summary_table.add_column("Filename")
+        summary_table.add_column("Rows Written", justify="right")
+
+        partition_by = ", ".join(self.partition_columns(sensor))
+        options = f"FORMAT PARQUET, PARTITION_BY ({partition_by}), OVERWRITE_OR_IGNORE" if partition_by else "FORMAT PARQUET"
+        con = duckdb.connect()
+        if self.threads is not None:
+            con.execute(f"SET threads = {int(self.threads)}")
+        total_written = 0
+        try:
+            written = next((f for f in sensor_dir.rglob("*.parquet")), None)
+            if written is not None:
+                self._check_ts_unit(con, sensor, f"read_parquet('{written}')")
+            coverage_dir = self.coverage_dir(sensor)
+            if self.has_coverage(sensor) and not coverage_dir.exists():
+                coverage_dir.mkdir(parents=True)
+                if written is not None:
+                    # Data written before the catalog existed is summarized once, with a NULL source.
+                    data = f"read_parquet('{self.data_glob(sensor)}', hive_partitioning = true, union_by_name = true)"
+                    summary = self.coverage_sql(data, "NULL::VARCHAR")
+                    con.execute(f"COPY ({summary}) TO '{coverage_dir / '_backfill.parquet'}' (FORMAT PARQUET)")
+            for pf in new_files:
+                if partition_by:
+                    target = str(sensor_dir)
+                    pattern = f", FILENAME_PATTERN '{pf.stem}_'"
+                else:
+                    target, pattern = str(sensor_dir / f"{pf.stem}.parquet"), ""
+                result = con.execute(f"""
+                    COPY ({self._partitioned_select(sensor, f"read_parquet('{pf}')")})
+                    TO '{target}' ({options}{pattern})
+                """).fetchone()
+                if self.has_coverage(sensor):
+                    rows = f"(SELECT {self.select_sql(sensor)} FROM read_parquet('{pf}'))"
+                    summary = self.coverage_sql(rows, f"'{pf.name}'")
+                    con.execute(f"COPY ({summary}) TO '{coverage_dir / pf.stem}.parquet' (FORMAT PARQUET)")
+                # The marker is written last: a crash before it re-imports the file over the same names.
+                self._marker(sensor, pf).touch()
+
+                count = result[0] if result else 0
+                total_written += count
+                summary_table.add_row(pf.name, str(count))
+        finally:
+            con.close()
+
+        print(f"✅ Finished updating {sensor} in {sensor_dir}")
+        if self.verbose:
+            self.console.print(summary_table)
+            print(f"📊 Total new rows written for {sensor}: {total_written}\n")
+
+    def compact(self, sensor: str) -> int:
+        """Merges each partition's files into a single ``ts``-sorted Parquet file.
+
+        Incremental imports leave one file per source file in a partition; compaction bounds the
+        number of files (and footers) a per-subject, per-day scan has to open. Run it while no
+        builder is writing to the sensor and no reader is querying it.
+
+        Args:
+            sensor (str): Sensor key.
+
+        Returns:
+            int: Number of partitions compacted.
+        """
+        sensor_dir = self.sensor_dir(sensor)
+        partitions = {f.parent for f in sensor_dir.rglob("*.parquet")}
+        order_by = "ORDER BY ts" if "ts" in self.sort_columns(sensor) else ""
+
+        compacted = 0
+        con = duckdb.connect()
+        try:
+            for partition in sorted(partitions):
+                files = sorted(partition.glob("*.parquet"))
+                if len(files) < 2:
+                    continue
+                target = partition / f"compacted_{uuid.uuid4().hex}.parquet"
+                tmp = target.with_name(target.name + ".tmp")
+                con.execute(f"""
+                    COPY (SELECT * FROM read_parquet(?, hive_partitioning = false, union_by_name = true) {order_by})
+                    TO '{tmp}' (FORMAT PARQUET)
+                """, [[str(f) for f in files]])
+                os.replace(tmp, target)
+                for f in files:
+                    f.unlink()
+                compacted += 1
+        finally:
+            con.close()
+
+        print(f"🧹 Compacted {compacted} partition(s) of {sensor}")
+        return compacted
+
+    def cluster_sensor_db(self, sensor: str):
+        """Lakehouse counterpart of ``SensorDWHBuilder.cluster_sensor_db``: compacts every partition.
+
+        Raises:
+            ValueError: If the sensor name is unknown.
+            FileNotFoundError: If the sensor has not been written yet.
+        """
+        if sensor not in self.sensor_columns:
+            raise ValueError(f"No column config defined for sensor '{sensor}'")
+        if not self.sensor_dir(sensor).exists():
+            raise FileNotFoundError(f"No lakehouse data for {sensor} at {self.sensor_dir(sensor)}")
+        self.compact(sensor)
+
+    def build_subject_metadata_db(self, study_id: int):
+        """Fetches subject metadata from the API and merges it into ``subjects/subjects.parquet``.
+
+        Args:
+            study_id (int): CentrePoint study ID from which to pull subject list.
+        """
+        path = self.lake_root / "subjects" / "subjects.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        existing = pq.read_table(path).to_pylist() if path.exists() else []
+        known = {row["subject_id"] for row in existing}
+
+        auth = CentrePointAuth()
+        api = SubjectsAPI(auth)
+        new_rows = [
+            {"subject_id": subj.id, "subject_identifier": subj.subjectIdentifier}
+            for subj in api.iter_subjects(study_id)
+            if subj.id not in known
+        ]
+
+        schema = pa.schema([("subject_id", pa.int64()), ("subject_identifier", pa.string())])
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(pa.Table.from_pylist(existing + new_rows, schema=schema), tmp)
+        os.replace(tmp, path)
+        if self.verbose:
+            self.console.print(f"[green]✅ Inserted {len(new_rows)} new subjects into {path}[/green]")
+
+def connect_lakehouse(lake_root: Path = DEFAULT_LAKE_ROOT, threads: Optional[int] = None) -> duckdb.DuckDBPyConnection:
+    """Opens an in-memory DuckDB connection with views over a lakehouse tree.
+
+    One view is created per sensor present (``imu``, ``raw_accelerometer``, ``temperature``) with the
+    same columns, in the same order, as the DuckDB backend tables, plus ``subjects`` if metadata was
+    written and ``_subject_coverage`` (every sensor's catalog, told apart by ``sensor``). Filters on ``subject_id`` are pushed down to the Hive partitions, so only that subject's
+    directories are scanned.
+
+    Args:
+        lake_root (Path, optional): Root of the partitioned tree. Defaults to DEFAULT_LAKE_ROOT.
+        threads (Optional[int]): DuckDB worker threads. Defaults to DuckDB's own setting.
+
+    Returns:
+        duckdb.DuckDBPyConnection: Connection exposing the views.
+
+    Raises:
+        FileNotFoundError: If ``lake_root`` does not exist.
+    """
+    con = duckdb.connect()
+    if threads is not None:
+        con.execute(f"SET threads = {int(threads)}")
+    register_lakehouse_views(con, lake_root)
+    return con
+
+def register_lakehouse_views(con: duckdb.DuckDBPyConnection, lake_root: Path = DEFAULT_LAKE_ROOT, temporary: bool = False):
+    """Creates the lakehouse views (see ``connect_lakehouse``) on an existing connection.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection to add the views to.
+        lake_root (Path, optional): Root of the partitioned tree. Defaults to DEFAULT_LAKE_ROOT.
+        temporary (bool, optional): Create connection-local TEMP views, e.g. to read lakehouse data
+            through a connection to a DuckDB output file without persisting the views. Defaults to False.
+
+    Raises:
+        FileNotFoundError: If ``lake_root`` does not exist.
+    """
+    lake_root = Path(lake_root)
+    if not lake_root.is_dir():
+        raise FileNotFoundError(f"No lakehouse found at {lake_root}")
+    builder = LakehouseBuilder(lake_root, lake_root)
+    create = "CREATE OR REPLACE TEMP VIEW" if temporary else "CREATE OR REPLACE VIEW"
+
+    for sensor in builder.sensor_columns:
+        sensor_dir = builder.sensor_dir(sensor)
+        if not any(sensor_dir.glob("**/*.parquet")):
+            continue
+        con.execute(f"""
+            {create} {builder.table_name(sensor)} AS
+            SELECT {", ".join(builder.output_columns(sensor))}
+            FROM read_parquet('{builder.data_glob(sensor)}', hive_partitioning = true, union_by_name = true)
+        """)
+
+    coverage = lake_root / COVERAGE_DIR
+    if any(coverage.glob("*/*.parquet")):
+        con.execute(f"""
+            {create} _subject_coverage AS
+            SELECT sensor, subject_id, day, source, row_count, ts_min, ts_max, gap_count
+            FROM read_parquet('{coverage}/*/*.parquet', hive_partitioning = true, union_by_name = true)
+        """)
+
+    subjects = lake_root / "subjects" / "subjects.parquet"
+    if subjects.exists():
+        con.execute(f"{create} subjects AS SELECT subject_id, subject_identifier FROM read_parquet('{subjects}')")
+
+def connect_warehouse(
+    sensor: str,
+    backend: str = "duckdb",
+    dwh_root: Path = Path("dwh"),
+    lake_root: Path = DEFAULT_LAKE_ROOT,
+) -> duckdb.DuckDBPyConnection:
+    """Opens a connection on which a sensor's raw table and its processed tables resolve by name.
+
+    With the DuckDB backend this is simply ``<dwh_root>/<sensor>.duckdb``. With the lakehouse backend
+    the raw tables are the ``connect_lakehouse`` views, and ``<dwh_root>/<sensor>.duckdb`` (where the
+    processor writes e.g. ``filtered_imu``) is attached read-only behind them on the search path.
+
+    Args:
+        sensor (str): Sensor key (e.g. 'imu').
+        backend (str, optional): "duckdb" or "lakehouse". Defaults to "duckdb".
+        dwh_root (Path, optional): Directory of the DuckDB files. Defaults to ``dwh``.
+        lake_root (Path, optional): Root of the lakehouse tree. Defaults to DEFAULT_LAKE_ROOT.
+
+    Returns:
+        duckdb.DuckDBPyConnection: The connection.
+
+    Raises:
+        ValueError: If ``backend`` is unknown.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    db_path = Path(dwh_root) / f"{sensor}.duckdb"
+    if backend == "duckdb":
+        return duckdb.connect(str(db_path))
+
+    con = connect_lakehouse(lake_root)
+    if db_path.exists():
+        con.execute(f"ATTACH '{db_path}' AS dwh (READ_ONLY)")
+        con.execute("SET search_path = 'memory.main,dwh.main'")
+    return con
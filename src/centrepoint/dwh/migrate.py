@@ -0,0 +1,109 @@
+# centrepoint/dwh/migrate.py
+
+import os
+from pathlib import Path
+import duckdb
+from centrepoint.dwh.creator import COMPACT_TS_PER_SEC, TS_PER_SEC, ts_per_sec
+
+NS_PER_MS = COMPACT_TS_PER_SEC // TS_PER_SEC
+TS_COLUMNS = ("ts", "ts_min", "ts_max")  # milliseconds in the default schema, usually DOUBLE
+
+# Bookkeeping columns that hold ``ts`` values (whole milliseconds before migrating).
+TS_BOOKKEEPING_COLUMNS = {
+    "_processed_chunks": ("ts_start", "ts_end"),
+    "_subject_watermarks": ("ts_end", "segment_start", "tail_start"),
+}
+
+def _ms_to_ns_sql(col: str) -> str:
+    """Converts a millisecond DOUBLE (or whole-millisecond BIGINT) to exact nanoseconds.
+
+    Whole milliseconds and the fraction are scaled separately: ``ts * 1e6`` itself would exceed
+    the 53-bit mantissa of a double for present-day epochs and round.
+    """
+    return (
+        f'CAST(floor("{col}") AS BIGINT) * {NS_PER_MS} '
+        f'+ CAST(round(("{col}" - floor("{col}")) * {NS_PER_MS}) AS BIGINT)'
+    )
+
+def migrate_to_compact(db_path: Path) -> list[str]:
+    """Rewrites a sensor database from the default schema to the compact one.
+
+    Every table with millisecond ``ts`` values (the sensor table, ``filtered_imu``,
+    ``accel_resultant``, the ``ts_min``/``ts_max`` of ``_subject_coverage``) gets exact
+    nanosecond BIGINTs and FLOAT channels, and is written back in (subject_id, ts) order. The
+    ``ts`` values in ``_processed_chunks`` and ``_subject_watermarks`` are scaled to nanoseconds,
+    so incremental runs carry on where they left off. Other tables are copied unchanged,
+    constraints included.
+
+    The database is written to a new file that then replaces the original, so the old pages are
+    not kept around and an interrupted migration leaves the original untouched. No other process
+    may have the database open meanwhile.
+
+    Args:
+        db_path (Path): Sensor DuckDB file, e.g. ``dwh/imu.duckdb``.
+
+    Returns:
+        list[str]: The tables converted; empty if the database already uses the compact schema.
+
+    Raises:
+        FileNotFoundError: If ``db_path`` does not exist.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"No DuckDB database at {db_path}")
+
+    tmp = db_path.with_name(db_path.name + ".compact.tmp")
+    tmp.unlink(missing_ok=True)
+    con = duckdb.connect(str(tmp))
+    converted = []
+    try:
+        con.execute(f"ATTACH '{db_path}' AS legacy (READ_ONLY)")
+        tables = con.execute(
+            "SELECT table_name, sql FROM duckdb_tables() WHERE database_name = 'legacy' ORDER BY table_name"
+        ).fetchall()
+        column_types = {
+            name: {row[0]: row[1] for row in con.execute(f'DESCRIBE legacy."{name}"').fetchall()}
+            for name, _ in tables
+        }
+
+        def has_ms_ts(name: str) -> bool:
+            types = column_types[name]
+            if any(types.get(c) == "DOUBLE" for c in TS_COLUMNS):
+                return True
+            # Default-schema temperature tables built from integer timestamps hold BIGINT milliseconds.
+            return name == "temperature" and types.get("ts") == "BIGINT" and (
+                ts_per_sec(con, 'legacy."temperature"', temperature=True) == TS_PER_SEC
+            )
+
+        ms_tables = {name for name, _ in tables if has_ms_ts(name)}
+        if ms_tables:
+            for name, ddl in tables:
+                types = column_types[name]
+                if name in ms_tables:
+                    exprs = [
+                        f'{_ms_to_ns_sql(c)} AS "{c}"' if c in TS_COLUMNS
+                        else f'CAST("{c}" AS FLOAT) AS "{c}"' if t == "DOUBLE"
+                        else f'"{c}"'
+                        for c, t in types.items()
+                    ]
+                    keys = [c for c in ("subject_id", "ts") if c in types]
+                    order_by = f"ORDER BY {', '.join(keys)}" if keys else ""
+                    con.execute(f'CREATE TABLE "{name}" AS SELECT {", ".join(exprs)} FROM legacy."{name}" {order_by}')
+                    converted.append(name)
+                else:
+                    scaled = TS_BOOKKEEPING_COLUMNS.get(name, ())
+                    con.execute(ddl)
+                    exprs = [f'"{c}" * {NS_PER_MS}' if c in scaled else f'"{c}"' for c in types]
+                    con.execute(f'INSERT INTO "{name}" SELECT {", ".join(exprs)} FROM legacy."{name}"')
+                    if scaled:
+                        converted.append(name)
+        con.execute("DETACH legacy")
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+
+    if converted:
+        os.replace(tmp, db_path)
+    else:
+        tmp.unlink(missing_ok=True)
+    return converted
@@ -0,0 +1,485 @@
+# centrepoint/dwh/motion.py
+
+from datetime import date
+from pathlib import Path
+import duckdb
+from rich.console import Console
+from rich.progress import track
+from centrepoint.dwh.catalog import SENSORS, attach_databases, warehouse_files
+from centrepoint.dwh.creator import COMPACT_TS_PER_SEC, output_types, ts_date_sql, ts_per_sec
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT, register_lakehouse_views
+
+console = Console()
+
+DEFAULT_ACCEL_TOLERANCE_SEC = 0.5 / 128  # half a 128 Hz sample period
+DEFAULT_TEMPERATURE_TOLERANCE_SEC = 60.0
+SEC_PER_DAY = 86_400
+
+_MOTION_DAYS_DDL = """
+    CREATE TABLE IF NOT EXISTS _motion_days (
+        subject_id BIGINT,
+        day DATE,
+        gyro_rows BIGINT,
+        accel_rows BIGINT,
+        temperature_rows BIGINT,
+        coverage_rows BIGINT,
+        PRIMARY KEY(subject_id, day)
+    )
+"""
+
+# Stands in for a missing ``temperature`` table: motion rows then get NULL temperatures.
+_NO_TEMPERATURE_SQL = "(SELECT NULL::{ts_type} AS ts, NULL::BIGINT AS subject_id, NULL::{channel} AS temperature_celsius WHERE false)"
+
+MotionDay = tuple[int, date, int | None, int | None, int | None, int | None]
+
+def _ts_span(seconds: float, units_per_sec: int) -> float | int:
+    """Converts seconds to a ``ts`` span; exact integers in the compact schema."""
+    return round(seconds * units_per_sec) if units_per_sec == COMPACT_TS_PER_SEC else seconds * units_per_sec
+
+def _day_counts_sql(relation: str, units_per_sec: int, margin: float | int, row_filter: str) -> str:
+    """Counts a source's rows per (subject, day), including rows within ``margin`` of the day.
+
+    A day's motion rows read accelerometer and temperature samples up to the tolerance beyond its
+    edges, so a sample near midnight counts towards both days it can be joined onto. Rows are
+    first aggregated by the days of ``ts - margin``, ``ts`` and ``ts + margin``, which only differ
+    near midnight, so the list unnest runs over a handful of groups rather than every sample.
+    ``in_day`` counts the rows inside the day itself.
+    """
+    return f"""
+        SELECT subject_id, day, SUM(n) AS n, SUM(n) FILTER (WHERE own = day) AS in_day FROM (
+            SELECT subject_id, n, own, unnest(list_distinct([lo, hi])) AS day FROM (
+                SELECT subject_id, {ts_date_sql(units_per_sec, f"ts - {margin}")} AS lo,
+                       {ts_date_sql(units_per_sec)} AS own,
+                       {ts_date_sql(units_per_sec, f"ts + {margin}")} AS hi, COUNT(*) AS n
+                FROM {relation} WHERE subject_id IS NOT NULL {row_filter}
+                GROUP BY ALL
+            )
+        )
+        GROUP BY ALL
+    """
+
+def _coverage_relation(con: duckdb.DuckDBPyConnection) -> str | None:
+    """Returns a relation over the ``_subject_coverage`` rows of every sensor, or None if there are none.
+
+    With the lakehouse backend that is its ``_subject_coverage`` view; otherwise each attached
+    sensor file keeps its own table, and they are read together.
+    """
+    if con.execute("SELECT COUNT(*) FROM duckdb_views() WHERE temporary AND view_name = '_subject_coverage'").fetchone()[0]:
+        return "_subject_coverage"
+    databases = [
+        row[0] for row in con.execute(
+            "SELECT database_name FROM duckdb_tables() WHERE table_name = '_subject_coverage' ORDER BY database_name"
+        ).fetchall()
+    ]
+    if not databases:
+        return None
+    return "(" + " UNION ALL BY NAME ".join(f"SELECT * FROM {db}.main._subject_coverage" for db in databases) + ")"
+
+def _coverage_days_sql(
+    coverage: str, units_per_sec: int, accel_tolerance: float | int, temperature_tolerance: float | int, subject_filter: str
+) -> str:
+    """Summarizes the catalogued source rows that can reach each (subject, day) of ``motion``.
+
+    A coverage row reaches its own day and, if its first or last sample lies within the
+    source's tolerance of midnight, the neighbouring day. ``coverage_rows`` sums the rows of all
+    three sensors reaching the day; ``gyro_rows`` and ``accel_rows`` sum the imported gyroscope
+    and accelerometer rows inside the day, for comparison with what has been processed.
+    """
+    margin = f"CASE sensor WHEN 'raw-accelerometer' THEN {accel_tolerance} WHEN 'temperature' THEN {temperature_tolerance} ELSE 0 END"
+    return f"""
+        SELECT subject_id, motion_day AS day, SUM(row_count) AS coverage_rows,
+               SUM(row_count) FILTER (WHERE sensor = 'imu' AND day = motion_day) AS gyro_rows,
+               SUM(row_count) FILTER (WHERE sensor = 'raw-accelerometer' AND day = motion_day) AS accel_rows
+        FROM (
+            SELECT subject_id, sensor, day, row_count, unnest(list_distinct([
+                day, {ts_date_sql(units_per_sec, f"ts_min - ({margin})")}, {ts_date_sql(units_per_sec, f"ts_max + ({margin})")}
+            ])) AS motion_day
+            FROM {coverage}
+            WHERE sensor IN ('imu', 'raw-accelerometer', 'temperature') AND subject_id IS NOT NULL {subject_filter}
+        )
+        GROUP BY ALL
+    """
+
+def _candidate_runs(
+    con: duckdb.DuckDBPyConnection, coverage_days: str, subject_filter: str
+) -> list[tuple[int, date, date | None]]:
+    """Lists the stretches of days ``plan_motion_days`` has to count, as ``(subject_id, first, last)``.
+
+    A day is a candidate if the catalogued rows reaching it differ from those recorded when it
+    was built (new or late-imported files, or data not yet processed back then), and each
+    subject's days from its latest built one on always are (``last`` is None), which covers
+    sources written without a catalog entry. Consecutive candidate days are merged.
+    """
+    changed = con.execute(f"""
+        SELECT COALESCE(c.subject_id, d.subject_id) AS subject_id, COALESCE(c.day, d.day) AS day
+        FROM ({coverage_days}) c
+        FULL JOIN (SELECT * FROM _motion_days WHERE true {subject_filter}) d
+            ON d.subject_id = c.subject_id AND d.day = c.day
+        WHERE c.coverage_rows IS DISTINCT FROM d.coverage_rows
+        ORDER BY 1, 2
+    """).fetchall()
+    tails = dict(con.execute(
+        f"SELECT subject_id, MAX(day) FROM _motion_days WHERE true {subject_filter} GROUP BY ALL"
+    ).fetchall())
+
+    runs = []
+    for subject_id, day in changed:
+        tail = tails.get(subject_id)
+        if tail is not None and day >= tail:
+            continue
+        if runs and runs[-1][0] == subject_id and (day - runs[-1][2]).days <= 1:
+            runs[-1] = (subject_id, runs[-1][1], day)
+        else:
+            runs.append((subject_id, day, day))
+    runs.extend((subject_id, tail, None) for subject_id, tail in tails.items())
+    return runs
+
+def _plan_sql(
+    units_per_sec: int,
+    accel_tolerance: float | int,
+    temperature_tolerance: float | int,
+    temperature: str,
+    coverage_days: str | None,
+    subject_filter: str,
+    first: date | None = None,
+    last: date | None = None,
+) -> str:
+    """Builds the query comparing each (subject, day)'s source row counts with ``_motion_days``.
+
+    Without ``first`` every day is counted; otherwise only ``first`` to ``last`` (or on).
+    """
+    gyro_filter = accel_filter = temperature_filter = day_filter = ""
+    if first is not None:
+        lo = _day_range(first, units_per_sec)[0]
+        gyro_filter, accel_filter, temperature_filter, day_filter = (
+            f"AND ts >= {lo}", f"AND ts >= {lo - accel_tolerance}", f"AND ts >= {lo - temperature_tolerance}",
+            f"AND day >= DATE '{first}'",
+        )
+        if last is not None:
+            hi = _day_range(last, units_per_sec)[1]
+            gyro_filter += f" AND ts < {hi}"
+            accel_filter += f" AND ts < {hi + accel_tolerance}"
+            temperature_filter += f" AND ts < {hi + temperature_tolerance}"
+            day_filter += f" AND day <= DATE '{last}'"
+    # A day's catalogued rows are recorded once all its gyroscope and accelerometer rows were
+    # processed; until then it stays a candidate, so it is rebuilt when they arrive.
+    coverage_rows = "NULL::BIGINT" if coverage_days is None else """
+        CASE WHEN s.gyro_rows = c.gyro_rows AND s.accel_in_day = COALESCE(c.accel_rows, 0) THEN c.coverage_rows END
+    """
+    coverage_join = "" if coverage_days is None else f"LEFT JOIN ({coverage_days}) c ON c.subject_id = s.subject_id AND c.day = s.day"
+    return f"""
+        WITH gyro AS (
+            SELECT subject_id, {ts_date_sql(units_per_sec)} AS day, COUNT(*) AS n
+            FROM filtered_imu WHERE subject_id IS NOT NULL {subject_filter} {gyro_filter} GROUP BY ALL
+        ),
+        accel AS ({_day_counts_sql("accel_resultant", units_per_sec, accel_tolerance, subject_filter + " " + accel_filter)}),
+        temp AS ({_day_counts_sql(temperature, units_per_sec, temperature_tolerance, subject_filter + " " + temperature_filter)}),
+        sources AS (
+            SELECT g.subject_id, g.day, g.n AS gyro_rows, COALESCE(a.n, 0) AS accel_rows,
+                   COALESCE(a.in_day, 0) AS accel_in_day, COALESCE(t.n, 0) AS temperature_rows
+            FROM gyro g
+            LEFT JOIN accel a ON a.subject_id = g.subject_id AND a.day = g.day
+            LEFT JOIN temp t ON t.subject_id = g.subject_id AND t.day = g.day
+        ),
+        stamped AS (
+            SELECT s.*, {coverage_rows} AS coverage_rows FROM sources s {coverage_join}
+        )
+        SELECT COALESCE(s.subject_id, d.subject_id) AS subject_id, COALESCE(s.day, d.day) AS day,
+               s.gyro_rows, s.accel_rows, s.temperature_rows, s.coverage_rows
+        FROM (SELECT * FROM stamped WHERE true {day_filter}) s
+        FULL JOIN (SELECT * FROM _motion_days WHERE true {subject_filter} {day_filter}) d
+            ON d.subject_id = s.subject_id AND d.day = s.day
+        WHERE s.gyro_rows IS DISTINCT FROM d.gyro_rows
+           OR s.accel_rows IS DISTINCT FROM d.accel_rows
+           OR s.temperature_rows IS DISTINCT FROM d.temperature_rows
+        ORDER BY 1, 2
+    """
+
+def plan_motion_days(
+    con: duckdb.DuckDBPyConnection,
+    units_per_sec: int,
+    accel_tolerance: float | int,
+    temperature_tolerance: float | int,
+    temperature: str = "temperature",
+    subject_id: int | None = None,
+) -> list[MotionDay]:
+    """Lists the (subject, day)s whose ``motion`` rows are missing or out of date.
+
+    Each day's source row counts (``filtered_imu`` within the day; ``accel_resultant`` and
+    ``temperature`` within the day widened by their tolerances) are compared with the counts
+    recorded in ``_motion_days`` when it was last built. Days whose counts changed, or that have
+    no gyroscope samples any more, are returned.
+
+    Counting scans the sources, so with a ``_subject_coverage`` catalog only candidate days are
+    counted (see ``_candidate_runs``): days the catalog shows new rows for, and each subject's
+    days from its latest built one on. Planning then costs the new data, not the whole history.
+    Sources changed in place, without an import the catalog records, need ``overwrite``.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Catalog connection seeing the sources and ``_motion_days``.
+        units_per_sec (int): ``ts`` units per second of the sources.
+        accel_tolerance (float | int): Accelerometer tolerance in ``ts`` units.
+        temperature_tolerance (float | int): Temperature tolerance in ``ts`` units.
+        temperature (str, optional): Relation holding temperature samples. Defaults to ``temperature``.
+        subject_id (int | None, optional): Restrict the plan to one subject.
+
+    Returns:
+        list[MotionDay]: ``(subject_id, day, gyro_rows, accel_rows, temperature_rows,
+        coverage_rows)`` in (subject, day) order; ``gyro_rows`` is None for days whose motion rows
+        should be removed, and ``coverage_rows`` is the catalog count to record with the day.
+    """
+    subject_filter = "" if subject_id is None else f"AND subject_id = {int(subject_id)}"
+    coverage = _coverage_relation(con)
+    if coverage is None:
+        sql = _plan_sql(units_per_sec, accel_tolerance, temperature_tolerance, temperature, None, subject_filter)
+        return con.execute(sql).fetchall()
+
+    coverage_days = _coverage_days_sql(coverage, units_per_sec, accel_tolerance, temperature_tolerance, subject_filter)
+    plan = []
+    for subject, first, last in _candidate_runs(con, coverage_days, subject_filter):
+        sql = _plan_sql(
+            units_per_sec, accel_tolerance, temperature_tolerance, temperature, coverage_days,
+            f"AND subject_id = {int(subject)}", first, last,
+        )
+        plan.extend(con.execute(sql).fetchall())
+    return sorted(plan)
+
+def motion_sql(units_per_sec: int, temperature: str = "temperature") -> str:
+    """Builds the statement aligning one subject-day of accelerometer and temperature onto the gyroscope.
+
+    The filtered gyroscope samples are the 128 Hz grid. Each grid point takes the nearest
+    ``accel_resultant`` sample within ``$accel_tol``, and a temperature linearly interpolated
+    between the readings either side of it that lie within ``$temperature_tol``, or the one such
+    reading there is. Columns are NULL where nothing lies within tolerance.
+
+    Each source is joined with a single ASOF join: an accelerometer sample owns the grid points
+    from the midpoint after its predecessor on (so the backward join finds the nearest sample),
+    and a temperature reading carries the next one along. A sentinel reading before the day lets
+    points ahead of the first reading reach it. Two-sided (backward and forward) joins would sort
+    the grid twice per source.
+
+    Args:
+        units_per_sec (int): ``ts`` units per second of the sources.
+        temperature (str, optional): Relation holding temperature samples. Defaults to ``temperature``.
+
+    Returns:
+        str: Query taking ``$subject_id``, the day's ``ts`` range ``[$lo, $hi)``, ``$accel_tol``
+        and ``$temperature_tol``, with the ``motion`` columns in ``ts`` order.
+    """
+    # Integer nanoseconds stay exact; halving them as doubles would not.
+    half = "// 2" if units_per_sec == COMPACT_TS_PER_SEC else "/ 2"
+    return f"""
+        WITH grid AS (
+            SELECT * FROM filtered_imu WHERE subject_id = $subject_id AND ts >= $lo AND ts < $hi
+        ),
+        accel_samples AS (
+            SELECT ts, {{'x': x, 'y': y, 'z': z, 'resultant': resultant_accel}} AS v,
+                   COALESCE(ts - (ts - LAG(ts) OVER (ORDER BY ts)) {half}, $lo - $accel_tol - 1) AS cell_start
+            FROM accel_resultant
+            WHERE subject_id = $subject_id AND ts >= $lo - $accel_tol AND ts < $hi + $accel_tol
+        ),
+        temperature_samples AS (
+            SELECT ts, v, LEAD(ts) OVER (ORDER BY ts) AS next_ts, LEAD(v) OVER (ORDER BY ts) AS next_v FROM (
+                SELECT ts, temperature_celsius AS v FROM {temperature}
+                WHERE subject_id = $subject_id AND ts >= $lo - $temperature_tol AND ts < $hi + $temperature_tol
+                UNION ALL SELECT $lo - $temperature_tol - 1, NULL
+            )
+        ),
+        aligned AS (
+            SELECT g.*,
+                   CASE WHEN abs(g.ts - a.ts) <= $accel_tol THEN a.v END AS accel,
+                   CASE
+                       WHEN g.ts - t.ts <= $temperature_tol AND t.next_ts - g.ts <= $temperature_tol AND t.next_ts > t.ts
+                           THEN t.v + (t.next_v - t.v) * (g.ts - t.ts) / (t.next_ts - t.ts)
+                       WHEN g.ts - t.ts <= $temperature_tol THEN t.v
+                       WHEN t.next_ts - g.ts <= $temperature_tol THEN t.next_v
+                   END AS temperature_celsius
+            FROM grid g
+            ASOF LEFT JOIN accel_samples a ON g.ts > a.cell_start
+            ASOF LEFT JOIN temperature_samples t ON g.ts >= t.ts
+        )
+        SELECT ts, sample_order, subject_id, gyroscope_x, gyroscope_y, gyroscope_z, resultant_gyro,
+               aligned.accel.x AS accel_x, aligned.accel.y AS accel_y, aligned.accel.z AS accel_z,
+               aligned.accel.resultant AS resultant_accel, temperature_celsius
+        FROM aligned
+        ORDER BY ts
+    """
+
+def _day_range(day: date, units_per_sec: int) -> tuple[int, int]:
+    """Returns the ``ts`` range ``[lo, hi)`` of a UTC day."""
+    lo = (day - date(1970, 1, 1)).days * SEC_PER_DAY * units_per_sec
+    return lo, lo + SEC_PER_DAY * units_per_sec
+
+def build_motion(
+    dwh_root: str = "dwh",
+    overwrite: bool = False,
+    accel_tolerance_sec: float = DEFAULT_ACCEL_TOLERANCE_SEC,
+    temperature_tolerance_sec: float = DEFAULT_TEMPERATURE_TOLERANCE_SEC,
+    subject_identifier: str | None = None,
+    dry_run: bool = False,
+    backend: str = "duckdb",
+    lake_root: str = str(DEFAULT_LAKE_ROOT),
+    cluster: bool = False,
+) -> list[tuple[int, date]] | None:
+    """Builds the ``motion`` table: gyroscope, accelerometer and temperature aligned on one 128 Hz grid.
+
+    Reads ``filtered_imu`` and ``accel_resultant`` (written by ``process_all_resultants``) and
+    the raw ``temperature`` table through one catalog connection, and writes ``motion`` and its
+    ``_motion_days`` bookkeeping to ``motion.duckdb`` under ``dwh_root``. Each (subject, day) is
+    aligned by one set-based statement (see ``motion_sql``) and committed together with its
+    bookkeeping; only days whose sources changed since the last run are rebuilt (see
+    ``plan_motion_days``). Re-run with ``overwrite`` after reprocessing with other filter settings,
+    which leaves row counts unchanged.
+
+    Each day is appended in ``ts`` order, so new days of a subject seen earlier and rebuilt days
+    land after the rows written before them. ``cluster`` rewrites the whole table in
+    (subject_id, ts) order afterwards; that costs a full copy, so it is left to the caller.
+
+    Args:
+        dwh_root (str): Folder containing the sensor DuckDB files.
+        overwrite (bool): If True, drop and rebuild ``motion`` from scratch.
+        accel_tolerance_sec (float): Largest gap between a gyroscope sample and the accelerometer
+            sample joined onto it.
+        temperature_tolerance_sec (float): Largest gap between a gyroscope sample and the
+            temperature readings it is interpolated from.
+        subject_identifier (str | None): Restrict to one subject by code.
+        dry_run (bool): If True, list the days that would be built without writing them;
+            ``motion.duckdb`` is then only read, and not created if missing.
+        backend (str): Where raw temperature data is read from: "duckdb" or "lakehouse" (the
+            Parquet tree under ``lake_root``). Processed inputs and the output are DuckDB files.
+        lake_root (str): Root of the lakehouse tree, used when ``backend`` is "lakehouse".
+        cluster (bool): If True, rewrite ``motion`` in (subject_id, ts) order after building.
+
+    Returns:
+        list[tuple[int, date]] | None: The (subject, day)s built or removed; None if the subject
+        was not found.
+
+    Raises:
+        RuntimeError: If ``filtered_imu`` or ``accel_resultant`` is missing.
+        ValueError: If ``backend`` is unknown, a tolerance is negative, or the sources (or an
+            existing ``motion`` table) mix the default and compact ``ts`` schemas.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    if accel_tolerance_sec < 0 or temperature_tolerance_sec < 0:
+        raise ValueError("Tolerances must not be negative")
+
+    dwh_root = Path(dwh_root)
+    if dry_run:
+        # Only reads: an existing motion.duckdb is attached read-only like the sources.
+        con = duckdb.connect()
+        databases = warehouse_files(dwh_root, (*SENSORS, "subjects", "motion"))
+    else:
+        con = duckdb.connect(str(dwh_root / "motion.duckdb"))
+        databases = warehouse_files(dwh_root, (*SENSORS, "subjects"))
+    try:
+        attach_databases(con, databases)
+        if backend == "lakehouse":
+            register_lakehouse_views(con, Path(lake_root), temporary=True)
+        return _build_motion(
+            con, overwrite, accel_tolerance_sec, temperature_tolerance_sec, subject_identifier, dry_run, cluster
+        )
+    finally:
+        con.close()
+
+def _build_motion(
+    con: duckdb.DuckDBPyConnection,
+    overwrite: bool,
+    accel_tolerance_sec: float,
+    temperature_tolerance_sec: float,
+    subject_identifier: str | None,
+    dry_run: bool,
+    cluster: bool = False,
+) -> list[tuple[int, date]] | None:
+    """Plans and builds the motion days on the connection opened by ``build_motion``."""
+    try:
+        units = ts_per_sec(con, "filtered_imu")
+        source_units = {"accel_resultant": ts_per_sec(con, "accel_resultant")}
+    except duckdb.CatalogException as e:
+        raise RuntimeError("Expected tables 'filtered_imu' and 'accel_resultant' to exist. Run process-dwh first.") from e
+    ts_type, channel = output_types(units)
+    try:
+        source_units["temperature"] = ts_per_sec(con, "temperature", temperature=True)
+        temperature = "temperature"
+    except duckdb.CatalogException:
+        temperature = _NO_TEMPERATURE_SQL.format(ts_type=ts_type, channel=channel)
+    mismatched = [name for name, unit in source_units.items() if unit != units]
+    if mismatched:
+        raise ValueError(f"{', '.join(mismatched)} and filtered_imu use different ts schemas; convert them with migrate-dwh")
+
+    if overwrite and not dry_run:
+        con.execute("DROP TABLE IF EXISTS motion")
+        con.execute("DROP TABLE IF EXISTS _motion_days")
+    try:
+        motion_units = ts_per_sec(con, "motion")
+    except duckdb.CatalogException:
+        motion_units = None
+    if motion_units is not None and not overwrite and motion_units != units:
+        raise ValueError("motion uses a different ts schema than its sources; rebuild it with --overwrite")
+    if not dry_run:
+        con.execute(f"""
+            CREATE TABLE IF NOT EXISTS motion (
+                ts {ts_type},
+                sample_order INTEGER,
+                subject_id BIGINT,
+                gyroscope_x {channel},
+                gyroscope_y {channel},
+                gyroscope_z {channel},
+                resultant_gyro {channel},
+                accel_x {channel},
+                accel_y {channel},
+                accel_z {channel},
+                resultant_accel {channel},
+                temperature_celsius {channel}
+            )
+        """)
+        con.execute(_MOTION_DAYS_DDL)
+    elif motion_units is None or overwrite:
+        # Nothing built yet, or about to be dropped: plan against empty bookkeeping.
+        con.execute(_MOTION_DAYS_DDL.replace("CREATE TABLE", "CREATE TEMP TABLE"))
+
+    subject_id = None
+    if subject_identifier is not None:
+        result = con.execute(
+            "SELECT subject_id FROM subjects WHERE subject_identifier = ?", (subject_identifier,)
+        ).fetchone()
+        if result is None:
+            console.print(f"[red]❌ Subject code '{subject_identifier}' not found in metadata DB[/red]")
+            return None
+        subject_id = result[0]
+
+    accel_tol = _ts_span(accel_tolerance_sec, units)
+    temperature_tol = _ts_span(temperature_tolerance_sec, units)
+    plan = plan_motion_days(con, units, accel_tol, temperature_tol, temperature, subject_id)
+    if dry_run:
+        for subj, day, gyro_rows, *_ in plan:
+            action = f"build {gyro_rows} motion rows" if gyro_rows is not None else "remove motion rows"
+            console.print(f"[cyan]🧪 Would {action}: subj={subj}, day={day}[/cyan]")
+        return [(subj, day) for subj, day, *_ in plan]
+
+    sql = f"INSERT INTO motion {motion_sql(units, temperature)}"
+    for subj, day, gyro_rows, accel_rows, temperature_rows, coverage_rows in track(plan, description="Aligning sensor days"):
+        lo, hi = _day_range(day, units)
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute("DELETE FROM motion WHERE subject_id = ? AND ts >= ? AND ts < ?", (subj, lo, hi))
+            con.execute("DELETE FROM _motion_days WHERE subject_id = ? AND day = ?", (subj, day))
+            if gyro_rows is not None:
+                con.execute(sql, {
+                    "subject_id": subj, "lo": lo, "hi": hi, "accel_tol": accel_tol, "temperature_tol": temperature_tol,
+                })
+                con.execute(
+                    "INSERT INTO _motion_days VALUES (?, ?, ?, ?, ?, ?)",
+                    (subj, day, gyro_rows, accel_rows, temperature_rows, coverage_rows),
+                )
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    if cluster:
+        con.execute("CREATE OR REPLACE TABLE motion AS SELECT * FROM motion ORDER BY subject_id, ts")
+        con.execute("CHECKPOINT")
+        console.print("[blue]🧹 Clustered motion by subject_id, ts[/blue]")
+    console.print(f"[green]✅ Motion table up to date: {len(plan)} subject-days built or removed[/green]")
+    return [(subj, day) for subj, day, *_ in plan]
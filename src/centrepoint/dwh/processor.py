@@ -1,15 +1,159 @@
 # centrepoint/dwh/processor.py
 
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from datetime import date
 from pathlib import Path
+from typing import Iterator
 import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
 import polars as pl
 import numpy as np
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, filtfilt, sosfilt, sosfilt_zi
 from rich.console import Console
 from rich.progress import track
+from centrepoint.dwh.creator import COMPACT_TS_PER_SEC, DEFAULT_MAX_GAP_SEC, TS_PER_SEC, output_types, ts_per_sec
+from centrepoint.dwh.catalog import attach_databases, database_alias, warehouse_files
+from centrepoint.dwh.lakehouse import BACKENDS, DEFAULT_LAKE_ROOT, register_lakehouse_views
 
 console = Console()
 
+GYRO_AXES = ["gyroscope_x", "gyroscope_y", "gyroscope_z"]
+DEFAULT_LOOKAHEAD_SEC = 1.0
+DEFAULT_BATCH_WINDOWS = 16
+DEFAULT_READ_BATCH_ROWS = 65_536
+ACCEL_DB = database_alias("raw-accelerometer")
+
+Window = tuple[int, int]
+Segment = tuple[int, list[Window]]
+Watermark = tuple[int, int, int]
+
+@lru_cache(maxsize=None)
+def lowpass_ba(cutoff: float = 35.0, fs: float = 128.0, order: int = 4) -> tuple[np.ndarray, np.ndarray]:
+    """Returns cached transfer-function coefficients of a low-pass Butterworth filter (do not modify them)."""
+    return butter(order, cutoff / (0.5 * fs), btype='low')
+
+@lru_cache(maxsize=None)
+def lowpass_sos(cutoff: float = 35.0, fs: float = 128.0, order: int = 4) -> np.ndarray:
+    """Returns cached second-order sections of a low-pass Butterworth filter.
+
+    Second-order sections stay numerically stable at higher orders and low cutoffs, where the
+    single (b, a) polynomial form loses precision. The cached array is shared; do not modify it.
+    """
+    return butter(order, cutoff / (0.5 * fs), btype='low', output='sos')
+
+class StreamingLowpassFilter:
+    """Low-pass filters a multi-channel signal delivered in consecutive blocks.
+
+    The forward IIR state is carried from block to block, so the output does not depend on
+    where the signal was split: there are no edge transients at block boundaries and every
+    input sample is emitted exactly once.
+
+    With ``zero_phase`` the forward output is also filtered backwards, as ``filtfilt`` does.
+    An exact backward pass needs the whole future, so the last ``lookahead`` samples are held
+    back until enough later samples have arrived; the truncation error decays with the filter's
+    impulse response and is negligible after about a second at 128 Hz. ``flush`` emits the rest.
+    """
+
+    def __init__(
+        self,
+        cutoff: float = 35.0,
+        fs: float = 128.0,
+        order: int = 4,
+        zero_phase: bool = True,
+        lookahead: int | None = None,
+    ):
+        """Initializes the filter.
+
+        Args:
+            cutoff (float): Cutoff frequency in Hz.
+            fs (float): Sampling rate in Hz.
+            order (int): Filter order.
+            zero_phase (bool): Apply a backward pass as well, cancelling the phase delay.
+            lookahead (int | None): Samples held back for the backward pass. Defaults to
+                ``DEFAULT_LOOKAHEAD_SEC`` worth of samples.
+        """
+        self.sos = lowpass_sos(cutoff, fs, order)
+        self.zero_phase = zero_phase
+        self.lookahead = int(fs * DEFAULT_LOOKAHEAD_SEC) if lookahead is None else lookahead
+        self._zi_unit = sosfilt_zi(self.sos)[:, :, np.newaxis]
+        self._zi: np.ndarray | None = None
+        self._pending: np.ndarray | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of samples received but not yet emitted."""
+        return 0 if self._pending is None else len(self._pending)
+
+    def _forward(self, block: np.ndarray) -> np.ndarray:
+        if self._zi is None:
+            # Start in steady state for the first sample, like filtfilt's edge handling.
+            self._zi = self._zi_unit * block[0]
+        out, self._zi = sosfilt(self.sos, block, axis=0, zi=self._zi)
+        return out
+
+    def _backward(self, forward: np.ndarray) -> np.ndarray:
+        reversed_ = forward[::-1]
+        out, _ = sosfilt(self.sos, reversed_, axis=0, zi=self._zi_unit * reversed_[0])
+        return out[::-1]
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filters the next block of samples.
+
+        Args:
+            block (np.ndarray): Samples of shape (n,) or (n, channels), continuing the previous block.
+
+        Returns:
+            np.ndarray: The next filtered samples, in order. In causal mode this has the same length
+            as ``block``; in zero-phase mode it lags the input by up to ``lookahead`` samples.
+        """
+        block = np.asarray(block, dtype=np.float64)
+        squeeze = block.ndim == 1
+        if squeeze:
+            block = block[:, np.newaxis]
+        if len(block) == 0:
+            return np.empty((0,) if squeeze else (0, block.shape[1]))
+
+        forward = self._forward(block)
+        if not self.zero_phase:
+            return forward[:, 0] if squeeze else forward
+
+        self._pending = forward if self._pending is None else np.concatenate([self._pending, forward])
+        ready = len(self._pending) - self.lookahead
+        if ready <= 0:
+            out = np.empty((0, block.shape[1]))
+        else:
+            out = self._backward(self._pending)[:ready]
+            self._pending = self._pending[ready:]
+        return out[:, 0] if squeeze else out
+
+    def flush(self) -> np.ndarray:
+        """Emits every held-back sample, treating the end of the signal as reached.
+
+        Returns:
+            np.ndarray: Remaining filtered samples of shape (n, channels); empty in causal mode.
+        """
+        if self._pending is None or len(self._pending) == 0:
+            return np.empty((0, self._zi.shape[-1] if self._zi is not None else 0))
+        out = self._backward(self._pending)
+        self._pending = None
+        return out
+
+    def prime(self, block: np.ndarray):
+        """Runs samples preceding the region of interest through the filter and discards the output.
+
+        Used to warm up the forward state when resuming part-way through a signal.
+
+        Args:
+            block (np.ndarray): Samples of shape (n,) or (n, channels) immediately preceding the next ``process`` call.
+        """
+        self.process(block)
+        self._pending = None
+
 def butter_lowpass_filter(data: np.ndarray, cutoff: float = 35.0, fs: float = 128.0, order: int = 4) -> np.ndarray:
     """Applies a low-pass Butterworth filter to the input signal.
 
@@ -22,7 +166,7 @@ def butter_lowpass_filter(data: np.ndarray, cutoff: float = 35.0, fs: float = 12
     Returns:
         np.ndarray: Filtered signal.
     """
-    b, a = butter(order, cutoff / (0.5 * fs), btype='low')
+    b, a = lowpass_ba(cutoff, fs, order)
     return filtfilt(b, a, data)
 
 def compute_resultant(df: pl.DataFrame, x: str, y: str, z: str, output_name: str) -> pl.Series:
@@ -40,161 +184,1021 @@ def compute_resultant(df: pl.DataFrame, x: str, y: str, z: str, output_name: str
     """
     return pl.Series(output_name, np.sqrt(df[x].to_numpy()**2 + df[y].to_numpy()**2 + df[z].to_numpy()**2))
 
+_SOURCES_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        subject_id BIGINT,
+        day DATE,
+        source TEXT
+    )
+"""
+
+# A ``_subject_coverage`` row: ``(subject_id, day, source, ts_min, ts_max)``.
+Source = tuple[int, date, str | None, float, float]
+
+def _ensure_sources(con: duckdb.DuckDBPyConnection, table: str, coverage: str, sensor: str):
+    """Creates a log of the catalogued sources an output has taken in, if missing.
+
+    A log created for a database processed before logs existed starts out with every source
+    currently in the catalog, as earlier runs took in everything imported up to then.
+    """
+    database, _, name = table.rpartition(".")
+    exists = con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE database_name = COALESCE(NULLIF(?, ''), current_database()) AND table_name = ?",
+        (database, name),
+    ).fetchone()[0]
+    con.execute(_SOURCES_DDL.format(table=table))
+    if not exists:
+        try:
+            con.execute(f"INSERT INTO {table} SELECT subject_id, day, source FROM {coverage} WHERE sensor = ?", (sensor,))
+        except duckdb.CatalogException:
+            pass
+
+def _new_sources(
+    con: duckdb.DuckDBPyConnection, table: str, coverage: str, sensor: str, subject_ids: list[int]
+) -> list[Source]:
+    """Lists the catalogued sources of a sensor that are missing from an output's log.
+
+    Both tables hold a row per subject, day and imported file, so this costs the size of the
+    catalog, not of the data. Returns nothing without a catalog or a log (e.g. on a dry run).
+    """
+    try:
+        return con.execute(f"""
+            SELECT subject_id, day, source, ts_min, ts_max FROM {coverage} c
+            WHERE sensor = ? AND subject_id IN (SELECT unnest(?::BIGINT[]))
+            AND NOT EXISTS (
+                SELECT 1 FROM {table} p
+                WHERE p.subject_id = c.subject_id AND p.day = c.day AND p.source IS NOT DISTINCT FROM c.source
+            )
+            ORDER BY subject_id, ts_min
+        """, (sensor, subject_ids)).fetchall()
+    except duckdb.CatalogException:
+        return []
+
+def _record_sources(con: duckdb.DuckDBPyConnection, table: str, sources: list[Source]):
+    """Adds sources to an output's log once their rows have been taken in."""
+    if sources:
+        con.executemany(f"INSERT INTO {table} VALUES (?, ?, ?)", [source[:3] for source in sources])
+
+def _pending_accel_sql(accel_con: duckdb.DuckDBPyConnection, subject_id: int, late: list[tuple[float, float]]) -> tuple[str, dict]:
+    """Builds the query over a subject's raw accelerometer rows that have no resultant yet.
+
+    That is every row after the subject's latest resultant, plus, within the ``ts`` ranges of
+    files imported late, the rows at or before it that have none. The anti-join on ``ts`` only
+    reads those ranges, so it costs the late data rather than the subject's whole history.
+
+    Returns:
+        tuple[str, dict]: The query and its parameters.
+    """
+    latest = accel_con.execute(
+        "SELECT MAX(ts) FROM accel_resultant WHERE subject_id = ?", (subject_id,)
+    ).fetchone()[0]
+    params = {"subject_id": subject_id}
+    if latest is None:
+        return "SELECT * FROM raw_accelerometer WHERE subject_id = $subject_id", params
+
+    params["latest"] = latest
+    parts = ["SELECT * FROM raw_accelerometer WHERE subject_id = $subject_id AND ts > $latest"]
+    for i, (lo, hi) in enumerate(r for r in late if r[0] <= latest):
+        params[f"lo{i}"], params[f"hi{i}"] = lo, min(hi, latest)
+        parts.append(f"""
+            SELECT * FROM raw_accelerometer r
+            WHERE r.subject_id = $subject_id AND r.ts >= $lo{i} AND r.ts <= $hi{i}
+            AND NOT EXISTS (
+                SELECT 1 FROM accel_resultant a
+                WHERE a.subject_id = $subject_id AND a.ts >= $lo{i} AND a.ts <= $hi{i} AND a.ts = r.ts
+            )
+        """)
+    if len(parts) > 1:
+        console.print(f"[cyan]🩹 Adding accelerometer data imported after later data was processed: subj={subject_id}[/cyan]")
+    return " UNION ALL ".join(parts), params
+
+def insert_accel_resultants(
+    accel_con: duckdb.DuckDBPyConnection, subject_id: int, late: list[tuple[float, float]] = ()
+) -> int:
+    """Computes accelerometer resultants for one subject in a single set-based statement.
+
+    The resultant needs no filtering, so it is computed entirely inside DuckDB rather than
+    round-tripping each chunk through Polars. Only rows newer than the subject's latest
+    ``accel_resultant`` row are inserted, which makes re-runs after new imports incremental,
+    plus rows still missing within the ``late`` ranges (see ``_pending_accel_sql``).
+
+    Args:
+        accel_con (duckdb.DuckDBPyConnection): Connection with ``raw_accelerometer`` and ``accel_resultant``.
+        subject_id (int): Subject to process.
+        late (list[tuple[float, float]], optional): ``(ts_min, ts_max)`` of the subject's files
+            imported since the last run, from the coverage catalog. Defaults to none.
+
+    Returns:
+        int: Rows inserted.
+    """
+    pending, params = _pending_accel_sql(accel_con, subject_id, late)
+    result = accel_con.execute(f"""
+        INSERT INTO accel_resultant (ts, sample_order, subject_id, x, y, z, resultant_accel)
+        SELECT ts, sample_order, subject_id, x, y, z, sqrt(x * x + y * y + z * z)
+        FROM ({pending})
+        ORDER BY ts
+    """, params).fetchone()
+    return result[0] if result else 0
+
+def count_pending_accel_resultants(
+    accel_con: duckdb.DuckDBPyConnection, subject_id: int, late: list[tuple[float, float]] = ()
+) -> int:
+    """Counts the rows ``insert_accel_resultants`` would insert for a subject."""
+    pending, params = _pending_accel_sql(accel_con, subject_id, late)
+    result = accel_con.execute(f"SELECT COUNT(*) FROM ({pending})", params).fetchone()
+    return result[0] if result else 0
+
+def _late_ranges(sources: list[Source]) -> dict[int, list[tuple[float, float]]]:
+    """Groups new sources' ``ts`` ranges by subject."""
+    ranges = {}
+    for subject_id, _, _, ts_min, ts_max in sources:
+        ranges.setdefault(subject_id, []).append((ts_min, ts_max))
+    return ranges
+
+_PROCESSED_CHUNKS_DDL = """
+    CREATE TABLE IF NOT EXISTS _processed_chunks (
+        subject_id BIGINT,
+        ts_start BIGINT,
+        ts_end BIGINT,
+        PRIMARY KEY(subject_id, ts_start, ts_end)
+    )
+"""
+
+_WATERMARKS_DDL = """
+    CREATE TABLE IF NOT EXISTS _subject_watermarks (
+        subject_id BIGINT PRIMARY KEY,
+        ts_end BIGINT,
+        segment_start BIGINT,
+        tail_start BIGINT
+    )
+"""
+
+def load_watermark(imu_con: duckdb.DuckDBPyConnection, subject_id: int) -> Watermark | None:
+    """Reads how far a subject's gyroscope data has been filtered.
+
+    Args:
+        imu_con (duckdb.DuckDBPyConnection): Connection with ``_subject_watermarks``.
+        subject_id (int): Subject to look up.
+
+    Returns:
+        Watermark | None: ``(ts_end, segment_start, tail_start)``: all samples before ``ts_end`` are
+        in ``filtered_imu``, the segment holding them started at ``segment_start``, and output from
+        ``tail_start`` on came from the zero-phase filter's end-of-signal flush, so it has to be
+        redone if later data continues the segment. None if the subject has no watermark yet
+        (or the database predates watermarks).
+    """
+    try:
+        row = imu_con.execute(
+            "SELECT ts_end, segment_start, tail_start FROM _subject_watermarks WHERE subject_id = ?", (subject_id,)
+        ).fetchone()
+    except duckdb.CatalogException:
+        return None
+    return (row[0], row[1], row[2]) if row else None
+
+def plan_subject_segments(
+    imu_con: duckdb.DuckDBPyConnection,
+    subject_id: int,
+    chunk_size: int,
+    max_gap: float,
+    watermark: Watermark | None = None,
+) -> list[Segment]:
+    """Plans a subject's windows over the stretches of time that actually hold data.
+
+    One aggregate query splits the subject's samples into contiguous segments wherever
+    consecutive ``ts`` values are more than ``max_gap`` apart (device off the wrist, charging).
+    Each segment is cut into half-open windows of ``chunk_size``, the last one ending just past
+    the segment's final sample, so empty spans cost no queries and windows never straddle a gap.
+
+    With a ``watermark`` only the samples from the last processed one onwards are scanned. New
+    data that continues the watermark's segment is planned from the segment's provisional tail,
+    keeping the segment's start so the filter is primed instead of restarted; new segments
+    after a gap are planned in full.
+
+    Args:
+        imu_con (duckdb.DuckDBPyConnection): Connection with the ``imu`` table.
+        subject_id (int): Subject to plan.
+        chunk_size (int): Window length in ``ts`` units.
+        max_gap (float): Largest step between consecutive samples still treated as continuous, in ``ts`` units.
+        watermark (Watermark | None): The subject's watermark from ``load_watermark``, if any.
+
+    Returns:
+        list[Segment]: The segments in time order as ``(segment_start, windows)``.
+    """
+    since = float("-inf")
+    if watermark is not None:
+        last = imu_con.execute(
+            "SELECT MAX(ts) FROM imu WHERE subject_id = ? AND ts < ?", (subject_id, watermark[0])
+        ).fetchone()
+        since = last[0] if last and last[0] is not None else watermark[0]
+
+    bounds = imu_con.execute("""
+        WITH steps AS (
+            SELECT ts, ts - LAG(ts) OVER (ORDER BY ts) AS step FROM imu WHERE subject_id = ? AND ts >= ?
+        ), numbered AS (
+            SELECT ts, SUM(CASE WHEN step IS NULL OR step > ? THEN 1 ELSE 0 END) OVER (ORDER BY ts ROWS UNBOUNDED PRECEDING) AS segment
+            FROM steps
+        )
+        SELECT MIN(ts), MAX(ts) FROM numbered GROUP BY segment ORDER BY 1
+    """, (subject_id, since, max_gap)).fetchall()
+
+    segments = []
+    for ts_min, ts_max in bounds:
+        seg_start, seg_end = int(ts_min), int(ts_max) + 1
+        first = seg_start
+        if watermark is not None and ts_min < watermark[0]:
+            # The segment the watermark lies in: redo its tail if new samples extend it.
+            ts_end, seg_start, first = watermark
+            if ts_max < ts_end:
+                continue
+        windows = [(start, min(start + chunk_size, seg_end)) for start in range(first, seg_end, chunk_size)]
+        if windows:
+            segments.append((seg_start, windows))
+    return segments
+
+def load_coverage(con: duckdb.DuckDBPyConnection, sensor: str) -> dict[int, float] | None:
+    """Reads each subject's latest ``ts`` from the coverage catalog kept by the builders.
+
+    One aggregate over ``_subject_coverage`` (a row per subject, day and imported file) replaces
+    a ``DISTINCT subject_id`` and per-subject ``MAX(ts)`` scan of the sensor table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection to the sensor database (or lakehouse views).
+        sensor (str): Sensor key in the catalog, e.g. 'imu'.
+
+    Returns:
+        dict[int, float] | None: Latest ``ts`` per subject, or None if there is no catalog for the
+        sensor (databases not touched by a builder since the catalog was added, or tables filled
+        by other means); callers then scan the sensor table instead.
+    """
+    try:
+        rows = con.execute("""
+            SELECT subject_id, MAX(ts_max) FROM _subject_coverage
+            WHERE sensor = ? AND subject_id IS NOT NULL GROUP BY subject_id ORDER BY subject_id
+        """, (sensor,)).fetchall()
+    except duckdb.CatalogException:
+        return None
+    return {subject_id: ts_max for subject_id, ts_max in rows} if rows else None
+
+def _up_to_date_subjects(imu_con: duckdb.DuckDBPyConnection, coverage: dict[int, float] | None) -> set[int]:
+    """Returns the subjects whose newest catalogued sample is already behind their watermark."""
+    if coverage is None:
+        return set()
+    try:
+        watermarks = imu_con.execute("SELECT subject_id, ts_end FROM _subject_watermarks").fetchall()
+    except duckdb.CatalogException:
+        return set()
+    return {subject_id for subject_id, ts_end in watermarks if subject_id in coverage and coverage[subject_id] < ts_end}
+
+def _backfilled_sources(imu_con: duckdb.DuckDBPyConnection, sources: list[Source]) -> list[Source]:
+    """Picks the new gyroscope sources that start before their subject's watermark.
+
+    Everything before a watermark's ``ts_end`` has been filtered already, so a file catalogued
+    since the last run with samples there was imported late into that time. Runs without
+    ``overwrite`` only extend past the watermark and would never pick those rows up.
+    """
+    try:
+        watermarks = dict(imu_con.execute("SELECT subject_id, ts_end FROM _subject_watermarks").fetchall())
+    except duckdb.CatalogException:
+        return []
+    return [source for source in sources if source[0] in watermarks and source[3] < watermarks[source[0]]]
+
+def _load_done_windows(imu_con: duckdb.DuckDBPyConnection, subject_id: int) -> set[Window]:
+    return set(imu_con.execute(
+        "SELECT ts_start, ts_end FROM _processed_chunks WHERE subject_id = ?", (subject_id,)
+    ).fetchall())
+
+def _remaining_segments(
+    imu_con: duckdb.DuckDBPyConnection, subject_id: int, chunk_size: int, max_gap: float
+) -> list[Segment]:
+    """Plans what is left to filter for a subject: past its watermark, or after its first unrecorded window."""
+    watermark = load_watermark(imu_con, subject_id)
+    segments = plan_subject_segments(imu_con, subject_id, chunk_size, max_gap, watermark)
+    if watermark is None:
+        segments = _segments_to_resume(segments, _load_done_windows(imu_con, subject_id))
+    return segments
+
+class FilterStats:
+    """Counts the reads, allocations and copies made on the gyroscope filter path."""
+
+    def __init__(self):
+        self.windows = 0
+        self.batches = 0
+        self.rows = 0
+        self.buffer_allocations = 0
+        self.copied_rows = 0
+
+    def add(self, other: "FilterStats"):
+        """Adds another run's counts to these."""
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def __str__(self) -> str:
+        copies = self.copied_rows / self.rows if self.rows else 0.0
+        return (
+            f"{self.windows} windows, {self.batches} Arrow batches, {self.rows} rows; "
+            f"{self.buffer_allocations} buffer allocations, {copies:.2f} copies per row"
+        )
+
+FILTERED_IMU_SCHEMA = pa.schema([
+    ("ts", pa.float64()),
+    ("sample_order", pa.int32()),
+    ("subject_id", pa.int64()),
+    *[(axis, pa.float64()) for axis in GYRO_AXES],
+    ("resultant_gyro", pa.float64()),
+])
+
+_WINDOW_SQL = f"""
+    SELECT ts, sample_order::INTEGER AS sample_order, {", ".join(f"{axis}::DOUBLE AS {axis}" for axis in GYRO_AXES)}
+    FROM imu WHERE subject_id = ? AND ts >= ? AND ts < ? ORDER BY ts
+"""
+
+class _GyroBuffer:
+    """Preallocated storage for rows read from DuckDB that the filter has not emitted yet.
+
+    Columns are kept as separate contiguous arrays (the three axes as rows of one (3, n)
+    array), so each Arrow batch is copied in exactly once and emitted columns are plain
+    slices that Arrow wraps without copying. ``ts`` keeps the type it is stored with: DOUBLE
+    milliseconds, or BIGINT nanoseconds in the compact schema.
+    """
+
+    def __init__(self, capacity: int, stats: FilterStats, ts_type: pa.DataType = pa.float64()):
+        self.stats = stats
+        self.schema = FILTERED_IMU_SCHEMA.set(0, pa.field("ts", ts_type))
+        self.ts_dtype = ts_type.to_pandas_dtype()
+        self.head = 0  # first row not yet emitted
+        self.tail = 0  # one past the last row received
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        old = None if not hasattr(self, "ts") else (self.ts, self.sample_order, self.gyro)
+        self.ts = np.empty(capacity, dtype=self.ts_dtype)
+        self.sample_order = np.empty(capacity, dtype=np.int32)
+        self.gyro = np.empty((len(GYRO_AXES), capacity))
+        self.resultant = np.empty(capacity)
+        self.stats.buffer_allocations += 1
+        if old is not None:
+            pending = self.tail - self.head
+            self.ts[:pending], self.sample_order[:pending] = old[0][self.head:self.tail], old[1][self.head:self.tail]
+            self.gyro[:, :pending] = old[2][:, self.head:self.tail]
+            self.head, self.tail = 0, pending
+
+    @property
+    def next_ts(self) -> float | None:
+        """``ts`` of the oldest row not yet emitted."""
+        return self.ts[self.head] if self.head < self.tail else None
+
+    def append(self, batch: pa.RecordBatch) -> np.ndarray:
+        """Copies a batch in after the pending rows.
+
+        Args:
+            batch (pa.RecordBatch): Rows in ``_WINDOW_SQL`` column order.
+
+        Returns:
+            np.ndarray: The batch's gyroscope samples as an (n, 3) view into the buffer.
+        """
+        n = batch.num_rows
+        pending = self.tail - self.head
+        if self.tail + n > len(self.ts):
+            if pending + n > len(self.ts):
+                self._allocate(max(2 * len(self.ts), pending + n))
+            else:
+                # Move the held-back rows to the front; at most ``lookahead`` of them.
+                self.ts[:pending] = self.ts[self.head:self.tail]
+                self.sample_order[:pending] = self.sample_order[self.head:self.tail]
+                self.gyro[:, :pending] = self.gyro[:, self.head:self.tail]
+                self.head, self.tail = 0, pending
+        rows = slice(self.tail, self.tail + n)
+        self.ts[rows] = batch.column(0).to_numpy(zero_copy_only=False)
+        self.sample_order[rows] = batch.column(1).to_numpy(zero_copy_only=False)
+        for i in range(len(GYRO_AXES)):
+            self.gyro[i, rows] = batch.column(2 + i).to_numpy(zero_copy_only=False)
+        self.tail += n
+        self.stats.copied_rows += n
+        return self.gyro[:, rows].T
+
+    def emit(self, filtered: np.ndarray, subject_id: int) -> pa.RecordBatch:
+        """Writes filtered samples over the oldest pending rows and returns them as Arrow.
+
+        The resultant is computed in place, and the returned batch shares the buffer's memory:
+        it is only valid until the next ``append``.
+        """
+        k = len(filtered)
+        if k == 0:
+            return pa.RecordBatch.from_pylist([], schema=self.schema)
+        rows = slice(self.head, self.head + k)
+        gyro = self.gyro[:, rows]
+        gyro[...] = filtered.T
+        resultant = self.resultant[rows]
+        np.einsum("ij,ij->j", gyro, gyro, out=resultant)
+        np.sqrt(resultant, out=resultant)
+        self.head += k
+        return pa.RecordBatch.from_arrays([
+            pa.array(self.ts[rows]),
+            pa.array(self.sample_order[rows]),
+            pa.array(np.full(k, subject_id, dtype=np.int64)),
+            *[pa.array(axis) for axis in gyro],
+            pa.array(resultant),
+        ], schema=self.schema)
+
+def filter_subject_segments(
+    imu_con: duckdb.DuckDBPyConnection,
+    subject_id: int,
+    segments: list[Segment],
+    fs: float = 128.0,
+    lookahead: int | None = None,
+    batch_rows: int = DEFAULT_READ_BATCH_ROWS,
+    stats: FilterStats | None = None,
+) -> Iterator[tuple[pa.RecordBatch, list[Window]]]:
+    """Streams a subject's gyroscope rows through a ``StreamingLowpassFilter`` per segment.
+
+    Filter state carries across the windows of a segment and restarts at every gap. When a
+    segment's first window to process is not its first window (a resumed run), the filter is
+    primed with the samples preceding it in that segment, so the output matches an
+    uninterrupted run. Only reads from ``imu_con``, which may be read-only.
+
+    Each window is fetched as Arrow record batches of up to ``batch_rows`` rows, copied once
+    into a preallocated buffer, and filtered and turned into resultants in place there. A
+    window's batches are all fetched before any output is yielded, because a DuckDB result
+    stream stops when its connection runs another statement (such as the caller's insert).
+
+    Args:
+        imu_con (duckdb.DuckDBPyConnection): Connection with the ``imu`` table.
+        subject_id (int): Subject to filter.
+        segments (list[Segment]): ``(segment_start, windows)`` pairs from ``plan_subject_segments``.
+        fs (float): Sampling frequency (Hz).
+        lookahead (int | None): Samples of context the filter looks ahead across window edges
+            (see ``StreamingLowpassFilter``).
+        batch_rows (int): Rows per Arrow batch read from DuckDB.
+        stats (FilterStats | None): Counters to update.
+
+    Yields:
+        tuple[pa.RecordBatch, list[Window]]: Filtered rows with ``FILTERED_IMU_SCHEMA`` (``ts`` typed
+        as in ``imu``), valid only until the generator is resumed, and the windows whose rows have
+        now all been yielded.
+    """
+    stats = FilterStats() if stats is None else stats
+    ts_type = pa.int64() if ts_per_sec(imu_con, "imu") == COMPACT_TS_PER_SEC else pa.float64()
+    for seg_start, windows in segments:
+        engine = StreamingLowpassFilter(fs=fs, lookahead=lookahead)
+        if windows[0][0] > seg_start:
+            history = imu_con.execute(f"""
+                SELECT {", ".join(GYRO_AXES)} FROM imu
+                WHERE subject_id = ? AND ts >= ? AND ts < ? ORDER BY ts DESC LIMIT ?
+            """, (subject_id, seg_start, windows[0][0], engine.lookahead)).fetchnumpy()
+            if len(history[GYRO_AXES[0]]):
+                engine.prime(np.column_stack([history[axis][::-1] for axis in GYRO_AXES]))
+
+        buffer = _GyroBuffer(engine.lookahead + batch_rows, stats, ts_type)
+        unrecorded: list[Window] = []
+
+        def completed_windows() -> list[Window]:
+            nonlocal unrecorded
+            next_ts = buffer.next_ts
+            complete = [w for w in unrecorded if next_ts is None or w[1] <= next_ts]
+            unrecorded = unrecorded[len(complete):]
+            return complete
+
+        for start, end in windows:
+            batches = list(imu_con.execute(_WINDOW_SQL, (subject_id, start, end)).to_arrow_reader(batch_rows))
+            stats.windows += 1
+            unrecorded.append((start, end))
+            if not any(batch.num_rows for batch in batches):
+                yield buffer.emit(np.empty((0, 3)), subject_id), completed_windows()
+            for batch in batches:
+                if batch.num_rows == 0:
+                    continue
+                stats.batches += 1
+                stats.rows += batch.num_rows
+                block = buffer.append(batch)
+                yield buffer.emit(engine.process(block), subject_id), completed_windows()
+
+        yield buffer.emit(engine.flush(), subject_id), completed_windows()
+
+def _insert_filtered_rows(imu_con: duckdb.DuckDBPyConnection, rows: pa.RecordBatch):
+    if rows.num_rows == 0:
+        return
+    imu_con.register("filtered_batch", rows)
+    imu_con.execute(f"""
+        INSERT INTO filtered_imu ({", ".join(FILTERED_IMU_SCHEMA.names)})
+        SELECT {", ".join(FILTERED_IMU_SCHEMA.names)} FROM filtered_batch
+    """)
+    imu_con.unregister("filtered_batch")
+
+def _record_windows(imu_con: duckdb.DuckDBPyConnection, subject_id: int, windows: list[Window]):
+    if not windows:
+        return
+    imu_con.execute("""
+        INSERT OR IGNORE INTO _processed_chunks (subject_id, ts_start, ts_end)
+        SELECT ?, unnest(?::BIGINT[]), unnest(?::BIGINT[])
+    """, (subject_id, [start for start, _ in windows], [end for _, end in windows]))
+
+def _advance_watermark(imu_con: duckdb.DuckDBPyConnection, subject_id: int, watermark: Watermark | None):
+    if watermark is None:
+        return
+    imu_con.execute(
+        "INSERT OR REPLACE INTO _subject_watermarks (subject_id, ts_end, segment_start, tail_start) VALUES (?, ?, ?, ?)",
+        (subject_id, *watermark),
+    )
+
+def _begin_batch(imu_con: duckdb.DuckDBPyConnection, subject_id: int, replace_from: float | None):
+    """Opens the transaction for a batch of windows, first deleting output from ``replace_from`` on if given."""
+    imu_con.execute("BEGIN TRANSACTION")
+    if replace_from is not None:
+        imu_con.execute("DELETE FROM filtered_imu WHERE subject_id = ? AND ts >= ?", (subject_id, replace_from))
+
+def _finish_batch(
+    imu_con: duckdb.DuckDBPyConnection, subject_id: int, windows: list[Window], watermark: Watermark | None
+):
+    """Records the batch's completed windows and the new watermark, and commits it with its output."""
+    _record_windows(imu_con, subject_id, windows)
+    _advance_watermark(imu_con, subject_id, watermark)
+    imu_con.execute("COMMIT")
+
+def _watermark_after(todo: list[Segment], completed: list[Window], tail_start: int | None = None) -> Watermark | None:
+    """Returns the watermark reached once ``completed`` (windows of ``todo``) are written.
+
+    ``tail_start`` is where the final flush's output starts, given once it is in the batch
+    (None if the flush emitted nothing); before that, everything written is final output.
+    """
+    if not completed:
+        return None
+    last = completed[-1]
+    seg_start = next(seg_start for seg_start, windows in todo if last in windows)
+    return last[1], seg_start, last[1] if tail_start is None else tail_start
+
+def _first_ts(rows: pa.RecordBatch) -> int | None:
+    return int(rows.column(0)[0].as_py()) if rows.num_rows else None
+
+def stream_filtered_imu(
+    imu_con: duckdb.DuckDBPyConnection,
+    subject_id: int,
+    chunk_size: int,
+    fs: float = 128.0,
+    dry_run: bool = False,
+    lookahead: int | None = None,
+    max_gap: float = DEFAULT_MAX_GAP_SEC * TS_PER_SEC,
+    batch_windows: int = DEFAULT_BATCH_WINDOWS,
+    stats: FilterStats | None = None,
+) -> int:
+    """Filters one subject's gyroscope signal as a single stream and appends it to ``filtered_imu``.
+
+    The subject's recorded segments are split into half-open windows of ``chunk_size``
+    (see ``plan_subject_segments``) which are read in order and fed through a
+    ``StreamingLowpassFilter``, so filter state carries across windows, restarts at gaps, and
+    each sample is written exactly once. Output goes back to DuckDB as Arrow batches as soon as
+    it is filtered; every ``batch_windows`` completed windows are committed in one transaction
+    together with their output, their ``_processed_chunks`` rows and the subject's watermark
+    in ``_subject_watermarks``, so bookkeeping never disagrees with ``filtered_imu``.
+
+    A re-run only reads samples from the watermark on (see ``plan_subject_segments``), so
+    incremental runs cost time in proportion to the newly ingested data. Output from the
+    resume point on (written before an interruption, or the provisional tail) is deleted,
+    and the filter is primed with the preceding samples of the watermark's segment. Subjects
+    without a watermark (databases processed before watermarks existed) resume at their
+    first unrecorded window.
+
+    Args:
+        imu_con (duckdb.DuckDBPyConnection): Connection with ``imu``, ``filtered_imu`` and ``_processed_chunks``.
+        subject_id (int): Subject to process.
+        chunk_size (int): Window length in ``ts`` units.
+        fs (float): Sampling frequency (Hz).
+        dry_run (bool): If True, only report the windows that would be processed.
+        lookahead (int | None): Samples of context the filter looks ahead across window edges.
+        max_gap (float): Largest step between samples not treated as a gap, in ``ts`` units.
+        batch_windows (int): Completed windows per transaction.
+        stats (FilterStats | None): Counters to update with the reads and copies made.
+
+    Returns:
+        int: Rows written to ``filtered_imu``.
+    """
+    if dry_run:
+        watermark = load_watermark(imu_con, subject_id)
+        segments = plan_subject_segments(imu_con, subject_id, chunk_size, max_gap, watermark)
+        if watermark is not None:
+            console.print(f"[yellow]⏭️  Skipping already-processed data: subj={subject_id}, before {watermark[0]}[/yellow]")
+        done = _load_done_windows(imu_con, subject_id) if watermark is None else set()
+        for window in (window for _, windows in segments for window in windows):
+            if window in done:
+                console.print(f"[yellow]⏭️  Skipping already-processed chunk: subj={subject_id}, {window[0]} → {window[1]}[/yellow]")
+            else:
+                console.print(f"[cyan]🧪 Would process chunk: subj={subject_id}, {window[0]} → {window[1]}[/cyan]")
+        return 0
+
+    todo = _remaining_segments(imu_con, subject_id, chunk_size, max_gap)
+    if not todo:
+        return 0
+
+    replace_from: float | None = todo[0][1][0][0]
+    batch_done: list[Window] = []
+    in_transaction = False
+    written = 0
+    try:
+        for rows, completed in filter_subject_segments(
+            imu_con, subject_id, todo, fs=fs, lookahead=lookahead, stats=stats
+        ):
+            if len(batch_done) >= batch_windows:
+                # More output follows, so this batch ends before the final flush.
+                _finish_batch(imu_con, subject_id, batch_done, _watermark_after(todo, batch_done))
+                batch_done, in_transaction = [], False
+            if not in_transaction:
+                _begin_batch(imu_con, subject_id, replace_from)
+                in_transaction, replace_from = True, None
+            _insert_filtered_rows(imu_con, rows)
+            written += rows.num_rows
+            batch_done.extend(completed)
+            # The last output is the final flush; where it starts is the provisional tail.
+            tail_start = _first_ts(rows)
+        if in_transaction:
+            _finish_batch(imu_con, subject_id, batch_done, _watermark_after(todo, batch_done, tail_start))
+            in_transaction = False
+    except BaseException:
+        if in_transaction:
+            imu_con.execute("ROLLBACK")
+        raise
+    return written
+
+def _segments_to_resume(segments: list[Segment], done: set[Window]) -> list[Segment]:
+    """Returns the segments from the first unprocessed window on, the first one trimmed to start there."""
+    for i, (seg_start, windows) in enumerate(segments):
+        first_todo = next((j for j, window in enumerate(windows) if window not in done), None)
+        if first_todo is not None:
+            return [(seg_start, windows[first_todo:])] + segments[i + 1:]
+    return []
+
+def filter_subject_to_parquet(
+    imu_db_path: str,
+    subject_id: int,
+    chunk_size: int,
+    fs: float,
+    staging_dir: str,
+    backend: str = "duckdb",
+    lake_root: str = str(DEFAULT_LAKE_ROOT),
+    lookahead: int | None = None,
+    max_gap: float = DEFAULT_MAX_GAP_SEC * TS_PER_SEC,
+) -> tuple[tuple[int, int | None, str | None, list[Window], Watermark | None], FilterStats]:
+    """Worker for ``process_all_resultants(workers=N)``: filters one subject into a staged Parquet file.
+
+    Reads through a read-only connection, so any number of workers can run next to each other;
+    the single writer in the parent merges the result with ``merge_staged_subject``.
+
+    Args:
+        imu_db_path (str): Path to IMU DuckDB (only read).
+        subject_id (int): Subject to filter.
+        chunk_size (int): Window length in ``ts`` units.
+        fs (float): Sampling frequency (Hz).
+        staging_dir (str): Directory for the staged Parquet file.
+        backend (str): "duckdb" or "lakehouse", as in ``process_all_resultants``.
+        lake_root (str): Root of the lakehouse tree for the lakehouse backend.
+        lookahead (int | None): Samples of context the filter looks ahead across window edges.
+        max_gap (float): Largest step between samples not treated as a gap, in ``ts`` units.
+
+    Returns:
+        tuple[tuple[int, int | None, str | None, list[Window], Watermark | None], FilterStats]: The
+        arguments for ``merge_staged_subject`` (the subject, the ``ts`` its output resumes at or None
+        if nothing to do, the staged file or None if no rows, the completed windows, and the new
+        watermark), and the worker's filter counters.
+    """
+    con = duckdb.connect(imu_db_path, read_only=True)
+    try:
+        if backend == "lakehouse":
+            register_lakehouse_views(con, Path(lake_root), temporary=True)
+        stats = FilterStats()
+        todo = _remaining_segments(con, subject_id, chunk_size, max_gap)
+        if not todo:
+            return (subject_id, None, None, [], None), stats
+
+        staged = Path(staging_dir) / f"filtered_imu_{subject_id}.parquet"
+        completed: list[Window] = []
+        tail_start = None
+        writer = None
+        try:
+            for rows, windows_done in filter_subject_segments(
+                con, subject_id, todo, fs=fs, lookahead=lookahead, stats=stats
+            ):
+                completed.extend(windows_done)
+                tail_start = _first_ts(rows)
+                if rows.num_rows == 0:
+                    continue
+                if writer is None:
+                    writer = pq.ParquetWriter(staged, rows.schema)
+                writer.write_batch(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+        staged_path = str(staged) if writer is not None else None
+        watermark = _watermark_after(todo, completed, tail_start)
+        return (subject_id, todo[0][1][0][0], staged_path, completed, watermark), stats
+    finally:
+        con.close()
+
+def merge_staged_subject(
+    imu_con: duckdb.DuckDBPyConnection,
+    subject_id: int,
+    resume_ts: int | None,
+    staged: str | None,
+    completed: list[Window],
+    watermark: Watermark | None = None,
+) -> int:
+    """Bulk-loads one worker's staged output and its bookkeeping in a single transaction.
+
+    Args:
+        imu_con (duckdb.DuckDBPyConnection): Read-write connection to the IMU database.
+        subject_id (int): Subject the output belongs to.
+        resume_ts (int | None): Output at or after this ``ts`` is replaced; None means nothing to merge.
+        staged (str | None): Parquet file from ``filter_subject_to_parquet``.
+        completed (list[Window]): Windows to record in ``_processed_chunks``.
+        watermark (Watermark | None): The subject's new watermark.
+
+    Returns:
+        int: Rows inserted into ``filtered_imu``.
+    """
+    if resume_ts is None:
+        return 0
+    inserted = 0
+    imu_con.execute("BEGIN TRANSACTION")
+    try:
+        imu_con.execute("DELETE FROM filtered_imu WHERE subject_id = ? AND ts >= ?", (subject_id, resume_ts))
+        if staged is not None:
+            result = imu_con.execute("""
+                INSERT INTO filtered_imu (ts, sample_order, subject_id, gyroscope_x, gyroscope_y, gyroscope_z, resultant_gyro)
+                SELECT ts, sample_order, subject_id, gyroscope_x, gyroscope_y, gyroscope_z, resultant_gyro
+                FROM read_parquet(?)
+            """, (staged,)).fetchone()
+            inserted = result[0] if result else 0
+        _record_windows(imu_con, subject_id, completed)
+        _advance_watermark(imu_con, subject_id, watermark)
+        imu_con.execute("COMMIT")
+    except BaseException:
+        imu_con.execute("ROLLBACK")
+        raise
+    if staged is not None:
+        Path(staged).unlink(missing_ok=True)
+    return inserted
+
+def _process_subjects_parallel(
+    imu_db_path: str,
+    accel_con: duckdb.DuckDBPyConnection,
+    subject_ids: list[int],
+    chunk_size: int,
+    fs: float,
+    backend: str,
+    lake_root: str,
+    workers: int,
+    lookahead: int | None = None,
+    max_gap: float = DEFAULT_MAX_GAP_SEC * TS_PER_SEC,
+    stats: FilterStats | None = None,
+    up_to_date: set[int] = frozenset(),
+    late_accel: dict[int, list[tuple[float, float]]] | None = None,
+):
+    """Fans subjects out to a process pool and merges their staged output through one writer.
+
+    The IMU database must not be open read-write in this process while the pool runs, since
+    DuckDB only lets other processes attach it read-only when no writer holds it. Accelerometer
+    resultants go to their own database, so they are computed here while the workers filter.
+    Subjects in ``up_to_date`` only get their accelerometer resultants; ``late_accel`` holds
+    each subject's late-imported accelerometer ranges (see ``insert_accel_resultants``).
+    """
+    staging_dir = tempfile.mkdtemp(prefix="_staging_", dir=Path(imu_db_path).parent)
+    try:
+        results = []
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [
+                pool.submit(
+                    filter_subject_to_parquet,
+                    imu_db_path, subject_id, chunk_size, fs, staging_dir, backend, lake_root, lookahead, max_gap,
+                )
+                for subject_id in subject_ids
+                if subject_id not in up_to_date
+            ]
+            for subject_id in subject_ids:
+                insert_accel_resultants(accel_con, subject_id, (late_accel or {}).get(subject_id, ()))
+            for future in track(as_completed(futures), total=len(futures), description="Processing participants"):
+                result, worker_stats = future.result()
+                results.append(result)
+                if stats is not None:
+                    stats.add(worker_stats)
+
+        imu_con = duckdb.connect(imu_db_path)
+        try:
+            for result in sorted(results, key=lambda r: r[0]):
+                merge_staged_subject(imu_con, *result)
+        finally:
+            imu_con.close()
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
 def process_all_resultants(
     imu_db_path: str,
     accel_db_path: str,
     overwrite: bool = False,
-    chunk_sec: int = 600,
-    overlap_sec: int = 1,
+    chunk_sec: float = 600,
+    overlap_sec: float = DEFAULT_LOOKAHEAD_SEC,
+    max_gap_sec: float = DEFAULT_MAX_GAP_SEC,
     fs: float = 128.0,
     subject_identifier: str | None = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    backend: str = "duckdb",
+    lake_root: str = str(DEFAULT_LAKE_ROOT),
+    workers: int = 1,
 ):
-    """Processes filtered IMU signals and computes resultants in chunked time windows.
+    """Filters IMU signals and computes gyroscope and accelerometer resultants.
+
+    Each subject's gyroscope axes are low-pass filtered as one stream read in time windows
+    (see ``stream_filtered_imu``); accelerometer resultants are computed per subject in SQL
+    (see ``insert_accel_resultants``). Without ``overwrite`` both only process data newer than
+    what earlier runs covered, except that accelerometer files imported since the last run are
+    looked up in the ``_subject_coverage`` catalog and their rows added even below the latest
+    resultant (the catalog rows taken in are logged in ``_resultant_sources``);
+    gyroscope files catalogued into already-filtered time need ``overwrite``, and a warning names
+    the subjects that have some until it is used (see ``_backfilled_sources``, logged in
+    ``_filtered_sources``).
+
+    Subjects are listed from the builders' ``_subject_coverage`` catalog where it exists (see
+    ``load_coverage``), and subjects with no samples past their watermark are skipped without
+    touching the ``imu`` table.
+
+    Both databases are written through one connection with the accelerometer file attached to
+    the IMU one; ``subjects.duckdb`` (next to ``accel_db_path``) is attached read-only for the
+    ``subject_identifier`` lookup.
 
     Args:
         imu_db_path (str): Path to IMU DuckDB.
         accel_db_path (str): Path to accelerometer DuckDB.
         overwrite (bool): If True, drop and recreate output tables.
-        chunk_sec (int): Size of time chunks to process (in seconds).
-        overlap_sec (int): Amount of overlap between chunks (in seconds).
+        chunk_sec (float): Length of the time windows each subject is read in (in seconds of ``ts``).
+        overlap_sec (float): Seconds of signal the zero-phase filter looks ahead across window edges.
+            Filter state carries across windows, so no sample is read or written twice.
+        max_gap_sec (float): Steps between consecutive samples longer than this split a subject into
+            separate segments: no windows are planned over the gap and the filter restarts after it.
         fs (float): Sampling frequency (Hz).
         subject_identifier (str | None): Restrict to one subject by code.
         dry_run (bool): If True, simulate without writing output.
+        backend (str): Where raw sensor data is read from: "duckdb" (the ``imu`` and ``raw_accelerometer``
+            tables in the two databases) or "lakehouse" (the partitioned Parquet tree under ``lake_root``).
+            Outputs are always written to the two DuckDB files.
+        lake_root (str): Root of the lakehouse tree, used when ``backend`` is "lakehouse".
+        workers (int): Number of processes filtering subjects in parallel. With more than one,
+            workers read the IMU database read-only and stage their output as Parquet, which this
+            process merges as the single writer (see ``filter_subject_to_parquet``).
+
+    Returns:
+        FilterStats | None: Reads, buffer allocations and copies made while filtering; None if the
+        subject was not found.
 
     Raises:
         RuntimeError: If expected tables are missing and overwrite is False.
+        ValueError: If ``backend`` is unknown, ``chunk_sec`` or ``max_gap_sec`` is not positive,
+            or ``overlap_sec`` is negative.
     """
-    imu_con = duckdb.connect(imu_db_path)
-    accel_con = duckdb.connect(accel_db_path)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    if chunk_sec <= 0:
+        raise ValueError(f"chunk_sec must be positive, got {chunk_sec}")
+    if overlap_sec < 0:
+        raise ValueError(f"overlap_sec must not be negative, got {overlap_sec}")
+    if max_gap_sec <= 0:
+        raise ValueError(f"max_gap_sec must be positive, got {max_gap_sec}")
+
+    # One connection over both outputs: the IMU file is its default database and the accelerometer
+    # file is attached next to it, so unqualified tables resolve in either (see ``attach_databases``).
+    con = duckdb.connect(imu_db_path)
+    attach_databases(con, {ACCEL_DB: Path(accel_db_path)}, read_only=False)
+    if backend == "lakehouse":
+        # Raw tables become connection-local views over the Parquet tree; outputs stay in the DuckDB files.
+        register_lakehouse_views(con, Path(lake_root), temporary=True)
 
+    # Outputs follow their source's schema: millisecond DOUBLE ``ts``, or nanosecond BIGINT ``ts``
+    # with FLOAT channels for databases built (or migrated) with the compact schema.
+    imu_ts_per_sec = ts_per_sec(con, "imu")
+    coverage = load_coverage(con, "imu")
+    accel_coverage = "_subject_coverage" if backend == "lakehouse" else f"{ACCEL_DB}.main._subject_coverage"
+    accel_sources_table = f"{ACCEL_DB}._resultant_sources"
     if overwrite:
-        imu_con.execute("DROP TABLE IF EXISTS filtered_imu")
-        accel_con.execute("DROP TABLE IF EXISTS accel_resultant")
-        imu_con.execute("DROP TABLE IF EXISTS _processed_chunks")
+        imu_ts, imu_channel = output_types(imu_ts_per_sec)
+        accel_ts, accel_channel = output_types(ts_per_sec(con, "raw_accelerometer"))
+        con.execute("DROP TABLE IF EXISTS filtered_imu")
+        con.execute(f"DROP TABLE IF EXISTS {ACCEL_DB}.accel_resultant")
+        con.execute("DROP TABLE IF EXISTS _processed_chunks")
+        con.execute("DROP TABLE IF EXISTS _subject_watermarks")
+        con.execute(f"DROP TABLE IF EXISTS {accel_sources_table}")
+        con.execute("DROP TABLE IF EXISTS _filtered_sources")
 
-        imu_con.execute("""
+        con.execute(f"""
             CREATE TABLE filtered_imu (
-                ts DOUBLE,
+                ts {imu_ts},
                 sample_order INTEGER,
                 subject_id BIGINT,
-                gyroscope_x DOUBLE,
-                gyroscope_y DOUBLE,
-                gyroscope_z DOUBLE,
-                resultant_gyro DOUBLE
+                gyroscope_x {imu_channel},
+                gyroscope_y {imu_channel},
+                gyroscope_z {imu_channel},
+                resultant_gyro {imu_channel}
             )
         """)
 
-        accel_con.execute("""
-            CREATE TABLE accel_resultant (
-                ts DOUBLE,
+        con.execute(f"""
+            CREATE TABLE {ACCEL_DB}.accel_resultant (
+                ts {accel_ts},
                 sample_order INTEGER,
                 subject_id BIGINT,
-                x DOUBLE,
-                y DOUBLE,
-                z DOUBLE,
-                resultant_accel DOUBLE
+                x {accel_channel},
+                y {accel_channel},
+                z {accel_channel},
+                resultant_accel {accel_channel}
             )
         """)
 
-        imu_con.execute("""
-            CREATE TABLE _processed_chunks (
-                subject_id BIGINT,
-                ts_start BIGINT,
-                ts_end BIGINT,
-                PRIMARY KEY(subject_id, ts_start, ts_end)
-            )
-        """)
+        con.execute(_PROCESSED_CHUNKS_DDL)
+        con.execute(_WATERMARKS_DDL)
+        con.execute(_SOURCES_DDL.format(table=accel_sources_table))
+        con.execute(_SOURCES_DDL.format(table="_filtered_sources"))
     else:
-        for con, table_name in [(imu_con, "filtered_imu"), (accel_con, "accel_resultant"), (imu_con, "_processed_chunks")]:
-            result = con.execute(f"""
+        imu_db = con.execute("SELECT current_database()").fetchone()[0]
+        for database, table_name in [(imu_db, "filtered_imu"), (ACCEL_DB, "accel_resultant"), (imu_db, "_processed_chunks")]:
+            result = con.execute("""
                 SELECT COUNT(*) FROM information_schema.tables
-                WHERE table_name = '{table_name}'
-            """).fetchone()
+                WHERE table_catalog = ? AND table_name = ?
+            """, (database, table_name)).fetchone()
             exists = result[0] if result else 0
             if exists == 0:
                 raise RuntimeError(f"Expected table '{table_name}' to exist. Use --overwrite to initialize.")
+        if not dry_run:
+            # Databases processed before watermarks (or source logs) existed get the tables on their next run.
+            con.execute(_WATERMARKS_DDL)
+            _ensure_sources(con, accel_sources_table, accel_coverage, "raw-accelerometer")
+            _ensure_sources(con, "_filtered_sources", "_subject_coverage", "imu")
 
     if subject_identifier is not None:
-        meta_db = str(Path(accel_db_path).parent / "subjects.duckdb")
-        con_meta = duckdb.connect(meta_db)
-        result = con_meta.execute(
+        if backend != "lakehouse":
+            attach_databases(con, warehouse_files(Path(accel_db_path).parent, names=("subjects",)))
+        result = con.execute(
             "SELECT subject_id FROM subjects WHERE subject_identifier = ?", (subject_identifier,)
         ).fetchone()
-        con_meta.close()
 
         if result is None:
+            con.close()
             console.print(f"[red]❌ Subject code '{subject_identifier}' not found in metadata DB[/red]")
             return
 
         subject_ids = [result[0]]
     else:
-        subject_ids = imu_con.execute("SELECT DISTINCT subject_id FROM imu").fetchall()
-        subject_ids = [s[0] for s in subject_ids if s[0] is not None]
-
-    chunk_size = int(chunk_sec * fs)
-    overlap = int(overlap_sec * fs)
-
-    for subject_id in track(subject_ids, description="Processing participants"):
-        result = imu_con.execute(
-            f"SELECT MIN(ts), MAX(ts) FROM imu WHERE subject_id = {subject_id}"
-        ).fetchone()
+        subject_ids = list(coverage) if coverage is not None else [
+            s[0] for s in con.execute("SELECT DISTINCT subject_id FROM imu").fetchall() if s[0] is not None
+        ]
+    up_to_date = _up_to_date_subjects(con, coverage)
+    accel_sources = _new_sources(con, accel_sources_table, accel_coverage, "raw-accelerometer", subject_ids)
+    late_accel = _late_ranges(accel_sources)
+    imu_sources = _new_sources(con, "_filtered_sources", "_subject_coverage", "imu", subject_ids)
+    backfilled = _backfilled_sources(con, imu_sources)
+    for subject_id in sorted({source[0] for source in backfilled}):
+        console.print(
+            f"[yellow]⚠️  Gyroscope data was imported before the last filtered sample and will be skipped; "
+            f"rerun with --overwrite to filter it: subj={subject_id}[/yellow]"
+        )
+    if not dry_run:
+        # Sources from the watermark on are filtered by this run (or resumed by the next), so they
+        # can be logged now; backfilled ones stay out of the log and keep warning until an overwrite.
+        _record_sources(con, "_filtered_sources", [source for source in imu_sources if source not in backfilled])
 
-        if result is None or result[0] is None:
-            continue
+    # Windows are spans of ``ts`` (milliseconds, or nanoseconds in the compact schema); the look-ahead is a sample count.
+    chunk_size = int(chunk_sec * imu_ts_per_sec)
+    lookahead = int(overlap_sec * fs)
+    max_gap = max_gap_sec * imu_ts_per_sec
 
-        ts_min, ts_max = map(int, result)
-
-        for start in range(ts_min, ts_max, chunk_size - overlap):
-            end = start + chunk_size
-
-            already_done = imu_con.execute("""
-                SELECT 1 FROM _processed_chunks
-                WHERE subject_id = ? AND ts_start = ? AND ts_end = ?
-            """, (subject_id, start, end)).fetchone()
+    stats = FilterStats()
+    if workers > 1 and not dry_run:
+        # Workers attach the IMU file read-only, which needs this process to let go of it first.
+        con.close()
+        accel_con = duckdb.connect(accel_db_path)
+        if backend == "lakehouse":
+            register_lakehouse_views(accel_con, Path(lake_root), temporary=True)
+        _process_subjects_parallel(
+            imu_db_path, accel_con, subject_ids, chunk_size, fs, backend, lake_root, workers, lookahead, max_gap, stats,
+            up_to_date, late_accel,
+        )
+        _record_sources(accel_con, "_resultant_sources", accel_sources)
+        accel_con.close()
+    else:
+        for subject_id in track(subject_ids, description="Processing participants"):
+            if dry_run:
+                pending = count_pending_accel_resultants(con, subject_id, late_accel.get(subject_id, ()))
+                console.print(f"[cyan]🧪 Would compute {pending} accelerometer resultants: subj={subject_id}[/cyan]")
+            else:
+                insert_accel_resultants(con, subject_id, late_accel.get(subject_id, ()))
 
-            if already_done:
+            if subject_id in up_to_date:
                 if dry_run:
-                    console.print(f"[yellow]⏭️  Skipping already-processed chunk: subj={subject_id}, {start} → {end}[/yellow]")
-                continue
-            elif dry_run:
-                console.print(f"[cyan]🧪 Would process chunk: subj={subject_id}, {start} → {end}[/cyan]")
+                    console.print(f"[yellow]⏭️  No new gyroscope data: subj={subject_id}[/yellow]")
                 continue
+            stream_filtered_imu(
+                con, subject_id, chunk_size, fs=fs, dry_run=dry_run, lookahead=lookahead, max_gap=max_gap, stats=stats
+            )
 
-            df_imu = imu_con.execute(f"""
-                SELECT * FROM imu WHERE subject_id = {subject_id}
-                AND ts BETWEEN {start} AND {end} ORDER BY ts
-            """).pl()
-
-            if not df_imu.is_empty():
-                for axis in ["gyroscope_x", "gyroscope_y", "gyroscope_z"]:
-                    df_imu = df_imu.with_columns([
-                        pl.Series(axis, butter_lowpass_filter(df_imu[axis].to_numpy(), fs=fs))
-                    ])
-                df_imu = df_imu.with_columns([
-                    compute_resultant(df_imu, "gyroscope_x", "gyroscope_y", "gyroscope_z", "resultant_gyro")
-                ])
-                imu_con.register("df_imu", df_imu)
-                imu_con.execute("INSERT INTO filtered_imu SELECT * FROM df_imu")
-
-            df_accel = accel_con.execute(f"""
-                SELECT * FROM raw_accelerometer WHERE subject_id = {subject_id}
-                AND ts BETWEEN {start} AND {end} ORDER BY ts
-            """).pl()
-
-            if not df_accel.is_empty():
-                df_accel = df_accel.with_columns([
-                    compute_resultant(df_accel, "x", "y", "z", "resultant_accel")
-                ])
-                accel_con.register("df_accel", df_accel)
-                accel_con.execute("INSERT INTO accel_resultant SELECT * FROM df_accel")
-
-            imu_con.execute("""
-                INSERT INTO _processed_chunks (subject_id, ts_start, ts_end)
-                VALUES (?, ?, ?)
-            """, (subject_id, start, end))
-
-    imu_con.close()
-    accel_con.close()
+        if not dry_run:
+            _record_sources(con, accel_sources_table, accel_sources)
+        con.close()
+    if not dry_run:
+        console.print(f"[blue]📊 Gyroscope filter: {stats}[/blue]")
     console.print(f"[green]✅ Processing complete. Tables written: filtered_imu, accel_resultant[/green]")
+    return stats
 
@@ -1,15 +1,172 @@
 # centrepoint/utils/files.py
 
+import asyncio
 import gzip
-import io
+import json
+import os
+import random
 import shutil
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from asyncio import Semaphore
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Optional
 
+import fastavro
 import httpx
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 from rich.progress import Progress, TaskID
 
+DEFAULT_ROW_GROUP_SIZE = 128 * 60 * 60  # one hour of 128 Hz samples
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+EXPIRED_URL_STATUS = {401, 403}
+URL_EXPIRY_MARGIN = timedelta(seconds=30)
+
+UrlRefresher = Callable[[], Awaitable[tuple[str, datetime]]]
+AvroIngest = Callable[[Path], Awaitable[object]]
+
+class DownloadError(RuntimeError):
+    """Raised when a file could not be downloaded after all retries."""
+
+    def __init__(self, url: str, output_path: Path, cause: BaseException):
+        """Initializes the error.
+
+        Args:
+            url (str): The last URL attempted.
+            output_path (Path): Requested output path.
+            cause (BaseException): The final underlying error.
+        """
+        super().__init__(f"Failed to download {output_path.name}: {cause}")
+        self.url = url
+        self.output_path = output_path
+        self.cause = cause
+
+_AVRO_PRIMITIVES = {
+    "boolean": pa.bool_(),
+    "int": pa.int32(),
+    "long": pa.int64(),
+    "float": pa.float32(),
+    "double": pa.float64(),
+    "string": pa.string(),
+    "bytes": pa.binary(),
+}
+
+def _avro_to_arrow_type(avro_type) -> Optional[pa.DataType]:
+    """Maps an Avro field type to an Arrow type.
+
+    Args:
+        avro_type: Avro type declaration (name, union list, or dict).
+
+    Returns:
+        Optional[pa.DataType]: Matching Arrow type, or None if the type is not a flat primitive.
+    """
+    if isinstance(avro_type, list):
+        non_null = [t for t in avro_type if t != "null"]
+        return _avro_to_arrow_type(non_null[0]) if len(non_null) == 1 else None
+    if isinstance(avro_type, dict):
+        if "logicalType" in avro_type:
+            return None
+        avro_type = avro_type.get("type")
+    if isinstance(avro_type, str):
+        return _AVRO_PRIMITIVES.get(avro_type)
+    return None
+
+def avro_schema_to_arrow(avro_schema: dict) -> Optional[pa.Schema]:
+    """Builds an Arrow schema from an Avro record schema.
+
+    Args:
+        avro_schema (dict): Parsed Avro writer schema.
+
+    Returns:
+        Optional[pa.Schema]: Arrow schema, or None if any field cannot be mapped and types must be inferred.
+    """
+    fields = []
+    for field in avro_schema.get("fields", []):
+        arrow_type = _avro_to_arrow_type(field["type"])
+        if arrow_type is None:
+            return None
+        fields.append(pa.field(field["name"], arrow_type))
+    return pa.schema(fields)
+
+def avro_record_batches(avro_path: Path, batch_size: int = DEFAULT_ROW_GROUP_SIZE) -> pa.RecordBatchReader:
+    """Opens an Avro file as a stream of Arrow record batches.
+
+    Avro blocks are decoded one by one with fastavro, and a batch is emitted whenever
+    ``batch_size`` records have accumulated, so memory is bounded by the batch size. The Arrow
+    schema comes from the Avro writer schema, or is inferred from the first batch if the Avro
+    schema uses types without a direct Arrow mapping.
+
+    Args:
+        avro_path (Path): Source Avro container file.
+        batch_size (int, optional): Records per batch. Defaults to DEFAULT_ROW_GROUP_SIZE.
+
+    Returns:
+        pa.RecordBatchReader: Reader over the file's records. The file stays open until the reader is exhausted.
+    """
+    fo = open(avro_path, "rb")
+    blocks = fastavro.block_reader(fo)
+    schema = avro_schema_to_arrow(blocks.writer_schema or {})
+
+    def record_lists():
+        try:
+            records: list[dict] = []
+            for block in blocks:
+                for record in block:
+                    records.append(record)
+                    if len(records) >= batch_size:
+                        yield records
+                        records = []
+            if records:
+                yield records
+        finally:
+            fo.close()
+
+    lists = record_lists()
+    if schema is None:
+        first = next(lists, [])
+        first_batch = pa.RecordBatch.from_pylist(first)
+        schema = first_batch.schema
+
+        def batches():
+            if first:
+                yield first_batch
+            for records in lists:
+                yield pa.RecordBatch.from_pylist(records, schema=schema)
+    else:
+        def batches():
+            for records in lists:
+                yield pa.RecordBatch.from_pylist(records, schema=schema)
+
+    return pa.RecordBatchReader.from_batches(schema, batches())
+
+def avro_to_parquet(avro_path: Path, parquet_path: Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Converts an Avro file to Parquet one row group at a time.
+
+    Memory is bounded by the row-group size rather than the file size.
+
+    Args:
+        avro_path (Path): Source Avro container file.
+        parquet_path (Path): Destination Parquet file.
+        row_group_size (int, optional): Records per Parquet row group. Defaults to DEFAULT_ROW_GROUP_SIZE.
+
+    Returns:
+        int: Number of records written.
+    """
+    total = 0
+    reader = avro_record_batches(avro_path, row_group_size)
+    with pq.ParquetWriter(parquet_path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=row_group_size)
+            total += batch.num_rows
+    return total
+
 async def download_data_file(
     url: str,
     output_path: Path,
@@ -17,9 +174,33 @@ async def download_data_file(
     progress: Progress,
     task_id: TaskID,
     is_gzipped: bool = True,
-):
+    stream: bool = False,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    client: Optional[httpx.AsyncClient] = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    refresh_url: Optional[UrlRefresher] = None,
+    url_expires_on: Optional[datetime] = None,
+    executor: Optional[Executor] = None,
+    decode_slots: Optional[Semaphore] = None,
+    ingest: Optional[AvroIngest] = None,
+    keep_output: bool = True,
+    version: Optional[str] = None,
+) -> Optional[Path]:
     """Downloads a data file from a URL, with support for gzip and Avro→Parquet conversion.
 
+    The raw body is written to a ``.part`` file next to the output. Transient failures
+    (connection errors, 408/429/5xx) are retried with jittered exponential backoff, and each
+    retry resumes the ``.part`` file with an HTTP Range request. A ``.part`` left by an earlier
+    run is only resumed if it was fetched for the same ``version`` of the file, and resumes send
+    ``If-Range`` with the ETag it was fetched with, so a changed file is fetched afresh instead of
+    being appended to stale bytes. The decoded result is written
+    to a temporary file and atomically renamed into place, so the output path only ever holds
+    a complete file.
+
+    Decoding is CPU-bound, so it runs on ``executor`` rather than on the event loop; other
+    downloads keep making progress while a file is being converted.
+
     Args:
         url (str): The download URL.
         output_path (Path): Path to save the downloaded file or its converted result.
@@ -27,23 +208,210 @@ async def download_data_file(
         progress (Progress): Rich progress bar object.
         task_id (TaskID): Progress task ID for updates.
         is_gzipped (bool, optional): If True, decompress gzip; otherwise treat as Avro and convert. Defaults to True.
+        stream (bool, optional): If True, read the body in chunks and convert it row group by row group
+            instead of buffering the whole file in memory. Defaults to False.
+        row_group_size (int, optional): Records per Parquet row group in streaming mode.
+        client (httpx.AsyncClient, optional): Shared pooled client (see ``create_async_client``).
+            If omitted, a short-lived client is created for this file.
+        retries (int, optional): Retries after the first attempt. Defaults to DEFAULT_RETRIES.
+        backoff (float, optional): Base delay in seconds for exponential backoff. Defaults to DEFAULT_BACKOFF.
+        refresh_url (UrlRefresher, optional): Coroutine returning a fresh ``(url, expires_on)`` pair,
+            used when the signed URL has expired or is rejected with 401/403.
+        url_expires_on (datetime, optional): Expiry of ``url``; it is refreshed shortly before this time.
+        executor (Executor, optional): Pool that runs ``decode_part_file``. A ``ProcessPoolExecutor``
+            lets decoding scale with cores. Defaults to the event loop's default thread pool.
+        decode_slots (Semaphore, optional): Bounds the files fetched but not yet decoded. The download
+            slot is held until a decode slot frees up, which applies back-pressure to the network stage.
+        ingest (AvroIngest, optional): Coroutine called with the raw Avro body once it is complete,
+            e.g. to append it straight into a DuckDB warehouse. It runs inside the decode slot.
+        keep_output (bool, optional): If False, skip writing the decoded file and only call ``ingest``.
+            Defaults to True.
+        version (str, optional): Upstream version of the file, e.g. its ``modifiedDate``. A ``.part``
+            fetched for another version is discarded. Defaults to None (any ``.part`` without a
+            recorded version is resumed).
+
+    Returns:
+        Optional[Path]: The file written to disk (the ``.parquet`` sibling of ``output_path`` for Avro),
+        or None if ``keep_output`` is False.
+
+    Raises:
+        DownloadError: If the file could not be fetched or decoded.
     """
-    async with sem:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
+    part = part_path(output_path)
+    final = converted_path(output_path, is_gzipped)
+    attempt = 0
 
-            if is_gzipped:
-                compressed = io.BytesIO(response.content)
-                with gzip.GzipFile(fileobj=compressed) as gzipped:
-                    with open(output_path, "wb") as out_file:
-                        shutil.copyfileobj(gzipped, out_file)
-            else:
-                # Avro → Parquet conversion
-                avro_stream = io.BytesIO(response.content)
-                df = pl.read_avro(avro_stream)
-                parquet_path = output_path.with_suffix(".parquet")
-                df.write_parquet(parquet_path)
+    try:
+        while True:
+            if refresh_url is not None and _is_expiring(url_expires_on):
+                url, url_expires_on = await refresh_url()
+            try:
+                async with sem:
+                    if client is None:
+                        async with httpx.AsyncClient() as own_client:
+                            await _fetch_to_part(own_client, url, part, stream, version)
+                    else:
+                        await _fetch_to_part(client, url, part, stream, version)
+                    # Keep the download slot until the decode stage has room, so a slow
+                    # decoder throttles fetching instead of piling up .part files.
+                    if decode_slots is not None:
+                        await decode_slots.acquire()
+                break
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                expired = status in EXPIRED_URL_STATUS and refresh_url is not None
+                if attempt >= retries or not (status is None or status in RETRYABLE_STATUS or expired):
+                    raise DownloadError(url, output_path, e) from e
+                if expired:
+                    url, url_expires_on = await refresh_url()  # type: ignore[misc]
+                await asyncio.sleep(backoff_delay(attempt, backoff))
+                attempt += 1
 
+        try:
+            if keep_output:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(executor, decode_part_file, part, final, is_gzipped, stream, row_group_size)
+            if ingest is not None:
+                await ingest(part)
+        except Exception as e:
+            _discard_part(part)
+            raise DownloadError(url, output_path, e) from e
+        finally:
+            if decode_slots is not None:
+                decode_slots.release()
+        _discard_part(part)
+    finally:
         progress.update(task_id, advance=1)
+    return final if keep_output else None
+
+def converted_path(output_path: Path, is_gzipped: bool) -> Path:
+    """Returns the path a download ends up at once decoded.
+
+    Args:
+        output_path (Path): Requested output path.
+        is_gzipped (bool): True for gzipped CSV, False for Avro converted to Parquet.
+
+    Returns:
+        Path: ``output_path`` itself for CSV, or its ``.parquet`` sibling for Avro.
+    """
+    return output_path if is_gzipped else output_path.with_suffix(".parquet")
+
+def part_path(output_path: Path) -> Path:
+    """Returns the path holding the raw, possibly incomplete, body of a download."""
+    return output_path.with_name(output_path.name + ".part")
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF, cap: float = MAX_BACKOFF) -> float:
+    """Returns a full-jitter exponential backoff delay.
+
+    Args:
+        attempt (int): Zero-based retry number.
+        base (float, optional): Base delay in seconds. Defaults to DEFAULT_BACKOFF.
+        cap (float, optional): Maximum delay in seconds. Defaults to MAX_BACKOFF.
+
+    Returns:
+        float: Seconds to wait before the next attempt.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def _is_expiring(expires_on: Optional[datetime]) -> bool:
+    """Checks whether a signed URL expires within URL_EXPIRY_MARGIN."""
+    if expires_on is None:
+        return False
+    if expires_on.tzinfo is None:
+        expires_on = expires_on.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) >= expires_on - URL_EXPIRY_MARGIN
 
+def _part_meta_path(part: Path) -> Path:
+    """Returns the sidecar recording which version of a file a ``.part`` holds."""
+    return part.with_name(part.name + ".json")
+
+def _read_part_meta(part: Path) -> dict:
+    """Reads a ``.part`` file's sidecar: ``{"version": ..., "etag": ...}``, or {} if it has none."""
+    try:
+        return json.loads(_part_meta_path(part).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _discard_part(part: Path):
+    """Removes a ``.part`` file and its sidecar."""
+    part.unlink(missing_ok=True)
+    _part_meta_path(part).unlink(missing_ok=True)
+
+async def _fetch_to_part(client, url: str, part: Path, stream: bool, version: Optional[str] = None):
+    """Fetches the raw body into a ``.part`` file, resuming from its current size with a Range request.
+
+    A ``.part`` recorded for another ``version`` is discarded first. Resumes send ``If-Range``
+    with the ETag the ``.part`` was started with, so the server answers 200 with the whole new
+    body if the file changed, and the ``.part`` is rewritten from the start.
+
+    Args:
+        client: Async HTTP client used for the request.
+        url (str): The download URL.
+        part (Path): The ``.part`` file to create or extend.
+        stream (bool): If True, write the body chunk by chunk instead of buffering it.
+        version (str, optional): Upstream version of the file, recorded next to the ``.part``.
+    """
+    meta = _read_part_meta(part)
+    if part.exists() and meta.get("version") != version:
+        _discard_part(part)
+        meta = {}
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if meta.get("etag"):
+            headers["If-Range"] = meta["etag"]
+    kwargs = {"headers": headers} if headers else {}
+
+    if stream:
+        async with client.stream("GET", url, **kwargs) as response:
+            if offset and response.status_code == 416:
+                return  # The previous attempt already received the whole body
+            response.raise_for_status()
+            mode = _start_part(part, offset, response, version)
+            with open(part, mode) as out_file:
+                async for chunk in response.aiter_bytes():
+                    out_file.write(chunk)
+    else:
+        response = await client.get(url, **kwargs)
+        if offset and response.status_code == 416:
+            return
+        response.raise_for_status()
+        mode = _start_part(part, offset, response, version)
+        with open(part, mode) as out_file:
+            out_file.write(response.content)
+
+def _start_part(part: Path, offset: int, response, version: Optional[str]) -> str:
+    """Returns the mode to open the ``.part`` with, recording its version when it starts over."""
+    mode = _part_mode(offset, response)
+    if mode == "wb":
+        _part_meta_path(part).write_text(json.dumps({"version": version, "etag": response.headers.get("ETag")}))
+    return mode
+
+def _part_mode(offset: int, response) -> str:
+    """Appends when the server honoured the Range request, otherwise starts over."""
+    return "ab" if offset and response.status_code == 206 else "wb"
+
+def decode_part_file(part: Path, final: Path, is_gzipped: bool, stream: bool, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+    """Decodes a completed raw download and atomically moves the result into place.
+
+    Args:
+        part (Path): Raw gzip or Avro body.
+        final (Path): Destination CSV or Parquet file.
+        is_gzipped (bool): If True, decompress gzip; otherwise treat as Avro and convert.
+        stream (bool): If True, convert Avro row group by row group instead of loading it whole.
+        row_group_size (int, optional): Records per Parquet row group in streaming mode.
+    """
+    tmp = final.with_name(final.name + ".tmp")
+    try:
+        if is_gzipped:
+            with gzip.open(part, "rb") as gzipped, open(tmp, "wb") as out_file:
+                shutil.copyfileobj(gzipped, out_file, STREAM_CHUNK_SIZE)
+        elif stream:
+            avro_to_parquet(part, tmp, row_group_size)
+        else:
+            # Avro → Parquet conversion
+            pl.read_avro(part).write_parquet(tmp)
+        os.replace(tmp, final)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,41 @@
+# centrepoint/utils/http.py
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, read=300.0)
+
+def create_async_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """Creates a pooled async HTTP client meant to be shared across a whole download run.
+
+    Reusing one client lets every request reuse open TCP/TLS connections instead of
+    performing a fresh handshake per file.
+
+    Args:
+        max_connections (int, optional): Upper bound on open connections. Defaults to DEFAULT_MAX_CONNECTIONS.
+        max_keepalive_connections (int, optional): Idle connections kept in the pool. Defaults to DEFAULT_MAX_KEEPALIVE.
+        keepalive_expiry (float, optional): Seconds an idle connection is kept alive. Defaults to DEFAULT_KEEPALIVE_EXPIRY.
+        http2 (bool, optional): Negotiate HTTP/2 when the server supports it. Requires the ``h2`` package
+            (``pip install centrepoint[http2]``). Defaults to False.
+        timeout (httpx.Timeout, optional): Request timeouts. Defaults to DEFAULT_TIMEOUT.
+
+    Returns:
+        httpx.AsyncClient: A client to be used as an async context manager.
+
+    Raises:
+        ImportError: If HTTP/2 is requested but ``h2`` is not installed.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=timeout, follow_redirects=True)
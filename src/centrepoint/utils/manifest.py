@@ -0,0 +1,179 @@
+# centrepoint/utils/manifest.py
+
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import duckdb
+
+from centrepoint.models.data_access import DataAccessFile
+
+DEFAULT_MANIFEST_PATH = Path("data/_manifest.duckdb")
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Computes the SHA-256 checksum of a file without loading it into memory.
+
+    Args:
+        path (Path): File to hash.
+        chunk_size (int, optional): Bytes read per iteration. Defaults to 1 MiB.
+
+    Returns:
+        str: Hex-encoded digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_fingerprint(path: Path) -> tuple[int, str]:
+    """Returns the size and SHA-256 checksum recorded for a downloaded file.
+
+    Hashing a multi-GB file is slow, so async callers run this off the event loop
+    (e.g. with ``asyncio.to_thread``) and pass the result to ``DownloadManifest.record``.
+
+    Args:
+        path (Path): File to fingerprint.
+
+    Returns:
+        tuple[int, str]: Size in bytes and hex-encoded SHA-256 digest.
+    """
+    return path.stat().st_size, file_sha256(path)
+
+_DOWNLOADS_DDL = """
+    CREATE TABLE IF NOT EXISTS downloads (
+        study_id BIGINT,
+        subject_id BIGINT,
+        data_category TEXT,
+        file_format TEXT,
+        date DATE,
+        file_name TEXT,
+        modified_date TIMESTAMP,
+        local_path TEXT,
+        byte_size BIGINT,
+        sha256 TEXT,
+        downloaded_at TIMESTAMP,
+        PRIMARY KEY (study_id, subject_id, data_category, file_format, date)
+    )
+"""
+
+class DownloadManifest:
+    """Local record of downloaded files, used to skip files that have not changed upstream.
+
+    Entries are keyed by (study_id, subject_id, data_category, file_format, date), so CSV and Avro
+    downloads of the same day are tracked separately, and store the upstream ``modifiedDate``
+    together with the size and checksum of the file written locally.
+    """
+
+    def __init__(self, path: Path = DEFAULT_MANIFEST_PATH):
+        """Opens or creates the manifest database.
+
+        Args:
+            path (Path, optional): DuckDB file holding the manifest. Defaults to DEFAULT_MANIFEST_PATH.
+        """
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = duckdb.connect(str(path))
+        self._upgrade()
+        self.con.execute(_DOWNLOADS_DDL)
+
+    def _upgrade(self):
+        """Adds ``file_format`` to the key of manifests written before it was part of it.
+
+        The format of old entries is read from their file name; entries where it cannot be never
+        match again, so those files are downloaded once more.
+        """
+        columns = self.con.execute(
+            "SELECT column_name FROM duckdb_columns() WHERE database_name = current_database() AND table_name = 'downloads'"
+        ).fetchall()
+        if not columns or ("file_format",) in columns:
+            return
+        self.con.execute("BEGIN TRANSACTION")
+        self.con.execute("ALTER TABLE downloads RENAME TO _downloads_old")
+        self.con.execute(_DOWNLOADS_DDL)
+        self.con.execute("""
+            INSERT INTO downloads BY NAME SELECT *,
+                CASE WHEN file_name ILIKE '%.avro' THEN 'avro' WHEN file_name ILIKE '%.csv%' THEN 'csv' END AS file_format
+            FROM _downloads_old
+        """)
+        self.con.execute("DROP TABLE _downloads_old")
+        self.con.execute("COMMIT")
+
+    def _key(self, f: DataAccessFile) -> tuple:
+        return (f.studyId, f.subjectId, f.dataCategory, f.fileFormat, f.date.date())
+
+    def is_current(self, f: DataAccessFile, local_path: Optional[Path], verify_checksum: bool = False) -> bool:
+        """Checks whether a file was already downloaded and is unchanged upstream.
+
+        Args:
+            f (DataAccessFile): File metadata from the API.
+            local_path (Optional[Path]): Where the downloaded (and converted) file is expected on disk,
+                or None for files ingested without keeping a local copy.
+            verify_checksum (bool, optional): Re-hash the local file instead of trusting its size. Defaults to False.
+
+        Returns:
+            bool: True if the manifest entry matches ``modifiedDate`` and the local file is intact.
+        """
+        row = self.con.execute("""
+            SELECT modified_date, local_path, byte_size, sha256 FROM downloads
+            WHERE study_id = ? AND subject_id = ? AND data_category = ? AND file_format = ? AND date = ?
+        """, self._key(f)).fetchone()
+        if row is None:
+            return False
+
+        modified_date, recorded_path, byte_size, sha256 = row
+        if modified_date != _naive_utc(f.modifiedDate):
+            return False
+        if local_path is None or recorded_path is None:
+            return local_path is None and recorded_path is None
+        if Path(recorded_path) != local_path:
+            return False
+        if not local_path.exists() or local_path.stat().st_size != byte_size:
+            return False
+        return not verify_checksum or file_sha256(local_path) == sha256
+
+    def record(
+        self,
+        f: DataAccessFile,
+        local_path: Optional[Path],
+        fingerprint: Optional[tuple[int, str]] = None,
+    ):
+        """Records a completed download, replacing any previous entry for the same key.
+
+        Args:
+            f (DataAccessFile): File metadata from the API.
+            local_path (Optional[Path]): The file written to disk, or None if it was only ingested.
+            fingerprint (Optional[tuple[int, str]]): Size and checksum of ``local_path`` from
+                ``file_fingerprint``, if already computed. Computed here otherwise.
+        """
+        if local_path is not None and fingerprint is None:
+            fingerprint = file_fingerprint(local_path)
+        byte_size, sha256 = fingerprint if local_path is not None else (None, None)
+        self.con.execute("""
+            INSERT OR REPLACE INTO downloads
+            (study_id, subject_id, data_category, file_format, date, file_name, modified_date, local_path, byte_size, sha256, downloaded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            *self._key(f),
+            f.fileName,
+            _naive_utc(f.modifiedDate),
+            str(local_path) if local_path is not None else None,
+            byte_size,
+            sha256,
+            _naive_utc(datetime.now(timezone.utc)),
+        ))
+
+    def close(self):
+        """Closes the manifest database."""
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _naive_utc(value: datetime) -> datetime:
+    """Converts a datetime to naive UTC, the form stored in the manifest's TIMESTAMP columns."""
+    return value if value.tzinfo is None else value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -1,9 +1,13 @@
 # centrepointAPI/utils/pagination.py
 
-from typing import Callable, Iterator, TypeVar, Protocol
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterator, TypeVar, Protocol
 
 T = TypeVar("T")
 
+DEFAULT_PREFETCH = 8
+
 class Paginated(Protocol[T]):
     """Protocol representing a paginated response object."""
 
@@ -30,3 +34,77 @@ def paginate(get_page: Callable[[int, int], Paginated[T]], limit: int = 100) ->
         offset += page.limit
         if offset >= page.totalCount:
             break
+
+def _remaining_offsets(page: Paginated) -> range:
+    """Returns the offsets of every page after the first, as revealed by its totalCount."""
+    step = page.limit or len(page.items)
+    if step <= 0:
+        return range(0)
+    return range(page.offset + step, page.totalCount, step)
+
+def paginate_prefetch(
+    get_page: Callable[[int, int], Paginated[T]],
+    limit: int = 100,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> Iterator[T]:
+    """Iterates over paginated results, fetching the remaining pages in parallel.
+
+    The first page reveals ``totalCount``; every other page is then requested up front on a
+    thread pool of ``prefetch`` workers, before the first page's items are yielded, and yielded
+    in order as it arrives. ``get_page`` must be safe to call from several threads at once.
+
+    Args:
+        get_page (Callable[[int, int], Paginated[T]]): Function that returns a Paginated page given a limit and offset.
+        limit (int, optional): Number of items to request per page. Defaults to 100.
+        prefetch (int, optional): Maximum pages in flight at once. Defaults to DEFAULT_PREFETCH.
+
+    Yields:
+        Iterator[T]: Items from each paginated response, in offset order.
+    """
+    first = get_page(limit, 0)
+    offsets = _remaining_offsets(first)
+    if not offsets:
+        yield from first.items
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(prefetch, len(offsets)))) as pool:
+        # Submitted before the first page is yielded, so the requests overlap the caller's work on it.
+        pages = pool.map(lambda offset: get_page(first.limit, offset), offsets)
+        yield from first.items
+        for page in pages:
+            yield from page.items
+
+async def apaginate(
+    get_page: Callable[[int, int], Awaitable[Paginated[T]]],
+    limit: int = 100,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> AsyncIterator[T]:
+    """Asynchronously iterates over paginated results, fetching the remaining pages concurrently.
+
+    Args:
+        get_page (Callable[[int, int], Awaitable[Paginated[T]]]): Coroutine function returning a page given a limit and offset.
+        limit (int, optional): Number of items to request per page. Defaults to 100.
+        prefetch (int, optional): Maximum pages in flight at once. Defaults to DEFAULT_PREFETCH.
+
+    Yields:
+        AsyncIterator[T]: Items from each paginated response, in offset order.
+    """
+    first = await get_page(limit, 0)
+    sem = asyncio.Semaphore(max(1, prefetch))
+
+    async def fetch(offset: int) -> Paginated[T]:
+        async with sem:
+            return await get_page(first.limit, offset)
+
+    # Scheduled before the first page is yielded, so the requests overlap the caller's work on it.
+    pending = [asyncio.ensure_future(fetch(offset)) for offset in _remaining_offsets(first)]
+    try:
+        for item in first.items:
+            yield item
+        for future in pending:
+            page = await future
+            for item in page.items:
+                yield item
+    finally:
+        for future in pending:
+            future.cancel()
@@ -51,3 +51,44 @@ def test_token_refresh_on_expiry(monkeypatch, mock_token_response):
     token = auth.get_token()
     assert token == "mock-access-token"
 
+
+@pytest.mark.asyncio
+async def test_aget_token_single_refresh(monkeypatch, mock_token_response):
+    import asyncio
+    calls = []
+
+    class FakeAsyncClient:
+        async def __aenter__(self): return self
+        async def __aexit__(self, *args): pass
+        async def post(self, url, data):
+            calls.append(url)
+            await asyncio.sleep(0)
+            return httpx.Response(200, json=mock_token_response, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx, "AsyncClient", FakeAsyncClient)
+
+    auth = CentrePointAuth()
+    tokens = await asyncio.gather(*(auth.aget_token() for _ in range(5)))
+
+    assert tokens == ["mock-access-token"] * 5
+    assert len(calls) == 1
+
+
+def test_get_token_single_refresh_across_threads(monkeypatch, mock_token_response):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    calls = []
+
+    def fake_post(url, data):
+        calls.append(url)
+        time.sleep(0.01)
+        return httpx.Response(200, json=mock_token_response, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx, "post", fake_post)
+
+    auth = CentrePointAuth()
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        tokens = list(pool.map(lambda _: auth.get_token(), range(5)))
+
+    assert tokens == ["mock-access-token"] * 5
+    assert len(calls) == 1
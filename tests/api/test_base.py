@@ -1,6 +1,6 @@
 import pytest
 import httpx
-from centrepoint.api.base import BaseAPI
+from centrepoint.api.base import AsyncBaseAPI, BaseAPI
 from centrepoint.auth import CentrePointAuth
 
 
@@ -40,3 +40,24 @@ def test_post_request(monkeypatch, dummy_api):
     assert response.status_code == 201
     assert response.json()["status"] == "created"
 
+
+
+class FakeAsyncAuth(CentrePointAuth):
+    async def aget_token(self):
+        return "fake-token"
+
+
+@pytest.mark.asyncio
+async def test_async_get_request_uses_shared_client(monkeypatch):
+    def handler(request):
+        assert str(request.url) == "https://example.com/api/resource?x=1"
+        assert request.headers["Authorization"] == "Bearer fake-token"
+        return httpx.Response(200, json={"message": "ok"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = AsyncBaseAPI(FakeAsyncAuth(), base_url="https://example.com/api", client=client)
+        response = await api.get("/resource", params={"x": "1"})
+        await api.aclose()
+        assert not client.is_closed
+
+    assert response.json()["message"] == "ok"
@@ -2,7 +2,7 @@
 
 import pytest
 import httpx
-from centrepoint.api.data_access import DataAccessAPI
+from centrepoint.api.data_access import AsyncDataAccessAPI, DataAccessAPI
 from centrepoint.models.data_access import PaginatedDataAccessFiles, DataAccessFile
 from centrepoint.auth import CentrePointAuth
 from datetime import datetime
@@ -56,3 +56,19 @@ def test_list_files(monkeypatch, mock_file_list_response):
     assert isinstance(files, PaginatedDataAccessFiles)
     assert len(files.items) == 1
     assert files.items[0].fileName.endswith(".avro")
+
+
+@pytest.mark.asyncio
+async def test_async_list_files(monkeypatch, mock_file_list_response):
+    async def mock_get(self, url, **kwargs):
+        assert url == "/files/studies/1414/subjects/123/imu"
+        assert kwargs["params"]["fileFormat"] == "avro"
+        return httpx.Response(200, json=mock_file_list_response, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr("centrepoint.api.base.AsyncBaseAPI.get", mock_get)
+
+    async with AsyncDataAccessAPI(FakeAuth()) as api:
+        files = await api.list_files(study_id=1414, subject_id=123, data_category="imu", file_format="avro")
+
+    assert isinstance(files, PaginatedDataAccessFiles)
+    assert files.items[0].subjectId == 123
@@ -1,6 +1,6 @@
 import pytest
 import httpx
-from centrepoint.api.studies import StudiesAPI
+from centrepoint.api.studies import AsyncStudiesAPI, StudiesAPI
 from centrepoint.models.study import PaginatedStudies, Study
 from centrepoint.auth import CentrePointAuth
 from datetime import datetime
@@ -45,3 +45,16 @@ def test_list_studies(monkeypatch, mock_study_response):
     assert result.items[0].name == "Study One"
     assert result.items[0].organizationName == "Org"
 
+
+@pytest.mark.asyncio
+async def test_async_list_studies(monkeypatch, mock_study_response):
+    async def mock_get(self, url, **kwargs):
+        assert url == "/Studies"
+        return httpx.Response(200, json=mock_study_response, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr("centrepoint.api.base.AsyncBaseAPI.get", mock_get)
+
+    async with AsyncStudiesAPI(FakeAuth()) as api:
+        result = await api.list_studies()
+
+    assert result.items[0].name == "Study One"
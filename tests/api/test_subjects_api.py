@@ -2,7 +2,7 @@
 
 import pytest
 import httpx
-from centrepoint.api.subjects import SubjectsAPI
+from centrepoint.api.subjects import AsyncSubjectsAPI, SubjectsAPI
 from centrepoint.models.subject import PaginatedSubjects, Subject
 from centrepoint.auth import CentrePointAuth
 
@@ -88,3 +88,34 @@ def test_get_subject(monkeypatch, mock_single_subject_response):
     assert subject.id == 42
     assert subject.subjectIdentifier == "XYZ999"
     assert subject.gender == "F"
+
+
+@pytest.mark.asyncio
+async def test_async_list_and_get_subject(monkeypatch, mock_subjects_response, mock_single_subject_response):
+    async def mock_get(self, url, **kwargs):
+        body = mock_subjects_response if url == "/Studies/1414/Subjects" else mock_single_subject_response
+        return httpx.Response(200, json=body, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr("centrepoint.api.base.AsyncBaseAPI.get", mock_get)
+
+    async with AsyncSubjectsAPI(FakeAuth()) as api:
+        result = await api.list_subjects(study_id=1414)
+        subject = await api.get_subject(study_id=1414, subject_id=42)
+
+    assert result.items[0].subjectIdentifier == "ABC123"
+    assert subject.subjectIdentifier == "XYZ999"
+
+
+def test_iter_subjects_follows_pagination(monkeypatch, mock_subjects_response):
+    def mock_get(self, url, **kwargs):
+        offset = int(kwargs["params"]["offset"])
+        item = dict(mock_subjects_response["items"][0], id=offset + 1, subjectIdentifier=f"S{offset}")
+        body = {"items": [item], "totalCount": 3, "limit": 1, "offset": offset}
+        return httpx.Response(200, json=body, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr("centrepoint.api.base.BaseAPI.get", mock_get)
+
+    api = SubjectsAPI(FakeAuth())
+    subjects = list(api.iter_subjects(study_id=1414, limit=1))
+
+    assert [s.subjectIdentifier for s in subjects] == ["S0", "S1", "S2"]
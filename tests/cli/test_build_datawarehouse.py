@@ -1,3 +1,5 @@
+import duckdb
+import polars as pl
 from centrepoint.cli import build_datawarehouse
 from types import SimpleNamespace
 
@@ -7,7 +9,7 @@ def test_main_builds_all(monkeypatch):
 
     class FakeBuilder:
         sensor_columns = ["imu", "raw-accelerometer"]
-        def __init__(self, data_root, dwh_root, verbose):
+        def __init__(self, data_root, dwh_root, verbose, compact_schema=False):
             self.data_root = data_root
             self.dwh_root = dwh_root
         def build_sensor_db(self, sensor):
@@ -23,7 +25,12 @@ def test_main_builds_all(monkeypatch):
             data_root="fake-data",
             dwh_root="fake-dwh",
             verbose=False,
-            study_id=1414
+            study_id=1414,
+            jobs=1,
+            cluster=False,
+            backend="duckdb",
+            lake_root="fake-lake",
+            compact_schema=False,
         ))
     )
 
@@ -32,3 +39,40 @@ def test_main_builds_all(monkeypatch):
     assert calls["build_sensor_db"] == ["imu", "raw-accelerometer"]
     assert calls["build_subject_metadata_db"] == 1414
 
+
+
+def test_main_builds_sensors_in_parallel_jobs(monkeypatch, tmp_path):
+    data_root = tmp_path / "data"
+    for sensor, columns in {
+        "imu": ["Timestamp", "SampleOrder", "SubjectId", "GyroscopeX", "GyroscopeY", "GyroscopeZ"],
+        "raw-accelerometer": ["Timestamp", "SampleOrder", "SubjectId", "X", "Y", "Z"],
+    }.items():
+        (data_root / sensor).mkdir(parents=True)
+        pl.DataFrame({c: [1, 2] for c in columns}).write_parquet(data_root / sensor / "day.parquet")
+
+    studies = []
+    monkeypatch.setattr(
+        build_datawarehouse.SensorDWHBuilder, "build_subject_metadata_db", lambda self, study_id: studies.append(study_id)
+    )
+    monkeypatch.setattr(
+        build_datawarehouse, "get_parser",
+        lambda: SimpleNamespace(parse_args=lambda: SimpleNamespace(
+            data_root=data_root, dwh_root=tmp_path / "dwh", verbose=False, study_id=1414, jobs=3, cluster=True,
+            backend="duckdb", lake_root=tmp_path / "lake", compact_schema=True,
+        ))
+    )
+
+    build_datawarehouse.main()
+
+    assert studies == [1414]
+    for sensor, table in (("imu", "imu"), ("raw-accelerometer", "raw_accelerometer")):
+        con = duckdb.connect(str(tmp_path / "dwh" / f"{sensor}.duckdb"))
+        assert con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 2
+        assert con.execute(f"SELECT typeof(ts) FROM {table} LIMIT 1").fetchone()[0] == "BIGINT"
+        con.close()
+    assert not (tmp_path / "dwh" / "temperature.duckdb").exists()
+
+
+def test_threads_per_job_splits_cores():
+    assert build_datawarehouse.threads_per_job(3, cpu_count=32) == 10
+    assert build_datawarehouse.threads_per_job(8, cpu_count=4) == 1
@@ -30,3 +30,14 @@ def test_process_dwh_help():
 def test_list_subjects_help():
     run_help("list_subjects.py")
 
+
+def test_migrate_dwh_help():
+    run_help("migrate_dwh.py")
+
+
+def test_query_dwh_help():
+    run_help("query_dwh.py")
+
+
+def test_build_motion_help():
+    run_help("build_motion.py")
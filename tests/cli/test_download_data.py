@@ -2,6 +2,7 @@ import pytest
 import asyncio
 from types import SimpleNamespace
 from centrepoint.cli import download_data
+from centrepoint.models.data_access import DataAccessFile
 
 
 @pytest.fixture
@@ -12,40 +13,293 @@ def mock_subject_and_files(monkeypatch):
         date=(fake_date := download_data.datetime(2024, 1, 1)),
         fileName="test.avro",
         fileFormat="avro",
-        downloadUrl="https://example.com/fake"
+        modifiedDate=fake_date,
+        downloadUrl="https://example.com/fake",
+        downloadUrlExpiresOn=None
     )
     fake_files = SimpleNamespace(items=[fake_file])
 
     class FakeSubjectsAPI:
         def __init__(self, *args, **kwargs): pass
-        def list_subjects(self, study_id): return SimpleNamespace(items=[fake_subject])
+        async def iter_subjects(self, study_id):
+            yield fake_subject
 
     class FakeDataAPI:
         def __init__(self, *args, **kwargs): pass
-        def list_files(self, **kwargs): return fake_files
+        async def iter_files(self, **kwargs):
+            for f in fake_files.items:
+                yield f
 
     async def fake_download_data_file(*args, **kwargs):
         return None
 
-    monkeypatch.setattr(download_data, "SubjectsAPI", FakeSubjectsAPI)
-    monkeypatch.setattr(download_data, "DataAccessAPI", FakeDataAPI)
+    monkeypatch.setattr(download_data, "AsyncSubjectsAPI", FakeSubjectsAPI)
+    monkeypatch.setattr(download_data, "AsyncDataAccessAPI", FakeDataAPI)
     monkeypatch.setattr(download_data, "download_data_file", fake_download_data_file)
 
 
 @pytest.mark.asyncio
 async def test_run_download_single_category(mock_subject_and_files, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     # Suppress actual console output
     monkeypatch.setattr(download_data, "console", SimpleNamespace(print=lambda *a, **k: None))
 
     args = SimpleNamespace(
-        subject_identifier="TEST_SUBJECT",
+        subject_identifier=["TEST_SUBJECT"],
+        all_subjects=False,
         data_category="imu",
         start_date=download_data.datetime(2024, 1, 1),
         end_date=download_data.datetime(2024, 1, 2),
         study_id=1414,
         file_format="avro",
-        max_concurrency=2
+        max_concurrency=2,
+        stream=False,
+        row_group_size=1000,
+        max_connections=4,
+        max_keepalive=2,
+        keepalive_expiry=5.0,
+        http2=False,
+        manifest=None,
+        no_manifest=True,
+        force=False,
+        retries=0,
+        backoff=0.0,
+        decode_workers=0,
+        decode_queue=None,
+        ingest_dwh=None,
+        no_keep_parquet=False
     )
 
     await download_data.run_download(args)
 
+
+
+@pytest.mark.asyncio
+async def test_run_download_all_subjects_all_categories(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(download_data, "console", SimpleNamespace(print=lambda *a, **k: None))
+
+    subjects = [SimpleNamespace(id=i, subjectIdentifier=f"S{i}") for i in (1, 2)]
+    listed = []
+    downloaded = []
+    active = {"now": 0, "max": 0}
+
+    class FakeSubjectsAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_subjects(self, study_id):
+            for s in subjects:
+                yield s
+
+    class FakeDataAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_files(self, subject_id, data_category, **kwargs):
+            listed.append((subject_id, data_category))
+            for day in (1, 2):
+                d = download_data.datetime(2024, 1, day)
+                yield SimpleNamespace(
+                    date=d, modifiedDate=d, fileName="f.avro", fileFormat="avro", subjectId=subject_id,
+                    downloadUrl=f"u/{subject_id}/{data_category}/{day}", downloadUrlExpiresOn=None
+                )
+
+    async def fake_download_data_file(url, output_path, sem, progress, task_id, **kwargs):
+        async with sem:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            downloaded.append(output_path.name)
+
+    monkeypatch.setattr(download_data, "AsyncSubjectsAPI", FakeSubjectsAPI)
+    monkeypatch.setattr(download_data, "AsyncDataAccessAPI", FakeDataAPI)
+    monkeypatch.setattr(download_data, "download_data_file", fake_download_data_file)
+    monkeypatch.setattr(download_data, "print_summary", lambda *a: None)
+
+    args = SimpleNamespace(
+        subject_identifier=None,
+        all_subjects=True,
+        data_category="all",
+        start_date=download_data.datetime(2024, 1, 1),
+        end_date=download_data.datetime(2024, 1, 3),
+        study_id=1414,
+        file_format="avro",
+        max_concurrency=3,
+        stream=False,
+        row_group_size=1000,
+        max_connections=4,
+        max_keepalive=2,
+        keepalive_expiry=5.0,
+        http2=False,
+        manifest=None,
+        no_manifest=True,
+        force=False,
+        retries=0,
+        backoff=0.0,
+        decode_workers=0,
+        decode_queue=None,
+        ingest_dwh=None,
+        no_keep_parquet=False
+    )
+
+    await download_data.run_download(args)
+
+    assert len(listed) == 6
+    assert len(downloaded) == 12
+    assert "S2_temperature_2024-01-02.avro" in downloaded
+    assert active["max"] == 3
+
+
+@pytest.mark.asyncio
+async def test_run_download_skips_files_in_manifest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(download_data, "console", SimpleNamespace(print=lambda *a, **k: None))
+    monkeypatch.setattr(download_data, "print_summary", lambda *a: None)
+
+    subject = SimpleNamespace(id=123, subjectIdentifier="S1")
+    files = [
+        DataAccessFile.model_validate({
+            "studyId": 1414, "subjectId": 123, "dataCategory": "imu",
+            "date": f"2025-03-{day}T00:00:00Z", "fileName": f"f{day}.avro", "fileFormat": "avro",
+            "modifiedDate": "2025-03-20T00:00:00Z", "downloadUrl": f"https://example.com/{day}",
+            "downloadUrlExpiresOn": "2025-04-01T00:00:00Z",
+        })
+        for day in (10, 11)
+    ]
+    downloaded = []
+
+    class FakeSubjectsAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_subjects(self, study_id):
+            yield subject
+
+    class FakeDataAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_files(self, **kwargs):
+            for f in files:
+                yield f
+
+    async def fake_download_data_file(url, output_path, *args, **kwargs):
+        downloaded.append(url)
+        written = output_path.with_suffix(".parquet")
+        written.write_bytes(url.encode())
+        return written
+
+    monkeypatch.setattr(download_data, "AsyncSubjectsAPI", FakeSubjectsAPI)
+    monkeypatch.setattr(download_data, "AsyncDataAccessAPI", FakeDataAPI)
+    monkeypatch.setattr(download_data, "download_data_file", fake_download_data_file)
+
+    args = SimpleNamespace(
+        subject_identifier=["S1"], all_subjects=False, data_category="imu",
+        start_date=download_data.datetime(2025, 3, 10), end_date=download_data.datetime(2025, 3, 12),
+        study_id=1414, file_format="avro", max_concurrency=2, stream=False, row_group_size=1000,
+        max_connections=4, max_keepalive=2, keepalive_expiry=5.0, http2=False,
+        manifest=tmp_path / "manifest.duckdb", no_manifest=False, force=False, retries=0, backoff=0.0,
+        decode_workers=0, decode_queue=None, ingest_dwh=None, no_keep_parquet=False
+    )
+
+    await download_data.run_download(args)
+    assert len(downloaded) == 2
+
+    await download_data.run_download(args)
+    assert len(downloaded) == 2
+
+    files[1] = files[1].model_copy(update={"modifiedDate": download_data.datetime(2025, 3, 25)})
+    await download_data.run_download(args)
+    assert downloaded[2:] == ["https://example.com/11"]
+
+
+@pytest.mark.asyncio
+async def test_run_download_reports_failures_per_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(download_data, "console", SimpleNamespace(print=lambda *a, **k: None))
+    summaries = []
+    monkeypatch.setattr(download_data, "print_summary", lambda counts, failures: summaries.append((counts, failures)))
+
+    subject = SimpleNamespace(id=7, subjectIdentifier="S7")
+
+    class FakeSubjectsAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_subjects(self, study_id):
+            yield subject
+
+    class FakeDataAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_files(self, **kwargs):
+            for day in (1, 2, 3):
+                yield SimpleNamespace(
+                    date=download_data.datetime(2024, 1, day), modifiedDate=download_data.datetime(2024, 1, day),
+                    fileName=f"{day}.avro", fileFormat="avro",
+                    subjectId=7, downloadUrl=f"u/{day}", downloadUrlExpiresOn=None
+                )
+
+    async def fake_download_data_file(url, output_path, *args, **kwargs):
+        if url == "u/2":
+            raise RuntimeError("boom")
+        return output_path
+
+    monkeypatch.setattr(download_data, "AsyncSubjectsAPI", FakeSubjectsAPI)
+    monkeypatch.setattr(download_data, "AsyncDataAccessAPI", FakeDataAPI)
+    monkeypatch.setattr(download_data, "download_data_file", fake_download_data_file)
+
+    args = SimpleNamespace(
+        subject_identifier=["S7"], all_subjects=False, data_category="imu",
+        start_date=download_data.datetime(2024, 1, 1), end_date=download_data.datetime(2024, 1, 4),
+        study_id=1414, file_format="avro", max_concurrency=2, stream=False, row_group_size=1000,
+        max_connections=4, max_keepalive=2, keepalive_expiry=5.0, http2=False,
+        manifest=None, no_manifest=True, force=False, retries=0, backoff=0.0,
+        decode_workers=0, decode_queue=None, ingest_dwh=None, no_keep_parquet=False
+    )
+
+    assert await download_data.run_download(args) == 1
+    counts, failures = summaries[0]
+    assert counts[("S7", "imu")] == [2, 0, 1]
+    assert failures == [("S7", "imu", "2024-01-02", "boom")]
+
+
+@pytest.mark.asyncio
+async def test_run_download_reports_failed_listings_and_continues(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(download_data, "console", SimpleNamespace(print=lambda *a, **k: None))
+    summaries = []
+    monkeypatch.setattr(download_data, "print_summary", lambda counts, failures: summaries.append((counts, failures)))
+
+    subject = SimpleNamespace(id=7, subjectIdentifier="S7")
+
+    class FakeSubjectsAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_subjects(self, study_id):
+            yield subject
+
+    class FakeDataAPI:
+        def __init__(self, *args, **kwargs): pass
+        async def iter_files(self, data_category, **kwargs):
+            if data_category == "imu":
+                raise RuntimeError("listing down")
+            yield SimpleNamespace(
+                date=download_data.datetime(2024, 1, 1), modifiedDate=download_data.datetime(2024, 1, 1), fileName="1.avro", fileFormat="avro",
+                subjectId=7, downloadUrl=f"u/{data_category}", downloadUrlExpiresOn=None
+            )
+
+    downloaded = []
+
+    async def fake_download_data_file(url, output_path, *args, **kwargs):
+        downloaded.append(url)
+        return output_path
+
+    monkeypatch.setattr(download_data, "AsyncSubjectsAPI", FakeSubjectsAPI)
+    monkeypatch.setattr(download_data, "AsyncDataAccessAPI", FakeDataAPI)
+    monkeypatch.setattr(download_data, "download_data_file", fake_download_data_file)
+
+    args = SimpleNamespace(
+        subject_identifier=["S7"], all_subjects=False, data_category="all",
+        start_date=download_data.datetime(2024, 1, 1), end_date=download_data.datetime(2024, 1, 2),
+        study_id=1414, file_format="avro", max_concurrency=2, stream=False, row_group_size=1000,
+        max_connections=4, max_keepalive=2, keepalive_expiry=5.0, http2=False,
+        manifest=None, no_manifest=True, force=False, retries=0, backoff=0.0,
+        decode_workers=0, decode_queue=None, ingest_dwh=None, no_keep_parquet=False
+    )
+
+    assert await download_data.run_download(args) == 1
+    counts, failures = summaries[0]
+    assert sorted(downloaded) == ["u/raw-accelerometer", "u/temperature"]
+    assert counts[("S7", "imu")] == [0, 0, 1]
+    assert failures == [("S7", "imu", "(listing)", "listing down")]
@@ -23,13 +23,64 @@ def test_main_lists_subjects(monkeypatch):
             return FakeCursor()
         def close(self): pass
 
-    monkeypatch.setattr(list_subjects, "duckdb", SimpleNamespace(connect=lambda path: FakeConn()))
+    monkeypatch.setattr(list_subjects, "connect_catalog", lambda *args, **kwargs: FakeConn())
     monkeypatch.setattr(list_subjects, "Console", lambda: SimpleNamespace(print=lambda *a, **k: None))
 
     monkeypatch.setattr(
         list_subjects, "get_parser",
-        lambda: SimpleNamespace(parse_args=lambda: SimpleNamespace(filter=None))
+        lambda: SimpleNamespace(parse_args=lambda: SimpleNamespace(filter=None, backend="duckdb", lake_root=None, coverage=False))
     )
 
     list_subjects.main()
 
+
+
+def test_main_lists_subjects_from_lakehouse(monkeypatch, tmp_path):
+    import polars as pl
+
+    (tmp_path / "subjects").mkdir()
+    pl.DataFrame({"subject_id": [2, 1], "subject_identifier": ["SUBJ_B", "SUBJ_A"]}).write_parquet(
+        tmp_path / "subjects" / "subjects.parquet"
+    )
+    printed = []
+    monkeypatch.setattr(list_subjects, "Console", lambda: SimpleNamespace(print=printed.append))
+    monkeypatch.setattr(
+        list_subjects, "get_parser",
+        lambda: SimpleNamespace(parse_args=lambda: SimpleNamespace(filter="subj_a", backend="lakehouse", lake_root=tmp_path, coverage=False))
+    )
+
+    list_subjects.main()
+
+    assert printed[0].row_count == 1
+
+
+def test_main_adds_imu_coverage_from_catalog(monkeypatch, tmp_path):
+    import duckdb
+    import polars as pl
+    from centrepoint.dwh.creator import SensorDWHBuilder
+
+    (tmp_path / "data" / "imu").mkdir(parents=True)
+    pl.DataFrame({
+        "Timestamp": [10.0, 11.0, 86400.0 + 5], "SampleOrder": [0, 0, 0], "SubjectId": [1, 1, 1],
+        "GyroscopeX": [0.0] * 3, "GyroscopeY": [0.0] * 3, "GyroscopeZ": [0.0] * 3,
+    }).write_parquet(tmp_path / "data" / "imu" / "S1.parquet")
+    SensorDWHBuilder(tmp_path / "data", tmp_path / "dwh").build_sensor_db("imu")
+    con = duckdb.connect(str(tmp_path / "dwh" / "subjects.duckdb"))
+    con.execute("CREATE TABLE subjects AS SELECT * FROM (VALUES (1, 'SUBJ_A'), (2, 'SUBJ_B')) t(subject_id, subject_identifier)")
+    con.close()
+
+    printed = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(list_subjects, "Console", lambda: SimpleNamespace(print=printed.append))
+    monkeypatch.setattr(
+        list_subjects, "get_parser",
+        lambda: SimpleNamespace(parse_args=lambda: SimpleNamespace(filter=None, backend="duckdb", lake_root=None, coverage=True))
+    )
+
+    list_subjects.main()
+
+    table = printed[0]
+    assert [column.header for column in table.columns][2:] == ["Days", "Samples", "First Day", "Last Day"]
+    assert [list(column.cells) for column in table.columns][2:] == [
+        ["2", ""], ["3", ""], ["1970-01-01", ""], ["1970-01-02", ""]
+    ]
@@ -18,7 +18,13 @@ def test_main_invokes_processor(monkeypatch):
             imu_db="dummy_imu.duckdb",
             accel_db="dummy_accel.duckdb",
             overwrite=True,
-            dry_run=False
+            chunk_sec=300,
+            overlap_sec=2.0,
+            max_gap_sec=5.0,
+            dry_run=False,
+            backend="lakehouse",
+            lake_root="dummy_lake",
+            workers=4
         ))
     )
 
@@ -28,5 +34,11 @@ def test_main_invokes_processor(monkeypatch):
     assert called["imu_db_path"] == "dummy_imu.duckdb"
     assert called["accel_db_path"] == "dummy_accel.duckdb"
     assert called["overwrite"] is True
+    assert called["chunk_sec"] == 300
+    assert called["overlap_sec"] == 2.0
+    assert called["max_gap_sec"] == 5.0
     assert called["dry_run"] is False
+    assert called["backend"] == "lakehouse"
+    assert called["lake_root"] == "dummy_lake"
+    assert called["workers"] == 4
 
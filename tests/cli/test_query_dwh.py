@@ -0,0 +1,26 @@
+# tests/cli/test_query_dwh.py
+
+import subprocess
+import sys
+import duckdb
+
+
+def run_query(dwh, sql):
+    return subprocess.run(
+        [sys.executable, "-m", "centrepoint.cli.query_dwh", sql, "--dwh-root", str(dwh)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+
+
+def test_query_prints_rows_and_exits_non_zero_on_failure(tmp_path):
+    con = duckdb.connect(str(tmp_path / "subjects.duckdb"))
+    con.execute("CREATE TABLE subjects AS SELECT 101 AS subject_id, 'SUBJ_A' AS subject_identifier")
+    con.close()
+
+    ok = run_query(tmp_path, "SELECT subject_identifier FROM subjects")
+    failed = run_query(tmp_path, "SELECT * FROM no_such_table")
+
+    assert ok.returncode == 0 and "SUBJ_A" in ok.stdout
+    assert failed.returncode == 1 and "Query failed" in failed.stdout
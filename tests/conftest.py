@@ -42,3 +42,23 @@ def temp_duckdb_path():
     with tempfile.TemporaryDirectory() as tmpdir:
         yield Path(tmpdir) / "test.duckdb"
 
+
+
+@pytest.fixture
+def raw_128hz_data(tmp_path):
+    """Raw IMU and accelerometer Parquet files: 4 s of 128 Hz samples at a present-day epoch."""
+    import numpy as np
+
+    n = 4 * 128
+    rng = np.random.default_rng(3)
+    data_root = tmp_path / "data"
+    for sensor, channels in {"imu": ["GyroscopeX", "GyroscopeY", "GyroscopeZ"], "raw-accelerometer": ["X", "Y", "Z"]}.items():
+        (data_root / sensor).mkdir(parents=True)
+        df = pl.DataFrame({
+            "Timestamp": 1_700_000_000.0 + np.arange(n) // 128,
+            "SampleOrder": np.arange(n) % 128,
+            "SubjectId": [101] * n,
+            **{c: rng.standard_normal(n) for c in channels},
+        })
+        df.write_parquet(data_root / sensor / "day1.parquet")
+    return data_root
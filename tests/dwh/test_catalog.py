@@ -0,0 +1,51 @@
+# tests/dwh/test_catalog.py
+
+import duckdb
+import pytest
+from centrepoint.dwh.catalog import connect_catalog
+from centrepoint.dwh.creator import SensorDWHBuilder
+from centrepoint.dwh.processor import process_all_resultants
+
+
+@pytest.fixture
+def processed_dwh(raw_128hz_data, tmp_path):
+    dwh = tmp_path / "dwh"
+    builder = SensorDWHBuilder(raw_128hz_data, dwh)
+    builder.build_sensor_db("imu")
+    builder.build_sensor_db("raw-accelerometer")
+    con = duckdb.connect(str(dwh / "subjects.duckdb"))
+    con.execute("CREATE TABLE subjects AS SELECT 101 AS subject_id, 'SUBJ_A' AS subject_identifier")
+    con.close()
+    process_all_resultants(str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb"), overwrite=True, chunk_sec=1)
+    return dwh
+
+
+def test_catalog_joins_across_sensor_databases_in_one_query(processed_dwh):
+    con = connect_catalog(processed_dwh)
+
+    aligned = con.execute("""
+        SELECT s.subject_identifier, COUNT(*), COUNT(a.resultant_accel)
+        FROM filtered_imu g
+        JOIN subjects s USING (subject_id)
+        LEFT JOIN accel_resultant a USING (subject_id, ts)
+        GROUP BY ALL
+    """).fetchall()
+    coverage = con.execute("SELECT sensor, SUM(row_count) FROM _subject_coverage GROUP BY ALL ORDER BY ALL").fetchall()
+    databases = con.execute(
+        "SELECT database_name, readonly FROM duckdb_databases() WHERE NOT internal AND database_name <> 'memory' ORDER BY ALL"
+    ).fetchall()
+
+    assert aligned == [("SUBJ_A", 512, 512)]
+    assert coverage == [("imu", 512), ("raw-accelerometer", 512)]
+    assert databases == [("imu_db", True), ("raw_accelerometer_db", True), ("subjects_db", True)]
+    with pytest.raises(duckdb.Error):
+        con.execute("DELETE FROM filtered_imu")
+    con.close()
+
+
+def test_catalog_can_be_opened_by_several_readers(processed_dwh):
+    first, second = connect_catalog(processed_dwh), connect_catalog(processed_dwh)
+
+    assert first.execute("SELECT COUNT(*) FROM imu").fetchone() == second.execute("SELECT COUNT(*) FROM imu").fetchone()
+    first.close()
+    second.close()
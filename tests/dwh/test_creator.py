@@ -5,6 +5,7 @@ import duckdb
 import tempfile
 from pathlib import Path
 import polars as pl
+from datetime import date
 from centrepoint.dwh.creator import SensorDWHBuilder
 
 
@@ -72,8 +73,8 @@ def test_build_subject_metadata_db(monkeypatch, tmp_path):
 
     class FakeSubjectsAPI:
         def __init__(self, auth): pass
-        def list_subjects(self, study_id):
-            return type("Resp", (), {"items": [FakeSubject(1, "A"), FakeSubject(2, "B")]})()
+        def iter_subjects(self, study_id):
+            return iter([FakeSubject(1, "A"), FakeSubject(2, "B")])
 
     monkeypatch.setattr("centrepoint.dwh.creator.SubjectsAPI", FakeSubjectsAPI)
     monkeypatch.setattr("centrepoint.dwh.creator.CentrePointAuth", lambda: None)
@@ -111,3 +112,151 @@ def test_index_creation_fails(tmp_path):
     db_path = tmp_path / f"{sensor}.duckdb"
     assert db_path.exists()
 
+
+
+def test_ingest_avro_appends_once_and_is_skipped_by_parquet_build(fake_parquet_dir, tmp_path):
+    avro_path = tmp_path / "test.avro"
+    pl.read_parquet(fake_parquet_dir / "imu" / "test.parquet").write_avro(avro_path)
+    builder = SensorDWHBuilder(fake_parquet_dir, tmp_path / "dwh")
+
+    con = builder.connect_sensor_db("imu")
+    assert builder.ingest_avro(con, "imu", avro_path, "test.parquet", batch_size=2) == 3
+    assert builder.ingest_avro(con, "imu", avro_path, "test.parquet") is None
+    rows = con.execute("SELECT ts, sample_order, gyroscope_x FROM imu ORDER BY ts").fetchall()
+    coverage = con.execute("SELECT source, row_count, ts_max FROM _subject_coverage").fetchall()
+    con.close()
+    assert rows == [(1000.0, 0, 0.1), (2000.0 + 1000 / 128, 1, 0.2), (3000.0 + 2000 / 128, 2, 0.3)]
+    assert coverage == [("test.parquet", 3, 3000.0 + 2000 / 128)]
+
+    builder.build_sensor_db("imu")
+    con = duckdb.connect(str(tmp_path / "dwh" / "imu.duckdb"))
+    assert con.execute("SELECT COUNT(*) FROM imu").fetchone()[0] == 3
+    con.close()
+
+
+def test_build_sensor_db_imports_only_new_files_in_bulk(fake_parquet_dir, tmp_path):
+    builder = SensorDWHBuilder(fake_parquet_dir, tmp_path / "dwh", verbose=True)
+    builder.build_sensor_db("imu")
+
+    df = pl.read_parquet(fake_parquet_dir / "imu" / "test.parquet")
+    for day in ("a", "b"):
+        df.select(list(reversed(df.columns))).write_parquet(fake_parquet_dir / "imu" / f"{day}.parquet")
+    builder.build_sensor_db("imu")
+    builder.build_sensor_db("imu")
+
+    con = duckdb.connect(str(tmp_path / "dwh" / "imu.duckdb"))
+    assert con.execute("SELECT COUNT(*) FROM imu").fetchone()[0] == 9
+    assert sorted(r[0] for r in con.execute("SELECT filename FROM _imported_files").fetchall()) == [
+        "a.parquet", "b.parquet", "test.parquet"
+    ]
+    con.close()
+
+
+def test_cluster_sensor_db_orders_by_subject_and_ts(tmp_path):
+    sensor_dir = tmp_path / "imu"
+    sensor_dir.mkdir()
+    for day, subjects in (("d1", [2, 1]), ("d2", [1, 2])):
+        pl.DataFrame({
+            "Timestamp": [10.0 if day == "d2" else 5.0] * 2,
+            "SampleOrder": [0, 0],
+            "SubjectId": subjects,
+            "GyroscopeX": [0.0, 0.0], "GyroscopeY": [0.0, 0.0], "GyroscopeZ": [0.0, 0.0],
+        }).write_parquet(sensor_dir / f"{day}.parquet")
+
+    builder = SensorDWHBuilder(tmp_path, tmp_path / "dwh")
+    builder.build_sensor_db("imu")
+    builder.cluster_sensor_db("imu")
+
+    con = duckdb.connect(str(tmp_path / "dwh" / "imu.duckdb"))
+    rows = con.execute("SELECT subject_id, ts FROM imu").fetchall()
+    indexes = con.execute("SELECT index_name FROM duckdb_indexes()").fetchall()
+    con.close()
+    assert rows == [(1, 5000.0), (1, 10000.0), (2, 5000.0), (2, 10000.0)]
+    assert indexes == [("idx_imu_ts",)]
+
+
+def test_compact_schema_stores_exact_ns_ts_and_float_channels(fake_parquet_dir, tmp_path):
+    dwh = tmp_path / "dwh"
+    SensorDWHBuilder(fake_parquet_dir, dwh, compact_schema=True).build_sensor_db("imu")
+
+    con = duckdb.connect(str(dwh / "imu.duckdb"))
+    types = {row[0]: row[1] for row in con.execute("DESCRIBE imu").fetchall()}
+    rows = con.execute("SELECT ts FROM imu ORDER BY ts").fetchall()
+    con.close()
+    assert types["ts"] == "BIGINT"
+    assert [types[c] for c in ("gyroscope_x", "gyroscope_y", "gyroscope_z")] == ["FLOAT"] * 3
+    assert rows == [(1_000_000_000,), (2_007_812_500,), (3_015_625_000,)]
+
+    with pytest.raises(ValueError, match="compact schema"):
+        SensorDWHBuilder(fake_parquet_dir, dwh).build_sensor_db("imu")
+
+
+def test_imports_maintain_subject_coverage_catalog(fake_parquet_dir, tmp_path):
+    pl.DataFrame({
+        "Timestamp": [86400.0, 86401.0, 86405.0], "SampleOrder": [0, 0, 0], "SubjectId": [123, 123, 123],
+        "GyroscopeX": [0.0] * 3, "GyroscopeY": [0.0] * 3, "GyroscopeZ": [0.0] * 3,
+    }).write_parquet(fake_parquet_dir / "imu" / "day2.parquet")
+    dwh = tmp_path / "dwh"
+    builder = SensorDWHBuilder(fake_parquet_dir, dwh)
+    builder.build_sensor_db("imu")
+
+    con = duckdb.connect(str(dwh / "imu.duckdb"))
+    rows = con.execute("SELECT * FROM _subject_coverage ORDER BY day").fetchall()
+    assert [row[:5] + row[7:] for row in rows] == [
+        ("imu", 123, date(1970, 1, 1), "test.parquet", 3, 0),
+        ("imu", 123, date(1970, 1, 2), "day2.parquet", 3, 1),
+    ]
+    assert rows[1][5:7] == (86400000.0, 86405000.0)
+
+    # A database built before the catalog existed is summarized from the table on the next build.
+    con.execute("DROP TABLE _subject_coverage")
+    con.close()
+    builder.build_sensor_db("imu")
+    con = duckdb.connect(str(dwh / "imu.duckdb"))
+    backfilled = con.execute("SELECT day, source, row_count FROM _subject_coverage ORDER BY day").fetchall()
+    con.close()
+    assert backfilled == [(date(1970, 1, 1), None, 3), (date(1970, 1, 2), None, 3)]
+
+
+def write_integer_temperature(data_root, name, start):
+    (data_root / "temperature").mkdir(parents=True, exist_ok=True)
+    pl.DataFrame({
+        "Timestamp": [start, start + 60], "SubjectId": [7, 7], "TemperatureCelsius": [20.5, 21.0],
+    }).write_parquet(data_root / "temperature" / name)
+
+
+def test_integer_temperature_timestamps_keep_the_default_schema(tmp_path):
+    from centrepoint.dwh.creator import TS_PER_SEC, ts_per_sec
+
+    write_integer_temperature(tmp_path / "data", "day1.parquet", 1_700_000_000)
+    builder = SensorDWHBuilder(tmp_path / "data", tmp_path / "dwh")
+    builder.build_sensor_db("temperature")
+    write_integer_temperature(tmp_path / "data", "day2.parquet", 1_700_086_400)
+    builder.build_sensor_db("temperature")
+
+    con = duckdb.connect(str(tmp_path / "dwh" / "temperature.duckdb"), read_only=True)
+    assert con.execute("SELECT typeof(ts), MIN(ts), COUNT(*) FROM temperature GROUP BY ALL").fetchall() == [
+        ("DOUBLE", 1_700_000_000_000.0, 4)
+    ]
+    assert ts_per_sec(con, "temperature") == TS_PER_SEC
+    con.close()
+
+
+def test_bigint_millisecond_temperature_tables_read_as_the_default_schema(tmp_path):
+    from centrepoint.dwh.creator import TS_PER_SEC, ts_per_sec
+
+    # Default-schema builds used to keep integer timestamps as BIGINT milliseconds.
+    (tmp_path / "dwh").mkdir()
+    con = duckdb.connect(str(tmp_path / "dwh" / "temperature.duckdb"))
+    con.execute("CREATE TABLE temperature (ts BIGINT, subject_id BIGINT, temperature_celsius DOUBLE)")
+    con.execute("INSERT INTO temperature VALUES (1700000000000, 7, 20.5)")
+    assert ts_per_sec(con, "temperature", temperature=True) == TS_PER_SEC
+    con.close()
+
+    write_integer_temperature(tmp_path / "data", "day2.parquet", 1_700_086_400)
+    SensorDWHBuilder(tmp_path / "data", tmp_path / "dwh").build_sensor_db("temperature")
+    con = duckdb.connect(str(tmp_path / "dwh" / "temperature.duckdb"), read_only=True)
+    assert con.execute("SELECT ts FROM temperature ORDER BY ts").fetchall() == [
+        (1_700_000_000_000,), (1_700_086_400_000,), (1_700_086_460_000,)
+    ]
+    con.close()
@@ -0,0 +1,104 @@
+# tests/dwh/test_lakehouse.py
+
+import polars as pl
+import pytest
+from centrepoint.dwh.lakehouse import LakehouseBuilder, connect_lakehouse, connect_warehouse
+from centrepoint.dwh.processor import process_all_resultants
+
+DAY_SEC = 24 * 60 * 60
+
+
+def write_raw(data_root, sensor, name, subject_id, seconds, columns):
+    sensor_dir = data_root / sensor
+    sensor_dir.mkdir(parents=True, exist_ok=True)
+    n = len(seconds)
+    data = {"Timestamp": [float(s) for s in seconds], "SampleOrder": [0] * n, "SubjectId": [subject_id] * n}
+    data.update({c: [float(i) for i in range(n)] for c in columns})
+    pl.DataFrame(data).write_parquet(sensor_dir / name)
+
+
+@pytest.fixture
+def raw_data(tmp_path):
+    data_root = tmp_path / "data"
+    gyro = ["GyroscopeX", "GyroscopeY", "GyroscopeZ"]
+    write_raw(data_root, "imu", "S1_d1.parquet", 1, [10, 11, DAY_SEC + 5], gyro)
+    write_raw(data_root, "imu", "S2_d1.parquet", 2, [20, 21], gyro)
+    write_raw(data_root, "raw-accelerometer", "S1_d1.parquet", 1, [10, 11, DAY_SEC + 5], ["X", "Y", "Z"])
+    return data_root
+
+
+def test_build_writes_hive_partitions_once(raw_data, tmp_path):
+    lake = tmp_path / "lake"
+    builder = LakehouseBuilder(raw_data, lake, verbose=True)
+    builder.build_sensor_db("imu")
+    builder.build_sensor_db("imu")
+
+    partitions = sorted(str(p.parent.relative_to(lake)) for p in lake.glob("sensor=*/**/*.parquet"))
+    assert partitions == [
+        "sensor=imu/subject_id=1/date=1970-01-01",
+        "sensor=imu/subject_id=1/date=1970-01-02",
+        "sensor=imu/subject_id=2/date=1970-01-01",
+    ]
+
+    con = connect_lakehouse(lake)
+    assert con.execute("SELECT COUNT(*) FROM imu").fetchone()[0] == 5
+    assert con.execute(
+        "SELECT sensor, subject_id, source, SUM(row_count) FROM _subject_coverage GROUP BY ALL ORDER BY ALL"
+    ).fetchall() == [("imu", 1, "S1_d1.parquet", 3), ("imu", 2, "S2_d1.parquet", 2)]
+    assert con.execute("SELECT * FROM imu WHERE subject_id = 1 ORDER BY ts LIMIT 1").pl().columns == [
+        "ts", "sample_order", "subject_id", "gyroscope_x", "gyroscope_y", "gyroscope_z"
+    ]
+    con.close()
+
+
+def test_compact_merges_partition_files(raw_data, tmp_path):
+    lake = tmp_path / "lake"
+    builder = LakehouseBuilder(raw_data, lake)
+    builder.build_sensor_db("imu")
+    write_raw(raw_data, "imu", "S1_d1_late.parquet", 1, [5, 30], ["GyroscopeX", "GyroscopeY", "GyroscopeZ"])
+    builder.build_sensor_db("imu")
+
+    day1 = lake / "sensor=imu" / "subject_id=1" / "date=1970-01-01"
+    assert len(list(day1.glob("*.parquet"))) == 2
+    assert builder.compact("imu") == 1
+    files = list(day1.glob("*.parquet"))
+    assert len(files) == 1
+    assert pl.read_parquet(files[0])["ts"].to_list() == [5000.0, 10000.0, 11000.0, 30000.0]
+
+    con = connect_lakehouse(lake)
+    assert con.execute("SELECT COUNT(*) FROM imu").fetchone()[0] == 7
+    con.close()
+
+
+def test_processor_reads_lakehouse_backend(tmp_path):
+    raw_data = tmp_path / "data"
+    write_raw(raw_data, "imu", "S1.parquet", 1, range(10, 30), ["GyroscopeX", "GyroscopeY", "GyroscopeZ"])
+    write_raw(raw_data, "imu", "S2.parquet", 2, range(10, 30), ["GyroscopeX", "GyroscopeY", "GyroscopeZ"])
+    write_raw(raw_data, "raw-accelerometer", "S1.parquet", 1, range(10, 30), ["X", "Y", "Z"])
+    lake = tmp_path / "lake"
+    builder = LakehouseBuilder(raw_data, lake)
+    builder.build_sensor_db("imu")
+    builder.build_sensor_db("raw-accelerometer")
+    (lake / "subjects").mkdir()
+    pl.DataFrame({"subject_id": [1, 2], "subject_identifier": ["A", "B"]}).write_parquet(lake / "subjects" / "subjects.parquet")
+
+    dwh = tmp_path / "dwh"
+    dwh.mkdir()
+    process_all_resultants(
+        imu_db_path=str(dwh / "imu.duckdb"),
+        accel_db_path=str(dwh / "raw-accelerometer.duckdb"),
+        subject_identifier="A",
+        overwrite=True,
+        backend="lakehouse",
+        lake_root=str(lake),
+    )
+
+    con = connect_warehouse("imu", backend="lakehouse", dwh_root=dwh, lake_root=lake)
+    assert con.execute("SELECT COUNT(*) FROM filtered_imu").fetchone()[0] == 20
+    assert con.execute("SELECT COUNT(*) FROM imu").fetchone()[0] == 40
+    con.close()
+
+
+def test_connect_lakehouse_requires_existing_root(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No lakehouse found"):
+        connect_lakehouse(tmp_path / "missing")
@@ -0,0 +1,90 @@
+# tests/dwh/test_migrate.py
+
+import duckdb
+import numpy as np
+import pytest
+from centrepoint.dwh.creator import SensorDWHBuilder
+from centrepoint.dwh.migrate import migrate_to_compact
+from centrepoint.dwh.processor import process_all_resultants
+
+
+def build_and_process(data_root, dwh, compact_schema):
+    builder = SensorDWHBuilder(data_root, dwh, compact_schema=compact_schema)
+    builder.build_sensor_db("imu")
+    builder.build_sensor_db("raw-accelerometer")
+    process_all_resultants(str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb"), overwrite=True, chunk_sec=1)
+
+
+def snapshot(db_path, tables):
+    con = duckdb.connect(str(db_path), read_only=True)
+    rows = {table: con.execute(f"SELECT * FROM {table} ORDER BY ALL").fetchnumpy() for table in tables}
+    con.close()
+    return rows
+
+
+def test_migrated_database_matches_a_compact_build(raw_128hz_data, tmp_path):
+    build_and_process(raw_128hz_data, tmp_path / "legacy", compact_schema=False)
+    build_and_process(raw_128hz_data, tmp_path / "compact", compact_schema=True)
+
+    bookkeeping = ["_processed_chunks", "_subject_watermarks"]
+    before = snapshot(tmp_path / "legacy" / "imu.duckdb", bookkeeping)
+    assert migrate_to_compact(tmp_path / "legacy" / "imu.duckdb") == [
+        "_processed_chunks", "_subject_coverage", "_subject_watermarks", "filtered_imu", "imu"
+    ]
+    assert migrate_to_compact(tmp_path / "legacy" / "raw-accelerometer.duckdb") == [
+        "_subject_coverage", "accel_resultant", "raw_accelerometer"
+    ]
+    assert migrate_to_compact(tmp_path / "legacy" / "imu.duckdb") == []
+    assert not list((tmp_path / "legacy").glob("*.tmp"))
+
+    data_tables = {
+        "imu": ["imu", "filtered_imu", "_imported_files", "_subject_coverage"],
+        "raw-accelerometer": ["raw_accelerometer", "accel_resultant", "_subject_coverage"],
+    }
+    for sensor, tables in data_tables.items():
+        migrated = snapshot(tmp_path / "legacy" / f"{sensor}.duckdb", tables)
+        fresh = snapshot(tmp_path / "compact" / f"{sensor}.duckdb", tables)
+        for table in tables:
+            for column, values in fresh[table].items():
+                if values.dtype.kind == "f":
+                    np.testing.assert_allclose(migrated[table][column], values, rtol=1e-5, atol=1e-6)
+                else:
+                    np.testing.assert_array_equal(migrated[table][column], values)
+
+    # Window bounds and watermarks keep their (whole-millisecond) positions, now in nanoseconds.
+    after = snapshot(tmp_path / "legacy" / "imu.duckdb", bookkeeping)
+    for table in bookkeeping:
+        for column, values in before[table].items():
+            scale = 1 if column == "subject_id" else 1_000_000
+            np.testing.assert_array_equal(after[table][column], values * scale)
+
+    # Constraints survive, and incremental runs continue on the migrated database.
+    con = duckdb.connect(str(tmp_path / "legacy" / "imu.duckdb"))
+    with pytest.raises(duckdb.ConstraintException):
+        con.execute("INSERT INTO _subject_watermarks SELECT * FROM _subject_watermarks")
+    con.close()
+    stats = process_all_resultants(
+        str(tmp_path / "legacy" / "imu.duckdb"), str(tmp_path / "legacy" / "raw-accelerometer.duckdb"), chunk_sec=1
+    )
+    assert stats.rows == 0
+
+
+def test_migrate_requires_existing_database(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No DuckDB database"):
+        migrate_to_compact(tmp_path / "imu.duckdb")
+
+
+def test_migrate_converts_bigint_millisecond_temperature(tmp_path):
+    db_path = tmp_path / "temperature.duckdb"
+    con = duckdb.connect(str(db_path))
+    con.execute("CREATE TABLE temperature (ts BIGINT, subject_id BIGINT, temperature_celsius DOUBLE)")
+    con.execute("INSERT INTO temperature VALUES (1700000000000, 7, 20.5), (1700000060000, 7, 21.0)")
+    con.close()
+
+    assert migrate_to_compact(db_path) == ["temperature"]
+    assert migrate_to_compact(db_path) == []
+    con = duckdb.connect(str(db_path), read_only=True)
+    assert con.execute("SELECT ts, typeof(temperature_celsius) FROM temperature ORDER BY ts").fetchall() == [
+        (1_700_000_000_000_000_000, "FLOAT"), (1_700_000_060_000_000_000, "FLOAT")
+    ]
+    con.close()
@@ -0,0 +1,116 @@
+# tests/dwh/test_motion.py
+
+import duckdb
+import numpy as np
+import polars as pl
+import pytest
+from datetime import date
+from centrepoint.dwh.creator import SensorDWHBuilder
+from centrepoint.dwh.motion import build_motion
+from centrepoint.dwh.processor import process_all_resultants
+
+START = 1_700_000_000
+
+
+def build_dwh(data_root, dwh, compact_schema=False):
+    # Temperature every 2 s, rising 1 °C per second.
+    (data_root / "temperature").mkdir(exist_ok=True)
+    pl.DataFrame({
+        "Timestamp": [START + 0.0, START + 2.0, START + 4.0], "SubjectId": [101] * 3, "TemperatureCelsius": [20.0, 22.0, 24.0],
+    }).write_parquet(data_root / "temperature" / "day1.parquet")
+    builder = SensorDWHBuilder(data_root, dwh, compact_schema=compact_schema)
+    for sensor in ("imu", "raw-accelerometer", "temperature"):
+        builder.build_sensor_db(sensor)
+    process_all_resultants(str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb"), overwrite=True, chunk_sec=1)
+
+
+def read_motion(dwh):
+    con = duckdb.connect(str(dwh / "motion.duckdb"), read_only=True)
+    motion = con.execute("SELECT * FROM motion").pl()
+    con.close()
+    return motion
+
+
+@pytest.mark.parametrize("compact_schema", [False, True])
+def test_motion_aligns_accel_and_interpolates_temperature(raw_128hz_data, tmp_path, compact_schema):
+    dwh = tmp_path / "dwh"
+    build_dwh(raw_128hz_data, dwh, compact_schema)
+
+    assert build_motion(str(dwh)) == [(101, date(2023, 11, 14))]
+
+    motion = read_motion(dwh)
+    con = duckdb.connect(str(dwh / "raw-accelerometer.duckdb"), read_only=True)
+    accel = con.execute("SELECT resultant_accel FROM accel_resultant ORDER BY ts").fetchnumpy()
+    con.close()
+    units = 10**9 if compact_schema else 1000
+    seconds = (motion["ts"].to_numpy() - START * units) / units
+    assert motion.height == 512
+    assert motion["ts"].is_sorted()
+    np.testing.assert_array_equal(motion["resultant_accel"].to_numpy(), accel["resultant_accel"])
+    # Readings end at 4 s; the last second is held within the tolerance.
+    np.testing.assert_allclose(motion["temperature_celsius"].to_numpy(), 20 + np.minimum(seconds, 4), rtol=1e-6)
+
+
+def test_motion_rebuilds_only_changed_days(raw_128hz_data, tmp_path):
+    dwh = tmp_path / "dwh"
+    build_dwh(raw_128hz_data, dwh)
+    imu_path, accel_path = dwh / "imu.duckdb", dwh / "raw-accelerometer.duckdb"
+    assert build_motion(str(dwh), dry_run=True) == [(101, date(2023, 11, 14))]
+    assert not (dwh / "motion.duckdb").exists()
+    build_motion(str(dwh))
+    assert build_motion(str(dwh), overwrite=True, dry_run=True) == [(101, date(2023, 11, 14))]
+    assert build_motion(str(dwh)) == []
+
+    # Dropping every other accelerometer sample rebuilds the day: the gaps are wider than the
+    # default tolerance, and get the nearest sample with a wider one.
+    con = duckdb.connect(str(accel_path))
+    con.execute("DELETE FROM accel_resultant WHERE sample_order % 2 = 1")
+    con.close()
+    assert build_motion(str(dwh)) == [(101, date(2023, 11, 14))]
+    assert read_motion(dwh)["resultant_accel"].null_count() == 256
+
+    # A second day of gyroscope data is built on its own.
+    con = duckdb.connect(str(imu_path))
+    con.execute("INSERT INTO filtered_imu SELECT ts + 86400000, * EXCLUDE (ts) FROM filtered_imu")
+    con.close()
+    assert build_motion(str(dwh)) == [(101, date(2023, 11, 15))]
+    assert read_motion(dwh)["temperature_celsius"][512:].null_count() == 512
+
+    # A temperature file imported late rebuilds the earlier day it belongs to.
+    pl.DataFrame({"Timestamp": [START + 6.0], "SubjectId": [101], "TemperatureCelsius": [26.0]}).write_parquet(
+        raw_128hz_data / "temperature" / "day1_late.parquet"
+    )
+    SensorDWHBuilder(raw_128hz_data, dwh).build_sensor_db("temperature")
+    assert build_motion(str(dwh)) == [(101, date(2023, 11, 14))]
+    motion = read_motion(dwh)
+    first_day = motion.filter(pl.col("ts") < (START + 86400) * 1000)
+    np.testing.assert_allclose(first_day["temperature_celsius"].to_numpy(), 20 + (first_day["ts"].to_numpy() / 1000 - START), rtol=1e-6)
+    assert not motion["ts"].is_sorted()
+
+    # The rebuilt day was appended; clustering restores one sorted run.
+    assert build_motion(str(dwh), cluster=True) == []
+    assert read_motion(dwh)["ts"].is_sorted()
+
+    build_motion(str(dwh), overwrite=True, accel_tolerance_sec=1 / 128)
+    assert read_motion(dwh)["resultant_accel"][:512].null_count() == 0
+
+
+def test_motion_reads_bigint_millisecond_temperature(raw_128hz_data, tmp_path):
+    dwh = tmp_path / "dwh"
+    build_dwh(raw_128hz_data, dwh)
+    # Default-schema temperature tables built from integer timestamps hold BIGINT milliseconds.
+    con = duckdb.connect(str(dwh / "temperature.duckdb"))
+    con.execute("CREATE OR REPLACE TABLE temperature AS SELECT * REPLACE (CAST(ts AS BIGINT) AS ts) FROM temperature")
+    con.close()
+
+    assert build_motion(str(dwh)) == [(101, date(2023, 11, 14))]
+    motion = read_motion(dwh)
+    seconds = motion["ts"].to_numpy() / 1000 - START
+    np.testing.assert_allclose(motion["temperature_celsius"].to_numpy(), 20 + np.minimum(seconds, 4), rtol=1e-6)
+
+
+def test_build_motion_requires_processed_tables(raw_128hz_data, tmp_path):
+    SensorDWHBuilder(raw_128hz_data, tmp_path / "dwh").build_sensor_db("imu")
+
+    with pytest.raises(RuntimeError, match="process-dwh"):
+        build_motion(str(tmp_path / "dwh"))
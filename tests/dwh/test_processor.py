@@ -177,3 +177,378 @@ def test_missing_subject_identifier_fails(dummy_imu_parquet, dummy_accel_parquet
         captured = capsys.readouterr().out
         assert "not found in metadata DB" in captured
 
+
+
+def test_insert_accel_resultants_is_set_based_and_incremental():
+    from centrepoint.dwh.processor import count_pending_accel_resultants, insert_accel_resultants
+
+    con = duckdb.connect()
+    con.execute("""
+        CREATE TABLE raw_accelerometer (ts DOUBLE, sample_order INTEGER, subject_id BIGINT, x DOUBLE, y DOUBLE, z DOUBLE);
+        CREATE TABLE accel_resultant (
+            ts DOUBLE, sample_order INTEGER, subject_id BIGINT, x DOUBLE, y DOUBLE, z DOUBLE, resultant_accel DOUBLE
+        );
+        INSERT INTO raw_accelerometer VALUES (1000, 0, 1, 3, 4, 0), (2000, 0, 1, 0, 0, 2), (1000, 0, 2, 1, 1, 1);
+    """)
+
+    assert count_pending_accel_resultants(con, 1) == 2
+    assert insert_accel_resultants(con, 1) == 2
+    assert insert_accel_resultants(con, 1) == 0
+
+    con.execute("INSERT INTO raw_accelerometer VALUES (3000, 0, 1, 0, 6, 8)")
+    assert insert_accel_resultants(con, 1) == 1
+
+    # A day imported late lands before the latest resultant: only the catalogued range of the late
+    # file is checked, and rows that already have a resultant in it are not added twice.
+    con.execute("INSERT INTO raw_accelerometer VALUES (500, 0, 1, 0, 0, 1)")
+    assert count_pending_accel_resultants(con, 1) == 0
+    assert count_pending_accel_resultants(con, 1, [(500, 1000)]) == 1
+    assert insert_accel_resultants(con, 1, [(500, 1000)]) == 1
+    assert insert_accel_resultants(con, 1, [(500, 1000)]) == 0
+    rows = con.execute("SELECT ts, resultant_accel FROM accel_resultant WHERE subject_id = 1 ORDER BY ts").fetchall()
+    con.close()
+    assert rows == [(500.0, 1.0), (1000.0, 5.0), (2000.0, 2.0), (3000.0, 10.0)]
+
+
+def test_streaming_filter_is_independent_of_block_boundaries():
+    from scipy.signal import sosfilt, sosfilt_zi
+    from centrepoint.dwh.processor import StreamingLowpassFilter, lowpass_sos
+
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((3000, 3)).cumsum(axis=0)
+
+    sos = lowpass_sos()
+    zi = sosfilt_zi(sos)[:, :, np.newaxis]
+    forward, _ = sosfilt(sos, x, axis=0, zi=zi * x[0])
+    backward, _ = sosfilt(sos, forward[::-1], axis=0, zi=zi * forward[-1])
+    reference = backward[::-1]
+
+    for zero_phase, expected in ((True, reference), (False, forward)):
+        engine = StreamingLowpassFilter(zero_phase=zero_phase)
+        splits = np.sort(rng.choice(np.arange(1, len(x)), size=40, replace=False))
+        out = [engine.process(block) for block in np.split(x, splits)] + [engine.flush()]
+        streamed = np.concatenate([o for o in out if len(o)])
+        assert streamed.shape == x.shape
+        np.testing.assert_allclose(streamed, expected, atol=1e-9)
+
+
+def make_imu_con(n=1000):
+    con = duckdb.connect()
+    con.execute("""
+        CREATE TABLE imu (ts DOUBLE, sample_order INTEGER, subject_id BIGINT,
+                          gyroscope_x DOUBLE, gyroscope_y DOUBLE, gyroscope_z DOUBLE);
+        CREATE TABLE filtered_imu (ts DOUBLE, sample_order INTEGER, subject_id BIGINT,
+                                   gyroscope_x DOUBLE, gyroscope_y DOUBLE, gyroscope_z DOUBLE, resultant_gyro DOUBLE);
+        CREATE TABLE _processed_chunks (subject_id BIGINT, ts_start BIGINT, ts_end BIGINT,
+                                        PRIMARY KEY(subject_id, ts_start, ts_end));
+        CREATE TABLE _subject_watermarks (subject_id BIGINT PRIMARY KEY, ts_end BIGINT, segment_start BIGINT, tail_start BIGINT);
+    """)
+    rng = np.random.default_rng(1)
+    df = pl.DataFrame({
+        "ts": np.arange(n) * 1000 / 128,
+        "sample_order": np.arange(n) % 128,
+        "subject_id": [7] * n,
+        "gyroscope_x": rng.standard_normal(n),
+        "gyroscope_y": rng.standard_normal(n),
+        "gyroscope_z": rng.standard_normal(n),
+    })
+    con.register("df", df)
+    con.execute("INSERT INTO imu SELECT * FROM df")
+    return con
+
+
+def test_stream_filtered_imu_writes_each_sample_once_and_resumes():
+    from centrepoint.dwh.processor import stream_filtered_imu
+
+    con = make_imu_con()
+    assert stream_filtered_imu(con, 7, chunk_size=1000) == 1000
+    first = con.execute("SELECT ts, gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+    assert len(np.unique(first["ts"])) == 1000
+    windows = con.execute("SELECT ts_start, ts_end FROM _processed_chunks ORDER BY ts_start").fetchall()
+    assert windows[0] == (0, 1000) and windows[-1][1] > first["ts"][-1]
+
+    assert stream_filtered_imu(con, 7, chunk_size=1000) == 0
+
+    # Simulate an interruption: the last two windows were never recorded, part of their output was written.
+    con.execute("DELETE FROM _processed_chunks WHERE ts_start >= 5000")
+    con.execute("UPDATE _subject_watermarks SET ts_end = 5000, tail_start = 5000")
+    con.execute("DELETE FROM filtered_imu WHERE ts >= 6500")
+    stream_filtered_imu(con, 7, chunk_size=1000)
+    resumed = con.execute("SELECT ts, gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+    con.close()
+
+    np.testing.assert_array_equal(resumed["ts"], first["ts"])
+    np.testing.assert_allclose(resumed["gyroscope_x"], first["gyroscope_x"], atol=1e-9)
+
+
+def test_parallel_workers_match_serial_output(tmp_path):
+    outputs = {}
+    for workers in (1, 2):
+        db_dir = tmp_path / f"workers{workers}"
+        db_dir.mkdir()
+        imu_path, accel_path = db_dir / "imu.duckdb", db_dir / "raw-accelerometer.duckdb"
+        mem = make_imu_con(600)
+        mem.execute(f"ATTACH '{imu_path}' AS out")
+        mem.execute("CREATE TABLE out.imu AS SELECT * FROM imu UNION ALL SELECT ts, sample_order, 8, gyroscope_y, gyroscope_z, gyroscope_x FROM imu")
+        mem.close()
+        accel = duckdb.connect(str(accel_path))
+        accel.execute("CREATE TABLE raw_accelerometer AS SELECT ts, sample_order, subject_id, 3.0 AS x, 4.0 AS y, 0.0 AS z FROM range(3) t(ts), (VALUES (7), (8)) s(subject_id), (VALUES (0)) o(sample_order)")
+        accel.close()
+
+        process_all_resultants(str(imu_path), str(accel_path), overwrite=True, chunk_sec=1, workers=workers)
+
+        con = duckdb.connect(str(imu_path), read_only=True)
+        outputs[workers] = con.execute("SELECT * FROM filtered_imu ORDER BY subject_id, ts").pl()
+        windows = con.execute("SELECT COUNT(*) FROM _processed_chunks").fetchone()[0]
+        con.close()
+        assert windows > 0
+        accel = duckdb.connect(str(accel_path), read_only=True)
+        assert accel.execute("SELECT COUNT(*), MIN(resultant_accel) FROM accel_resultant").fetchone() == (6, 5.0)
+        accel.close()
+        assert not list(db_dir.glob("_staging_*"))
+
+    assert outputs[2].height == 1200
+    assert outputs[1].equals(outputs[2])
+
+
+def test_warns_about_gyro_data_backfilled_before_the_watermark(raw_128hz_data, tmp_path, capsys):
+    dwh = tmp_path / "dwh"
+    builder = SensorDWHBuilder(raw_128hz_data, dwh)
+    builder.build_sensor_db("raw-accelerometer")
+    builder.build_sensor_db("imu")
+    imu_path, accel_path = str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb")
+    process_all_resultants(imu_path, accel_path, overwrite=True, chunk_sec=1)
+    process_all_resultants(imu_path, accel_path, chunk_sec=1)
+    assert "--overwrite" not in capsys.readouterr().out
+
+    # An earlier recording is imported after the later one was filtered; the catalog row of the
+    # new file starts before the watermark, and the warning stays until an overwrite.
+    day1 = pl.read_parquet(raw_128hz_data / "imu" / "day1.parquet")
+    day1.with_columns(pl.col("Timestamp") - 86_400).write_parquet(raw_128hz_data / "imu" / "day0.parquet")
+    builder.build_sensor_db("imu")
+    for _ in range(2):
+        process_all_resultants(imu_path, accel_path, chunk_sec=1)
+        out = capsys.readouterr().out
+        assert "rerun with --overwrite" in out and "subj=101" in out
+
+    process_all_resultants(imu_path, accel_path, overwrite=True, chunk_sec=1)
+    process_all_resultants(imu_path, accel_path, chunk_sec=1)
+    con = duckdb.connect(imu_path, read_only=True)
+    assert con.execute("SELECT COUNT(*) FROM filtered_imu").fetchone() == (1024,)
+    con.close()
+    assert "--overwrite" not in capsys.readouterr().out
+
+
+def test_chunk_sec_is_a_time_span(tmp_path):
+    imu_path, accel_path = tmp_path / "imu.duckdb", tmp_path / "raw-accelerometer.duckdb"
+    mem = make_imu_con(1280)  # 10 s at 128 Hz
+    mem.execute(f"ATTACH '{imu_path}' AS out")
+    mem.execute("CREATE TABLE out.imu AS SELECT * FROM imu")
+    mem.close()
+    duckdb.connect(str(accel_path)).execute(
+        "CREATE TABLE raw_accelerometer (ts DOUBLE, sample_order INTEGER, subject_id BIGINT, x DOUBLE, y DOUBLE, z DOUBLE)"
+    ).close()
+
+    process_all_resultants(str(imu_path), str(accel_path), overwrite=True, chunk_sec=2)
+
+    con = duckdb.connect(str(imu_path), read_only=True)
+    windows = con.execute("SELECT ts_start, ts_end FROM _processed_chunks ORDER BY ts_start").fetchall()
+    assert con.execute("SELECT COUNT(*) FROM filtered_imu").fetchone()[0] == 1280
+    con.close()
+    # The last window ends just past the final sample (ts 9992.1875).
+    assert windows == [(start, start + 2000) for start in range(0, 8000, 2000)] + [(8000, 9993)]
+
+    with pytest.raises(ValueError, match="chunk_sec"):
+        process_all_resultants(str(imu_path), str(accel_path), chunk_sec=0)
+
+
+def test_planner_skips_gaps_and_restarts_filter_after_them():
+    from centrepoint.dwh.processor import plan_subject_segments, stream_filtered_imu
+
+    con = make_imu_con(1000)
+    # Move the second half an hour later: the device was off the wrist in between.
+    con.execute("UPDATE imu SET ts = ts + 3600 * 1000 WHERE ts >= 500 * 1000 / 128")
+    segments = plan_subject_segments(con, 7, chunk_size=1000, max_gap=1000)
+    assert [seg_start for seg_start, _ in segments] == [0, 3603906]
+    assert sum(len(windows) for _, windows in segments) == 8
+    assert segments[0][1][-1] == (3000, 3899)
+
+    stream_filtered_imu(con, 7, chunk_size=1000)
+    assert con.execute("SELECT COUNT(*) FROM filtered_imu").fetchone()[0] == 1000
+    whole = con.execute("SELECT gyroscope_x FROM filtered_imu WHERE ts > 3600000 ORDER BY ts").fetchnumpy()
+
+    # The second segment is filtered exactly as if it were the only data.
+    con.execute("DELETE FROM imu WHERE ts < 3600000")
+    con.execute("DELETE FROM filtered_imu")
+    con.execute("DELETE FROM _processed_chunks")
+    con.execute("DELETE FROM _subject_watermarks")
+    stream_filtered_imu(con, 7, chunk_size=1000)
+    alone = con.execute("SELECT gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+    con.close()
+    np.testing.assert_allclose(whole["gyroscope_x"], alone["gyroscope_x"], atol=1e-12)
+
+
+def test_stream_filtered_imu_commits_output_with_bookkeeping(monkeypatch):
+    from centrepoint.dwh import processor
+
+    con = make_imu_con()
+    processor.stream_filtered_imu(con, 7, chunk_size=1000)
+    expected = con.execute("SELECT ts, gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+    con.execute("DELETE FROM filtered_imu")
+    con.execute("DELETE FROM _processed_chunks")
+    con.execute("DELETE FROM _subject_watermarks")
+
+    original = processor.filter_subject_segments
+
+    def crash_after_six_batches(*args, **kwargs):
+        for i, batch in enumerate(original(*args, **kwargs)):
+            if i == 6:
+                raise KeyboardInterrupt
+            yield batch
+
+    monkeypatch.setattr(processor, "filter_subject_segments", crash_after_six_batches)
+    with pytest.raises(KeyboardInterrupt):
+        processor.stream_filtered_imu(con, 7, chunk_size=1000, batch_windows=2)
+    recorded = con.execute("SELECT MAX(ts_end), COUNT(*) FROM _processed_chunks").fetchone()
+    written = con.execute("SELECT MAX(ts) FROM filtered_imu").fetchone()[0]
+    assert recorded[1] == 4
+    assert con.execute("SELECT ts_end, segment_start, tail_start FROM _subject_watermarks").fetchone() == (4000, 0, 4000)
+    assert written < recorded[0] + 1000
+
+    monkeypatch.setattr(processor, "filter_subject_segments", original)
+    processor.stream_filtered_imu(con, 7, chunk_size=1000, batch_windows=2)
+    resumed = con.execute("SELECT ts, gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+    con.close()
+    np.testing.assert_array_equal(resumed["ts"], expected["ts"])
+    np.testing.assert_allclose(resumed["gyroscope_x"], expected["gyroscope_x"], atol=1e-9)
+
+
+def test_incremental_run_only_filters_new_data():
+    from centrepoint.dwh.processor import load_watermark, plan_subject_segments, stream_filtered_imu
+
+    full = make_imu_con(1500)
+    full.execute("INSERT INTO imu SELECT ts + 3600 * 1000, sample_order, subject_id, gyroscope_x, gyroscope_y, gyroscope_z FROM imu WHERE ts < 2000")
+    stream_filtered_imu(full, 7, chunk_size=1000)
+    expected = full.execute("SELECT ts, gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+
+    con = make_imu_con(1500)
+    con.execute("DELETE FROM imu WHERE ts >= 1000 * 1000 / 128")
+    stream_filtered_imu(con, 7, chunk_size=1000)
+    ts_end, segment_start, tail_start = load_watermark(con, 7)
+    assert (ts_end, segment_start) == (7805, 0) and tail_start == 6812  # the last 128 samples came from the flush
+    assert stream_filtered_imu(con, 7, chunk_size=1000) == 0
+
+    # A later day's ingest extends the segment and adds one after a gap.
+    new_rows = full.execute("SELECT * FROM imu WHERE ts >= 1000 * 1000 / 128").pl()
+    con.register("new_rows", new_rows)
+    con.execute("INSERT INTO imu SELECT * FROM new_rows")
+    segments = plan_subject_segments(con, 7, 1000, 1000, load_watermark(con, 7))
+    assert [(seg_start, windows[0][0]) for seg_start, windows in segments] == [(0, 6812), (3600000, 3600000)]
+
+    assert stream_filtered_imu(con, 7, chunk_size=1000) == 1500 - 872 + 256
+    resumed = con.execute("SELECT ts, gyroscope_x FROM filtered_imu ORDER BY ts").fetchnumpy()
+    full.close()
+    con.close()
+    np.testing.assert_array_equal(resumed["ts"], expected["ts"])
+    np.testing.assert_allclose(resumed["gyroscope_x"], expected["gyroscope_x"], atol=1e-9)
+
+
+def test_arrow_filter_path_copies_each_row_once():
+    import pyarrow as pa
+    from centrepoint.dwh.processor import FilterStats, filter_subject_segments, plan_subject_segments
+
+    con = make_imu_con(1000)
+    segments = plan_subject_segments(con, 7, chunk_size=3000, max_gap=1000)
+    outputs = {}
+    for batch_rows in (100, 65_536):
+        stats = FilterStats()
+        batches = [
+            rows.to_pylist() for rows, _ in filter_subject_segments(con, 7, segments, batch_rows=batch_rows, stats=stats)
+        ]
+        outputs[batch_rows] = pa.Table.from_pylist([row for rows in batches for row in rows])
+        assert stats.rows == stats.copied_rows == 1000
+        assert stats.buffer_allocations == 1
+    con.close()
+
+    assert outputs[100].num_rows == 1000
+    assert outputs[100].column_names[-1] == "resultant_gyro"
+    np.testing.assert_allclose(outputs[100]["gyroscope_x"].to_numpy(), outputs[65_536]["gyroscope_x"].to_numpy(), atol=1e-12)
+    gyro = np.column_stack([outputs[100][axis].to_numpy() for axis in ("gyroscope_x", "gyroscope_y", "gyroscope_z")])
+    np.testing.assert_allclose(outputs[100]["resultant_gyro"].to_numpy(), np.linalg.norm(gyro, axis=1))
+
+
+def test_compact_schema_output_matches_default(raw_128hz_data, tmp_path):
+    outputs = {}
+    for compact in (False, True):
+        dwh = tmp_path / f"compact{compact}"
+        builder = SensorDWHBuilder(raw_128hz_data, dwh, compact_schema=compact)
+        builder.build_sensor_db("imu")
+        builder.build_sensor_db("raw-accelerometer")
+        process_all_resultants(str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb"), overwrite=True, chunk_sec=1)
+
+        con = duckdb.connect(str(dwh / "imu.duckdb"), read_only=True)
+        outputs[compact] = con.execute("SELECT ts, gyroscope_x, resultant_gyro FROM filtered_imu ORDER BY ts").fetchnumpy()
+        types = {row[0]: row[1] for row in con.execute("DESCRIBE filtered_imu").fetchall()}
+        windows = con.execute("SELECT COUNT(*) FROM _processed_chunks").fetchone()[0]
+        con.close()
+        accel = duckdb.connect(str(dwh / "raw-accelerometer.duckdb"), read_only=True)
+        accel_types = {row[0]: row[1] for row in accel.execute("DESCRIBE accel_resultant").fetchall()}
+        accel.close()
+
+        assert windows == 4
+        assert (types["ts"], types["resultant_gyro"]) == (("BIGINT", "FLOAT") if compact else ("DOUBLE", "DOUBLE"))
+        assert (accel_types["ts"], accel_types["x"]) == (types["ts"], types["gyroscope_x"])
+
+    default, compact = outputs[False], outputs[True]
+    assert len(compact["ts"]) == 512
+    np.testing.assert_array_equal(compact["ts"], 1_700_000_000 * 10**9 + np.arange(512) * 7_812_500)
+    np.testing.assert_array_equal(compact["ts"] // 1_000_000, np.floor(default["ts"]))
+    np.testing.assert_allclose(compact["gyroscope_x"], default["gyroscope_x"], rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(compact["resultant_gyro"], default["resultant_gyro"], rtol=1e-5, atol=1e-6)
+
+
+def test_process_all_resultants_plans_from_coverage_catalog(raw_128hz_data, tmp_path, capsys):
+    dwh = tmp_path / "dwh"
+    builder = SensorDWHBuilder(raw_128hz_data, dwh)
+    builder.build_sensor_db("imu")
+    builder.build_sensor_db("raw-accelerometer")
+    imu_path, accel_path = str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb")
+
+    # Subjects come from the catalog: rows outside it are not scanned for.
+    con = duckdb.connect(imu_path)
+    con.execute("INSERT INTO imu SELECT ts, sample_order, 999, gyroscope_x, gyroscope_y, gyroscope_z FROM imu")
+    con.close()
+    assert process_all_resultants(imu_path, accel_path, overwrite=True, chunk_sec=1).rows == 512
+
+    capsys.readouterr()
+    process_all_resultants(imu_path, accel_path, chunk_sec=1, dry_run=True)
+    assert "No new gyroscope data: subj=101" in capsys.readouterr().out
+    assert process_all_resultants(imu_path, accel_path, chunk_sec=1).windows == 0
+
+
+def test_late_accelerometer_imports_are_found_from_the_catalog(raw_128hz_data, tmp_path, capsys):
+    dwh = tmp_path / "dwh"
+    builder = SensorDWHBuilder(raw_128hz_data, dwh)
+    builder.build_sensor_db("raw-accelerometer")
+    builder.build_sensor_db("imu")
+    imu_path, accel_path = str(dwh / "imu.duckdb"), str(dwh / "raw-accelerometer.duckdb")
+    process_all_resultants(imu_path, accel_path, overwrite=True, chunk_sec=1)
+
+    # A file with earlier samples is imported after its subject was processed.
+    day1 = pl.read_parquet(raw_128hz_data / "raw-accelerometer" / "day1.parquet")
+    day1.with_columns(pl.col("Timestamp") - 86_400).write_parquet(raw_128hz_data / "raw-accelerometer" / "day0.parquet")
+    builder.build_sensor_db("raw-accelerometer")
+
+    capsys.readouterr()
+    process_all_resultants(imu_path, accel_path, chunk_sec=1, dry_run=True)
+    assert "Would compute 512 accelerometer resultants: subj=101" in capsys.readouterr().out
+    process_all_resultants(imu_path, accel_path, chunk_sec=1)
+    process_all_resultants(imu_path, accel_path, chunk_sec=1)
+
+    con = duckdb.connect(accel_path)
+    counts = con.execute("""
+        SELECT (SELECT COUNT(*) FROM raw_accelerometer), (SELECT COUNT(*) FROM accel_resultant),
+               (SELECT COUNT(*) FROM _resultant_sources)
+    """).fetchone()
+    con.close()
+    assert counts == (1024, 1024, 2)
@@ -2,10 +2,18 @@ import asyncio
 import pytest
 import gzip
 import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import httpx
+
 import polars as pl
-from centrepoint.utils.files import download_data_file
+import pyarrow.parquet as pq
+from centrepoint.utils import files as files_module
+from centrepoint.utils.files import DownloadError, backoff_delay, download_data_file
 from rich.progress import Progress, TaskID
 
 class MockProgress(Progress):
@@ -28,6 +36,7 @@ async def test_download_gzipped(tmp_path, monkeypatch):
 
     class MockResponse:
         content = buf.read()
+        headers = {}
         def raise_for_status(self): pass
 
     class MockClient:
@@ -56,6 +65,7 @@ async def test_download_avro(tmp_path, monkeypatch):
 
     class MockResponse:
         content = buf.read()
+        headers = {}
         def raise_for_status(self): pass
 
     class MockClient:
@@ -77,3 +87,293 @@ async def test_download_avro(tmp_path, monkeypatch):
     assert loaded.shape == (2, 2)
     assert hasattr(progress, "updated")
 
+
+
+class MockStreamResponse:
+    headers = {}
+    def __init__(self, content):
+        self.content = content
+    async def __aenter__(self): return self
+    async def __aexit__(self, *args): pass
+    def raise_for_status(self): pass
+    async def aiter_bytes(self, chunk_size=None):
+        for i in range(0, len(self.content), 7):
+            yield self.content[i:i + 7]
+
+
+@pytest.mark.asyncio
+async def test_download_avro_streaming(tmp_path, monkeypatch):
+    df = pl.DataFrame({"a": list(range(10)), "b": [float(i) for i in range(10)]})
+    buf = io.BytesIO()
+    df.write_avro(buf)
+
+    class MockClient:
+        async def __aenter__(self): return self
+        async def __aexit__(self, *args): pass
+        def stream(self, method, url): return MockStreamResponse(buf.getvalue())
+
+    monkeypatch.setattr("httpx.AsyncClient", lambda: MockClient())
+
+    out_path = tmp_path / "output.avro"
+    await download_data_file(
+        "http://fake.url", out_path, asyncio.Semaphore(1), MockProgress(), task_id=TaskID(1),
+        is_gzipped=False, stream=True, row_group_size=4
+    )
+
+    parquet_path = out_path.with_suffix(".parquet")
+    assert pq.ParquetFile(parquet_path).num_row_groups == 3
+    assert pl.read_parquet(parquet_path).equals(df)
+    assert list(tmp_path.iterdir()) == [parquet_path]
+
+
+@pytest.mark.asyncio
+async def test_download_gzipped_streaming(tmp_path, monkeypatch):
+    raw_data = b"hello, streamed gzipped world"
+
+    class MockClient:
+        async def __aenter__(self): return self
+        async def __aexit__(self, *args): pass
+        def stream(self, method, url): return MockStreamResponse(gzip.compress(raw_data))
+
+    monkeypatch.setattr("httpx.AsyncClient", lambda: MockClient())
+
+    out_path = tmp_path / "file.csv"
+    await download_data_file(
+        "http://fake.url", out_path, asyncio.Semaphore(1), MockProgress(), task_id=TaskID(1), stream=True
+    )
+
+    assert out_path.read_bytes() == raw_data
+
+
+@pytest.mark.asyncio
+async def test_download_uses_shared_client(tmp_path, monkeypatch):
+    raw_data = b"shared client payload"
+    requested = []
+
+    class MockResponse:
+        content = gzip.compress(raw_data)
+        headers = {}
+        def raise_for_status(self): pass
+
+    class SharedClient:
+        async def get(self, url):
+            requested.append(url)
+            return MockResponse()
+
+    monkeypatch.setattr("httpx.AsyncClient", lambda: pytest.fail("Should reuse the shared client"))
+
+    sem = asyncio.Semaphore(2)
+    client = SharedClient()
+    for name in ("a.csv", "b.csv"):
+        await download_data_file(f"http://fake.url/{name}", tmp_path / name, sem, MockProgress(), TaskID(1), client=client)
+
+    assert requested == ["http://fake.url/a.csv", "http://fake.url/b.csv"]
+    assert (tmp_path / "b.csv").read_bytes() == raw_data
+
+
+class FlakyStream(httpx.AsyncByteStream):
+    def __init__(self, data):
+        self.data = data
+    async def __aiter__(self):
+        yield self.data
+        raise httpx.ReadError("connection dropped")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [True, False])
+async def test_download_resumes_with_range_after_dropped_connection(tmp_path, monkeypatch, stream):
+    monkeypatch.setattr("centrepoint.utils.files.backoff_delay", lambda *a, **k: 0)
+    payload = bytes(range(256)) * 40 + b"".join(i.to_bytes(4, "little") for i in range(5000))
+    body = gzip.compress(payload)
+    seen_ranges = []
+
+    def handler(request):
+        seen_ranges.append(request.headers.get("Range"))
+        if len(seen_ranges) == 1:
+            return httpx.Response(200, stream=FlakyStream(body[:100]))
+        if len(seen_ranges) == 2:
+            return httpx.Response(503)
+        if "Range" not in request.headers:
+            return httpx.Response(200, content=body)
+        start = int(request.headers["Range"].removeprefix("bytes=").rstrip("-"))
+        return httpx.Response(206, content=body[start:])
+
+    out_path = tmp_path / "file.csv"
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        written = await download_data_file(
+            "http://fake.url", out_path, asyncio.Semaphore(1), MockProgress(), TaskID(1),
+            stream=stream, client=client, retries=3
+        )
+
+    assert written == out_path
+    assert out_path.read_bytes() == payload
+    assert seen_ranges[0] is None
+    assert seen_ranges[-1] == ("bytes=100-" if stream else None)
+    assert not (tmp_path / "file.csv.part").exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_download_restarts_part_left_by_an_older_version(tmp_path, monkeypatch, stream):
+    monkeypatch.setattr("centrepoint.utils.files.backoff_delay", lambda *a, **k: 0)
+    old_body, new_body = gzip.compress(bytes(range(256)) * 4, compresslevel=0), gzip.compress(b"new contents" * 100)
+    out_path = tmp_path / "file.csv"
+    seen = []
+
+    def handler(request):
+        seen.append((request.headers.get("Range"), request.headers.get("If-Range")))
+        if len(seen) == 1:
+            return httpx.Response(200, headers={"ETag": '"v1"'}, stream=FlakyStream(old_body[:100]))
+        if request.headers.get("If-Range") == '"v1"' and request.headers.get("Range") == "bytes=100-":
+            return httpx.Response(416)  # The new file happens to be no longer than the stale part
+        return httpx.Response(200, content=new_body)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        # The first run dies mid-body and leaves a .part of version 1 behind.
+        with pytest.raises(DownloadError):
+            await download_data_file(
+                "http://fake.url", out_path, asyncio.Semaphore(1), MockProgress(), TaskID(1),
+                stream=True, client=client, retries=0, version="v1"
+            )
+        assert (tmp_path / "file.csv.part").stat().st_size == 100
+
+        # The file changed upstream: the .part is discarded instead of resumed or trusted on a 416.
+        written = await download_data_file(
+            "http://fake.url", out_path, asyncio.Semaphore(1), MockProgress(), TaskID(1),
+            stream=stream, client=client, retries=0, version="v2"
+        )
+
+    assert written == out_path
+    assert out_path.read_bytes() == b"new contents" * 100
+    assert seen[1:] == [(None, None)]
+    assert not (tmp_path / "file.csv.part").exists()
+    assert not (tmp_path / "file.csv.part.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_refreshes_expired_url(tmp_path, monkeypatch):
+    monkeypatch.setattr("centrepoint.utils.files.backoff_delay", lambda *a, **k: 0)
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        if "expired" in str(request.url):
+            return httpx.Response(403)
+        return httpx.Response(200, content=gzip.compress(b"fresh"))
+
+    async def refresh():
+        return "http://fake.url/fresh", datetime.now(timezone.utc) + timedelta(hours=1)
+
+    out_path = tmp_path / "file.csv"
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await download_data_file(
+            "http://fake.url/expired", out_path, asyncio.Semaphore(1), MockProgress(), TaskID(1),
+            client=client, refresh_url=refresh, url_expires_on=datetime.now(timezone.utc) + timedelta(hours=1)
+        )
+
+    assert requested == ["http://fake.url/expired", "http://fake.url/fresh"]
+    assert out_path.read_bytes() == b"fresh"
+
+
+@pytest.mark.asyncio
+async def test_download_gives_up_after_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr("centrepoint.utils.files.backoff_delay", lambda *a, **k: 0)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    progress = MockProgress()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(DownloadError):
+            await download_data_file(
+                "http://fake.url", tmp_path / "file.csv", asyncio.Semaphore(1), progress, TaskID(1),
+                client=client, retries=2
+            )
+
+    assert len(calls) == 3
+    assert progress.updated
+    assert not (tmp_path / "file.csv").exists()
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1.0, cap=5.0) <= 5.0 for attempt in range(20))
+
+
+@pytest.mark.asyncio
+async def test_decode_runs_in_process_pool(tmp_path):
+    df = pl.DataFrame({"a": list(range(50)), "b": [float(i) for i in range(50)]})
+    buf = io.BytesIO()
+    df.write_avro(buf)
+
+    def handler(request):
+        return httpx.Response(200, content=buf.getvalue())
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            written = await asyncio.gather(*(
+                download_data_file(
+                    f"http://fake.url/{i}", tmp_path / f"f{i}.avro", asyncio.Semaphore(2), MockProgress(), TaskID(1),
+                    is_gzipped=False, stream=True, row_group_size=16, client=client, executor=executor
+                )
+                for i in range(3)
+            ))
+
+    for path in written:
+        assert pl.read_parquet(path).equals(df)
+
+
+@pytest.mark.asyncio
+async def test_decode_slots_apply_back_pressure(tmp_path, monkeypatch):
+    decoding = {"now": 0, "max": 0}
+    original = files_module.decode_part_file
+
+    def slow_decode(*args):
+        decoding["now"] += 1
+        decoding["max"] = max(decoding["max"], decoding["now"])
+        time.sleep(0.02)
+        original(*args)
+        decoding["now"] -= 1
+
+    monkeypatch.setattr(files_module, "decode_part_file", slow_decode)
+
+    def handler(request):
+        return httpx.Response(200, content=gzip.compress(request.url.path.encode()))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            sem, decode_slots = asyncio.Semaphore(4), asyncio.Semaphore(1)
+            await asyncio.gather(*(
+                download_data_file(
+                    f"http://fake.url/{i}", tmp_path / f"f{i}.csv", sem, MockProgress(), TaskID(1),
+                    client=client, executor=executor, decode_slots=decode_slots
+                )
+                for i in range(4)
+            ))
+
+    assert decoding["max"] == 1
+    assert (tmp_path / "f3.csv").read_bytes() == b"/3"
+
+
+@pytest.mark.asyncio
+async def test_download_ingests_avro_without_keeping_output(tmp_path):
+    df = pl.DataFrame({"a": [1, 2, 3]})
+    buf = io.BytesIO()
+    df.write_avro(buf)
+    ingested = []
+
+    async def ingest(avro_path):
+        ingested.append(pl.read_avro(avro_path))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=buf.getvalue())))
+    out_path = tmp_path / "output.avro"
+    async with client:
+        written = await download_data_file(
+            "http://fake.url", out_path, asyncio.Semaphore(1), MockProgress(), task_id=TaskID(1),
+            is_gzipped=False, client=client, ingest=ingest, keep_output=False
+        )
+
+    assert written is None
+    assert ingested[0].equals(df)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,23 @@
+import httpx
+import pytest
+from centrepoint.utils.http import create_async_client
+
+
+@pytest.mark.asyncio
+async def test_create_async_client_limits():
+    async with create_async_client(max_connections=7, max_keepalive_connections=3, keepalive_expiry=12.0) as client:
+        assert isinstance(client, httpx.AsyncClient)
+        pool = client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 12.0
+
+
+def test_create_async_client_http2_requires_h2():
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            create_async_client(http2=True)
+    else:
+        pytest.skip("h2 is installed")
@@ -0,0 +1,95 @@
+import pytest
+from centrepoint.models.data_access import DataAccessFile
+from centrepoint.utils.manifest import DownloadManifest, file_sha256
+
+
+def make_file(modified="2025-03-10T01:00:00Z"):
+    return DataAccessFile.model_validate({
+        "studyId": 1414,
+        "subjectId": 123,
+        "dataCategory": "imu",
+        "date": "2025-03-10T00:00:00Z",
+        "fileName": "PIL_JAM_LW_imu_2025-03-10.avro",
+        "fileFormat": "avro",
+        "modifiedDate": modified,
+        "downloadUrl": "https://example.com/file.avro",
+        "downloadUrlExpiresOn": "2025-03-11T00:00:00Z"
+    })
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with DownloadManifest(tmp_path / "manifest.duckdb") as m:
+        yield m
+
+
+def test_unrecorded_file_is_not_current(manifest, tmp_path):
+    assert not manifest.is_current(make_file(), tmp_path / "x.parquet")
+
+
+def test_recorded_file_is_current_until_modified(manifest, tmp_path):
+    local = tmp_path / "x.parquet"
+    local.write_bytes(b"parquet bytes")
+    manifest.record(make_file(), local)
+
+    assert manifest.is_current(make_file(), local, verify_checksum=True)
+    assert not manifest.is_current(make_file(modified="2025-03-12T00:00:00Z"), local)
+
+    row = manifest.con.execute("SELECT byte_size, sha256 FROM downloads").fetchone()
+    assert row == (len(b"parquet bytes"), file_sha256(local))
+
+
+def test_missing_or_changed_local_file_is_not_current(manifest, tmp_path):
+    local = tmp_path / "x.parquet"
+    local.write_bytes(b"original")
+    manifest.record(make_file(), local)
+
+    local.write_bytes(b"short")
+    assert not manifest.is_current(make_file(), local)
+
+    local.unlink()
+    assert not manifest.is_current(make_file(), local)
+
+
+def test_ingested_only_file_is_current_without_local_copy(manifest, tmp_path):
+    manifest.record(make_file(), None)
+
+    assert manifest.is_current(make_file(), None)
+    assert not manifest.is_current(make_file(), tmp_path / "x.parquet")
+    assert not manifest.is_current(make_file(modified="2025-03-12T00:00:00Z"), None)
+
+
+def test_csv_and_avro_downloads_of_a_day_are_separate_entries(manifest, tmp_path):
+    avro, csv = tmp_path / "x.parquet", tmp_path / "x.csv"
+    avro.write_bytes(b"parquet bytes")
+    csv.write_bytes(b"csv bytes")
+    csv_file = make_file().model_copy(update={"fileFormat": "csv", "fileName": "x.csv.gz"})
+    manifest.record(make_file(), avro)
+    manifest.record(csv_file, csv, fingerprint=(len(b"csv bytes"), file_sha256(csv)))
+
+    assert manifest.is_current(make_file(), avro, verify_checksum=True)
+    assert manifest.is_current(csv_file, csv, verify_checksum=True)
+
+
+def test_manifest_without_file_format_is_upgraded(tmp_path):
+    import duckdb
+    path = tmp_path / "manifest.duckdb"
+    local = tmp_path / "x.parquet"
+    local.write_bytes(b"parquet bytes")
+    con = duckdb.connect(str(path))
+    con.execute("""
+        CREATE TABLE downloads (
+            study_id BIGINT, subject_id BIGINT, data_category TEXT, date DATE, file_name TEXT,
+            modified_date TIMESTAMP, local_path TEXT, byte_size BIGINT, sha256 TEXT, downloaded_at TIMESTAMP,
+            PRIMARY KEY (study_id, subject_id, data_category, date)
+        )
+    """)
+    con.execute(
+        "INSERT INTO downloads VALUES (1414, 123, 'imu', '2025-03-10', 'PIL_JAM_LW_imu_2025-03-10.avro', "
+        "'2025-03-10 01:00:00', ?, ?, ?, now())",
+        (str(local), len(b"parquet bytes"), file_sha256(local)),
+    )
+    con.close()
+
+    with DownloadManifest(path) as manifest:
+        assert manifest.is_current(make_file(), local)
@@ -1,5 +1,8 @@
+import asyncio
 from typing import List
-from centrepoint.utils.paginate import paginate
+
+import pytest
+from centrepoint.utils.paginate import apaginate, paginate, paginate_prefetch
 
 
 class FakePage:
@@ -45,3 +48,72 @@ def test_paginate_single_page():
     results = list(paginate(fake_get_page, limit=10))
     assert results == [1, 2]
 
+
+
+def make_pages(total, calls):
+    def fake_get_page(limit: int, offset: int) -> FakePage:
+        calls.append((limit, offset))
+        return FakePage(
+            items=list(range(offset, min(offset + limit, total))),
+            totalCount=total,
+            limit=limit,
+            offset=offset
+        )
+    return fake_get_page
+
+
+def test_paginate_prefetch_fetches_all_pages_in_order():
+    calls = []
+    results = list(paginate_prefetch(make_pages(25, calls), limit=4, prefetch=3))
+    assert results == list(range(25))
+    assert sorted(calls) == [(4, o) for o in range(0, 25, 4)]
+    assert calls[0] == (4, 0)
+
+
+@pytest.mark.asyncio
+async def test_apaginate_overlaps_remaining_pages():
+    in_flight = {"now": 0, "max": 0}
+    calls = []
+    sync_get = make_pages(2000, calls)
+
+    async def get_page(limit, offset):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.001)
+        in_flight["now"] -= 1
+        return sync_get(limit, offset)
+
+    results = [item async for item in apaginate(get_page, limit=100, prefetch=8)]
+    assert results == list(range(2000))
+    assert len(calls) == 20
+    assert in_flight["max"] == 8
+
+
+def test_paginate_prefetch_requests_pages_before_yielding_the_first():
+    import threading
+    requested = threading.Event()
+
+    def get_page(limit, offset):
+        if offset:
+            requested.set()
+        return FakePage(items=list(range(offset, min(offset + limit, 8))), totalCount=8, limit=limit, offset=offset)
+
+    pages = paginate_prefetch(get_page, limit=4)
+    assert next(pages) == 0
+    assert requested.wait(timeout=5)
+    assert list(pages) == list(range(1, 8))
+
+
+@pytest.mark.asyncio
+async def test_apaginate_schedules_pages_before_yielding_the_first():
+    calls = []
+    sync_get = make_pages(8, calls)
+
+    async def get_page(limit, offset):
+        return sync_get(limit, offset)
+
+    pages = apaginate(get_page, limit=4)
+    assert await anext(pages) == 0
+    await asyncio.sleep(0)
+    assert calls == [(4, 0), (4, 4)]
+    assert [item async for item in pages] == list(range(1, 8))